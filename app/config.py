@@ -26,6 +26,59 @@ class Settings(BaseSettings):
     # Email corporativo
     CORPORATE_EMAIL_DOMAIN: str = "@comunicarlos.com.ar"
 
+    # Notificaciones
+    NOTIF_RECONCILIACION_SEGUNDOS: int = 600  # Recalculo periódico de contadores por supervisor
+    NOTIF_TTL_DIAS: int = 90  # Las leídas expiran N días después de fecha_lectura (0 = nunca)
+    NOTIF_ARCHIVO_HABILITADO: bool = False
+    NOTIF_ARCHIVO_DIAS: int = 30  # Debe ser menor que NOTIF_TTL_DIAS para que el TTL no las borre antes
+    NOTIF_ARCHIVO_LOTE: int = 1000
+    NOTIF_ARCHIVO_INTERVALO_SEGUNDOS: int = 3600
+
+    # Archivo de requerimientos resueltos
+    REQ_ARCHIVO_MESES: int = 6  # Resueltos hace más de N meses pasan al archivo (0 = deshabilitado)
+    REQ_ARCHIVO_LOTE: int = 500
+    REQ_ARCHIVO_INTERVALO_SEGUNDOS: int = 3600
+
+    # Detección de incidentes casi duplicados (MinHash/LSH en memoria, ver app/services/duplicados.py)
+    DUPLICADOS_HABILITADO: bool = True
+    DUPLICADOS_UMBRAL: float = 0.6  # Similitud de Jaccard estimada a partir de la cual se enlazan
+    DUPLICADOS_RECONSTRUCCION_SEGUNDOS: int = 900  # Recarga desde la base (recoge lo de otros workers)
+
+    # Tormentas: incidentes de un mismo (servicio, categoría) que cuelgan de un masivo
+    TORMENTA_HABILITADA: bool = True
+    TORMENTA_UMBRAL: int = 50  # Incidentes dentro de la ventana para abrir el masivo
+    TORMENTA_VENTANA_SEGUNDOS: int = 60
+    TORMENTA_VERIFICACION_SEGUNDOS: int = 30  # Cada cuánto se reconfirma en la base el masivo cacheado
+
+    # Exportación de requerimientos (/api/v1/reportes/export)
+    EXPORT_BATCH_SIZE: int = 1000  # Documentos por lote del cursor
+    EXPORT_FILAS_POR_BLOQUE: int = 500  # Filas que se juntan antes de enviar un bloque
+
+    # Concurrencia optimista sobre requerimientos (campo 'version')
+    REQ_CONFLICTO_REINTENTOS: int = 3  # Reintentos al encontrar otra versión antes de responder 409
+    REQ_CONFLICTO_ESPERA_MS: float = 10  # Base del backoff exponencial con jitter entre reintentos
+
+    # Cachés en memoria por worker (coherentes entre workers vía app/infrastructure/mongodb/invalidacion.py)
+    CACHE_USUARIOS_MAX: int = 10000
+    CACHE_USUARIOS_TTL_SEGUNDOS: int = 300
+    CACHE_CONTADORES_TTL_SEGUNDOS: int = 60
+    CACHE_DASHBOARD_TTL_SEGUNDOS: int = 30  # 0 = sin caché del dashboard de operador
+
+    # Observabilidad
+    SERVER_TIMING_HABILITADO: bool = True  # Header Server-Timing con el desglose por fase
+    METRICAS_HABILITADAS: bool = True  # Endpoint /metrics (Prometheus)
+
+    # Profiler bajo demanda (/api/v1/admin/profiler): sin costo si está deshabilitado
+    PROFILER_HABILITADO: bool = False
+    PROFILER_MAX_SEGUNDOS: int = 60
+    PROFILER_INTERVALO_MS: float = 5
+
+    # Listados servidos directo desde documentos: validar cada respuesta contra su schema
+    VALIDAR_RESPUESTAS_DIRECTAS: bool = True
+
+    # Hilos dedicados a bcrypt (hash y verificación de passwords)
+    BCRYPT_HILOS: int = 4
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,49 +1,129 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Annotated
+from typing import Annotated, Optional
 from jose import JWTError, jwt
 from app.config import settings
 from app.repositories.usuario_repository import UsuarioRepository
-from app.infrastructure.mongodb.database import mongodb
+from app.dependencies.repositories import get_usuario_repo
+from app.domain.entities.usuario import Usuario
 from app.domain.enums import TipoUsuario
+from app.infrastructure.tiempos import medida
 
 security = HTTPBearer()
 
 
-async def get_usuario_repo():
-    return UsuarioRepository(mongodb.get_database())
+def _decodificar(credentials: HTTPAuthorizationCredentials) -> dict:
+    """Claims del JWT ya verificados (firma y expiración)"""
+    try:
+        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        int(payload["sub"])
+        return payload
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise _credenciales_invalidas()
 
 
-async def get_current_user(
-        credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-        usuario_repo: UsuarioRepository = Depends(get_usuario_repo)
-):
-    token = credentials.credentials
-    credentials_exception = HTTPException(
+def _credenciales_invalidas() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    # Convertir user_id a int si tu dominio usa int, o dejar str si migraste a UUID/ObjectId
-    try:
-        usuario = await usuario_repo.buscar_por_id(int(user_id))
-    except ValueError:
-        raise credentials_exception
 
+
+@medida("auth")
+async def get_current_user(
+        credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+        usuario_repo: UsuarioRepository = Depends(get_usuario_repo)
+):
+    payload = _decodificar(credentials)
+
+    usuario = await usuario_repo.buscar_por_id(int(payload["sub"]))
     if usuario is None:
-        raise credentials_exception
+        raise _credenciales_invalidas()
 
     return usuario
 
 
+class Principal:
+    """
+    Identidad del request tomada de los claims firmados del token (sub y
+    tipo_usuario). Alcanza para autorizar por rol y filtrar por id sin leer
+    la colección de usuarios; la entidad completa se carga recién cuando un
+    handler llama a usuario(), y una sola vez por request.
+
+    El rol es el del momento del login: un cambio de rol o una baja se
+    reflejan al vencer el token (ACCESS_TOKEN_EXPIRE_MINUTES).
+    """
+
+    __slots__ = ("id", "tipo_usuario", "_usuario_repo", "_usuario")
+
+    def __init__(self, id: int, tipo_usuario: TipoUsuario, usuario_repo: UsuarioRepository):
+        self.id = id
+        self.tipo_usuario = tipo_usuario
+        self._usuario_repo = usuario_repo
+        self._usuario: Optional[Usuario] = None
+
+    def get_tipo_usuario(self) -> TipoUsuario:
+        return self.tipo_usuario
+
+    async def usuario(self) -> Usuario:
+        """Entidad completa del usuario (perezosa)"""
+        if self._usuario is None:
+            self._usuario = await self._usuario_repo.buscar_por_id(self.id)
+            if self._usuario is None:
+                raise _credenciales_invalidas()
+        return self._usuario
+
+    def __repr__(self) -> str:
+        return f"<Principal(id={self.id}, tipo_usuario='{self.tipo_usuario.value}')>"
+
+
+@medida("auth")
+async def get_principal(
+        credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+        usuario_repo: UsuarioRepository = Depends(get_usuario_repo)
+) -> Principal:
+    """Como get_current_user pero sin consultar la base: para endpoints que solo usan id y rol"""
+    payload = _decodificar(credentials)
+    principal_id = int(payload["sub"])
+
+    try:
+        return Principal(principal_id, TipoUsuario(payload["tipo_usuario"]), usuario_repo)
+    except (KeyError, ValueError):
+        # Token sin el claim de rol: se resuelve desde la base
+        usuario = await usuario_repo.buscar_por_id(principal_id)
+        if usuario is None:
+            raise _credenciales_invalidas()
+        principal = Principal(principal_id, usuario.get_tipo_usuario(), usuario_repo)
+        principal._usuario = usuario
+        return principal
+
+
+def principal_con_rol(*roles: TipoUsuario, detalle: str):
+    """Dependency que exige alguno de los roles usando solo los claims del token"""
+    async def verificar(principal: Principal = Depends(get_principal)) -> Principal:
+        if principal.tipo_usuario not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detalle)
+        return principal
+
+    return verificar
+
+
+principal_operador = principal_con_rol(
+    TipoUsuario.OPERADOR, detalle="Solo operadores pueden acceder a este recurso"
+)
+principal_tecnico = principal_con_rol(
+    TipoUsuario.TECNICO, detalle="Solo técnicos pueden acceder a este recurso"
+)
+principal_supervisor = principal_con_rol(
+    TipoUsuario.SUPERVISOR, detalle="Solo supervisores pueden acceder a este recurso"
+)
+principal_gestion = principal_con_rol(
+    TipoUsuario.OPERADOR, TipoUsuario.SUPERVISOR,
+    detalle="Solo operadores y supervisores pueden acceder a este recurso"
+)
+
+
 async def require_role(required_roles: list[TipoUsuario]):
     """
     Factory para crear dependencies que verifican roles específicos.
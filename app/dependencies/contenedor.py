@@ -0,0 +1,119 @@
+"""
+Contenedor de dependencias con vida de aplicación.
+
+Repositorios, Notificador y servicios no guardan estado por request,
+así que se construyen una única vez en el lifespan y se comparten.
+Las funciones de app/dependencies solo devuelven estas instancias.
+"""
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.repositories.usuario_repository import UsuarioRepository
+from app.repositories.requerimiento_repository import RequerimientoRepository
+from app.repositories.token_repository import TokenRepository
+from app.repositories.servicio_repository import ServicioRepository
+from app.repositories.notificacion_repository import NotificacionRepository
+from app.domain.services.notificador import Notificador
+from app.infrastructure.mongodb.sequence import SequenceGenerator
+from app.infrastructure.mongodb.invalidacion import bus_invalidacion
+from app.infrastructure.cache import CacheLocal
+from app.services.authentication_service import AutenticacionService
+from app.services.requerimiento_service import RequerimientoService
+from app.services.asignacion_service import AsignacionService
+from app.services.comentario_service import ComentarioService
+from app.services.notificacion_service import NotificacionService
+from app.services.servicio_service import ServicioService
+from app.services.reporte_service import ReporteService
+from app.services.duplicados import IndiceDuplicados
+from app.services.tormentas import CorrelacionadorTormentas
+from app.config import settings
+
+
+class Contenedor:
+    """Registro de instancias compartidas (Singleton por proceso)"""
+
+    def __init__(self):
+        self._inicializado = False
+
+    def inicializar(self, database: AsyncIOMotorDatabase) -> None:
+        """Construye el grafo de dependencias. Se llama una vez al iniciar la aplicación."""
+        # Cachés por worker; el bus las invalida cuando otro worker escribe
+        self.cache_usuarios = CacheLocal(
+            "usuarios", settings.CACHE_USUARIOS_MAX, settings.CACHE_USUARIOS_TTL_SEGUNDOS
+        )
+        self.cache_contadores = CacheLocal(
+            "contadores_notificaciones", ttl_segundos=settings.CACHE_CONTADORES_TTL_SEGUNDOS
+        )
+        self.cache_dashboard = CacheLocal(
+            "dashboard_operador", 1, settings.CACHE_DASHBOARD_TTL_SEGUNDOS
+        ) if settings.CACHE_DASHBOARD_TTL_SEGUNDOS > 0 else None
+        self._suscribir_caches()
+
+        # Repositorios
+        self.usuario_repo = UsuarioRepository(database, self.cache_usuarios)
+        self.requerimiento_repo = RequerimientoRepository(database, self.usuario_repo)
+        self.token_repo = TokenRepository(database)
+        self.servicio_repo = ServicioRepository(database, self.cache_usuarios)
+        self.notificacion_repo = NotificacionRepository(database, self.usuario_repo, self.cache_contadores)
+
+        # Dominio
+        self.notificador = Notificador(
+            self.usuario_repo,
+            self.notificacion_repo,
+            SequenceGenerator(database)
+        )
+
+        # Índice en memoria de incidentes abiertos (se carga desde el lifespan)
+        self.indice_duplicados = (
+            IndiceDuplicados(settings.DUPLICADOS_UMBRAL) if settings.DUPLICADOS_HABILITADO else None
+        )
+        self.tormentas = CorrelacionadorTormentas(
+            settings.TORMENTA_UMBRAL,
+            settings.TORMENTA_VENTANA_SEGUNDOS,
+            settings.TORMENTA_VERIFICACION_SEGUNDOS
+        ) if settings.TORMENTA_HABILITADA else None
+
+        # Servicios de aplicación
+        self.auth_service = AutenticacionService(self.usuario_repo, self.servicio_repo, self.token_repo)
+        self.req_service = RequerimientoService(
+            self.requerimiento_repo, self.usuario_repo, self.notificador,
+            self.indice_duplicados, self.tormentas
+        )
+        self.asignacion_service = AsignacionService(self.requerimiento_repo, self.usuario_repo, self.notificador)
+        self.comentario_service = ComentarioService(self.requerimiento_repo, self.usuario_repo, self.notificador)
+        self.notificacion_service = NotificacionService(self.notificacion_repo, self.usuario_repo)
+        self.servicio_service = ServicioService(
+            self.servicio_repo, self.usuario_repo, self.requerimiento_repo, self.notificador
+        )
+        self.reporte_service = ReporteService(self.requerimiento_repo, self.usuario_repo, self.cache_dashboard)
+
+        self._inicializado = True
+
+    def _suscribir_caches(self) -> None:
+        """Colección de origen de cada caché y cómo se traduce un cambio en claves"""
+        bus_invalidacion.suscribir("usuarios", self.cache_usuarios)
+        # Los usuarios cacheados incluyen sus servicios; en un borrado no hay
+        # documento completo y se vacía la caché entera
+        bus_invalidacion.suscribir(
+            "servicios", self.cache_usuarios,
+            claves=lambda cambio: (cambio["fullDocument"]["solicitante_id"],),
+            documento_completo=True
+        )
+        # El documento de contadores tiene _id = supervisor_id y cambia con
+        # cada alta, lectura o borrado de notificaciones
+        bus_invalidacion.suscribir("notificaciones_contadores", self.cache_contadores)
+        # cache_dashboard no se suscribe: vence por TTL (ver ReporteService)
+
+    def limpiar(self) -> None:
+        """Descarta las instancias (al cerrar la aplicación)"""
+        bus_invalidacion.limpiar()
+        self.__dict__.clear()
+        self._inicializado = False
+
+    def __getattr__(self, nombre: str):
+        # Solo se invoca si el atributo no existe. AttributeError (y no otra)
+        # para que hasattr, getattr con default, copy y pickle sigan funcionando
+        if nombre.startswith("__") or self.__dict__.get("_inicializado"):
+            raise AttributeError(f"'{type(self).__name__}' no tiene el atributo '{nombre}'")
+        raise AttributeError(f"Contenedor no inicializado: '{nombre}' no disponible")
+
+
+contenedor = Contenedor()
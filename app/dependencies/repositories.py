@@ -1,30 +1,23 @@
-from app.infrastructure.mongodb.database import mongodb
+from app.dependencies.contenedor import contenedor
 from app.repositories.usuario_repository import UsuarioRepository
 from app.repositories.requerimiento_repository import RequerimientoRepository
 from app.repositories.token_repository import TokenRepository
 from app.repositories.servicio_repository import ServicioRepository
 from app.repositories.notificacion_repository import NotificacionRepository
 
-def get_usuario_repo() -> UsuarioRepository:
-    db = mongodb.get_database()
-    return UsuarioRepository(db)
+# Dependencias async: FastAPI las resuelve en el event loop, sin pasar por el threadpool
 
-def get_requerimiento_repo() -> RequerimientoRepository:
-    db = mongodb.get_database()
-    usuario_repo = get_usuario_repo()
-    return RequerimientoRepository(db, usuario_repo)
+async def get_usuario_repo() -> UsuarioRepository:
+    return contenedor.usuario_repo
+
+async def get_requerimiento_repo() -> RequerimientoRepository:
+    return contenedor.requerimiento_repo
 
 async def get_token_repo() -> TokenRepository:
-    db = mongodb.get_database()
-    repo = TokenRepository(db)
-    await repo.crear_indice_ttl()
-    return repo
+    return contenedor.token_repo
 
-def get_servicio_repo() -> ServicioRepository:
-    db = mongodb.get_database()
-    return ServicioRepository(db)
+async def get_servicio_repo() -> ServicioRepository:
+    return contenedor.servicio_repo
 
-def get_notificacion_repo() -> NotificacionRepository:
-    db = mongodb.get_database()
-    user_repo = get_usuario_repo()
-    return NotificacionRepository(db, user_repo)
\ No newline at end of file
+async def get_notificacion_repo() -> NotificacionRepository:
+    return contenedor.notificacion_repo
@@ -1,4 +1,4 @@
-from fastapi import Depends
+from app.dependencies.contenedor import contenedor
 from app.services.authentication_service import AutenticacionService
 from app.services.requerimiento_service import RequerimientoService
 from app.services.asignacion_service import AsignacionService
@@ -6,71 +6,27 @@ from app.services.comentario_service import ComentarioService
 from app.services.notificacion_service import NotificacionService
 from app.services.servicio_service import ServicioService
 from app.services.reporte_service import ReporteService
-from app.repositories.token_repository import TokenRepository
-from app.dependencies.repositories import (
-    get_usuario_repo,
-    get_requerimiento_repo,
-    get_servicio_repo,
-    get_notificacion_repo,
-    get_token_repo
-)
-from app.domain.services.notificador import Notificador
-from app.infrastructure.mongodb.sequence import SequenceGenerator
-from app.infrastructure.mongodb.database import mongodb
+from app.dependencies.repositories import get_usuario_repo
 
-def _crear_notificador(user_repo, notif_repo) -> Notificador:
-    db = mongodb.get_database()
-    seq = SequenceGenerator(db)
-    return Notificador(user_repo, notif_repo, seq)
+# Los servicios son instancias compartidas construidas en el lifespan (ver contenedor.py)
 
-async def get_auth_service(
-    user_repo=Depends(get_usuario_repo),
-    servicio_repo=Depends(get_servicio_repo),
-    token_repo: TokenRepository = Depends(get_token_repo)
-) -> AutenticacionService:
-    return AutenticacionService(user_repo, servicio_repo, token_repo)
+async def get_auth_service() -> AutenticacionService:
+    return contenedor.auth_service
 
-def get_req_service(
-    req_repo=Depends(get_requerimiento_repo),
-    user_repo=Depends(get_usuario_repo),
-    notif_repo=Depends(get_notificacion_repo)
-):
-    notificador = _crear_notificador(user_repo, notif_repo)
-    return RequerimientoService(req_repo, user_repo, notificador)
+async def get_req_service() -> RequerimientoService:
+    return contenedor.req_service
 
-def get_asignacion_service(
-    req_repo=Depends(get_requerimiento_repo),
-    user_repo=Depends(get_usuario_repo),
-    notif_repo=Depends(get_notificacion_repo)
-):
-    notificador = _crear_notificador(user_repo, notif_repo)
-    return AsignacionService(req_repo, user_repo, notificador)
+async def get_asignacion_service() -> AsignacionService:
+    return contenedor.asignacion_service
 
-def get_comentario_service(
-    req_repo=Depends(get_requerimiento_repo),
-    user_repo=Depends(get_usuario_repo),
-    notif_repo=Depends(get_notificacion_repo)
-):
-    notificador = _crear_notificador(user_repo, notif_repo)
-    return ComentarioService(req_repo, user_repo, notificador)
+async def get_comentario_service() -> ComentarioService:
+    return contenedor.comentario_service
 
-def get_notificacion_service(
-    notif_repo=Depends(get_notificacion_repo),
-    user_repo=Depends(get_usuario_repo)
-):
-    return NotificacionService(notif_repo, user_repo)
+async def get_notificacion_service() -> NotificacionService:
+    return contenedor.notificacion_service
 
-def get_servicio_service(
-    serv_repo=Depends(get_servicio_repo),
-    user_repo=Depends(get_usuario_repo),
-    req_repo=Depends(get_requerimiento_repo),
-    notif_repo=Depends(get_notificacion_repo)
-):
-    notificador = _crear_notificador(user_repo, notif_repo)
-    return ServicioService(serv_repo, user_repo, req_repo, notificador)
+async def get_servicio_service() -> ServicioService:
+    return contenedor.servicio_service
 
-def get_reporte_service(
-    req_repo=Depends(get_requerimiento_repo),
-    user_repo=Depends(get_usuario_repo)
-):
-    return ReporteService(req_repo, user_repo)
\ No newline at end of file
+async def get_reporte_service() -> ReporteService:
+    return contenedor.reporte_service
@@ -36,6 +36,8 @@ from app.domain.value_objects.email import Email
 from app.domain.exceptions import (
     RequerimientoException,
     EstadoInvalidoException,
+    ConflictoVersionException,
+    RequerimientoArchivadoException,
     PermisosDenegadosException,
     ValidacionException,
     UsuarioException,
@@ -81,6 +83,8 @@ __all__ = [
     # Excepciones
     'RequerimientoException',
     'EstadoInvalidoException',
+    'ConflictoVersionException',
+    'RequerimientoArchivadoException',
     'PermisosDenegadosException',
     'ValidacionException',
     'UsuarioException',
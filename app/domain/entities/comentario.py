@@ -5,6 +5,8 @@ from typing import Optional
 class Comentario:
     """Comentario en un requerimiento - Inmutable después de creado"""
 
+    __slots__ = ("id", "_texto", "_autor", "_requerimiento", "_fecha_hora")
+
     def __init__(
             self,
             id: Optional[int],
@@ -23,6 +25,17 @@ class Comentario:
         if len(texto.strip()) < 5:
             raise ValueError("El comentario debe tener al menos 5 caracteres")
 
+    @classmethod
+    def reconstruir(cls, id: int, texto: str, autor, requerimiento, fecha_hora: datetime) -> "Comentario":
+        """Rehidrata un comentario persistido sin revalidar el texto"""
+        comentario = cls.__new__(cls)
+        comentario.id = id
+        comentario._texto = texto
+        comentario._autor = autor
+        comentario._requerimiento = requerimiento
+        comentario._fecha_hora = fecha_hora
+        return comentario
+
     @property
     def texto(self) -> str:
         """Comentario es inmutable"""
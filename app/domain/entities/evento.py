@@ -7,6 +7,9 @@ from app.domain.enums import TipoEvento
 class Evento(ABC):
     """Clase base abstracta para eventos del sistema"""
 
+    # Sin __dict__: un requerimiento puede arrastrar cientos de eventos
+    __slots__ = ("id", "titulo", "descripcion", "responsable", "requerimiento", "fecha_hora")
+
     def __init__(
             self,
             id: Optional[int],
@@ -23,6 +26,30 @@ class Evento(ABC):
         self.requerimiento = requerimiento
         self.fecha_hora = fecha_hora or datetime.now()
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: Optional[int],
+            titulo: str,
+            descripcion: str,
+            responsable,
+            requerimiento,
+            fecha_hora: datetime
+    ) -> "Evento":
+        """
+        Rehidrata un evento persistido sin pasar por __init__: las subclases
+        arman titulo/descripcion en el constructor, acá se toman tal cual se
+        guardaron.
+        """
+        evento = cls.__new__(cls)
+        evento.id = id
+        evento.titulo = titulo
+        evento.descripcion = descripcion
+        evento.responsable = responsable
+        evento.requerimiento = requerimiento
+        evento.fecha_hora = fecha_hora
+        return evento
+
     @abstractmethod
     def get_tipo_evento(self) -> TipoEvento:
         """Retorna el tipo de evento"""
@@ -43,6 +70,8 @@ class Evento(ABC):
 class EventoCreacion(Evento):
     """Evento de creación de requerimiento"""
 
+    __slots__ = ()
+
     def __init__(
             self,
             id: Optional[int],
@@ -69,6 +98,8 @@ class EventoCreacion(Evento):
 class EventoAsignacion(Evento):
     """Evento de asignación de técnico"""
 
+    __slots__ = ("tecnico_asignado",)
+
     def __init__(
             self,
             id: Optional[int],
@@ -98,6 +129,8 @@ class EventoAsignacion(Evento):
 class EventoDerivacion(Evento):
     """Evento de derivación a otro técnico"""
 
+    __slots__ = ("tecnico_origen", "tecnico_destino", "motivo")
+
     def __init__(
             self,
             id: Optional[int],
@@ -120,6 +153,27 @@ class EventoDerivacion(Evento):
             fecha_hora=fecha_hora
         )
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: Optional[int],
+            titulo: str,
+            descripcion: str,
+            responsable,
+            requerimiento,
+            fecha_hora: datetime,
+            tecnico_origen=None,
+            tecnico_destino=None,
+            motivo: Optional[str] = None
+    ) -> "EventoDerivacion":
+        """Como Evento.reconstruir, más los técnicos y el motivo persistidos"""
+        evento = super().reconstruir(id, titulo, descripcion, responsable, requerimiento, fecha_hora)
+        # El responsable es el técnico de origen (ver __init__)
+        evento.tecnico_origen = tecnico_origen or responsable
+        evento.tecnico_destino = tecnico_destino
+        evento.motivo = motivo
+        return evento
+
     def get_tipo_evento(self) -> TipoEvento:
         return TipoEvento.DERIVACION
 
@@ -131,6 +185,8 @@ class EventoDerivacion(Evento):
 class EventoResolucion(Evento):
     """Evento de resolución de requerimiento"""
 
+    __slots__ = ()
+
     def __init__(
             self,
             id: Optional[int],
@@ -157,6 +213,8 @@ class EventoResolucion(Evento):
 class EventoReapertura(Evento):
     """Evento de reapertura de requerimiento"""
 
+    __slots__ = ("motivo",)
+
     def __init__(
             self,
             id: Optional[int],
@@ -186,6 +244,8 @@ class EventoReapertura(Evento):
 class EventoComentario(Evento):
     """Evento de agregado de comentario"""
 
+    __slots__ = ("comentario",)
+
     def __init__(
             self,
             id: Optional[int],
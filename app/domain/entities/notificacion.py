@@ -5,6 +5,8 @@ from typing import Optional
 class Notificacion:
     """Notificación enviada a un supervisor"""
 
+    __slots__ = ("id", "evento", "supervisor", "fecha_hora_generada", "leida", "fecha_lectura")
+
     def __init__(
             self,
             id: Optional[int],
@@ -21,6 +23,26 @@ class Notificacion:
         self.leida = leida
         self.fecha_lectura = fecha_lectura
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            evento,
+            supervisor,
+            fecha_hora_generada: datetime,
+            leida: bool,
+            fecha_lectura: Optional[datetime]
+    ) -> "Notificacion":
+        """Rehidrata una notificación persistida sin pasar por __init__"""
+        notificacion = cls.__new__(cls)
+        notificacion.id = id
+        notificacion.evento = evento
+        notificacion.supervisor = supervisor
+        notificacion.fecha_hora_generada = fecha_hora_generada
+        notificacion.leida = leida
+        notificacion.fecha_lectura = fecha_lectura
+        return notificacion
+
     def marcar_como_leida(self) -> None:
         """Marca la notificación como leída"""
         if not self.leida:
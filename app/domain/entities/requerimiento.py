@@ -12,6 +12,21 @@ from app.domain.exceptions import (
 class Requerimiento(ABC):
     """Clase base abstracta para requerimientos"""
 
+    # Sin __dict__: se hidratan miles por listado/dashboard (ver benchmarks/memoria.py)
+    __slots__ = (
+        "id", "titulo", "descripcion", "solicitante", "estado", "tecnico_asignado",
+        "fecha_creacion", "fecha_resolucion", "comentarios", "eventos", "posible_duplicado_de",
+        "version"
+    )
+
+    # Guardas de las transiciones de estado. Además de validarlas estos
+    # métodos, el repositorio las aplica como predicados de la escritura
+    # condicional (RequerimientoRepository.transicionar). Resolver exige
+    # además ser el técnico asignado.
+    ESTADOS_ASIGNABLES = frozenset({EstadoRequerimiento.NUEVO, EstadoRequerimiento.ASIGNADO})
+    ESTADOS_RESOLUBLES = frozenset(EstadoRequerimiento) - {EstadoRequerimiento.RESUELTO}
+    ESTADOS_REABRIBLES = frozenset({EstadoRequerimiento.RESUELTO})
+
     def __init__(
             self,
             id: Optional[int],
@@ -31,6 +46,10 @@ class Requerimiento(ABC):
         self.tecnico_asignado = tecnico_asignado
         self.fecha_creacion = fecha_creacion or datetime.now()
         self.fecha_resolucion = fecha_resolucion
+        # ID de un requerimiento abierto casi idéntico (lo marca RequerimientoService al crear)
+        self.posible_duplicado_de: Optional[int] = None
+        # Versión del documento leído (control de concurrencia optimista; 0 = sin persistir)
+        self.version = 0
 
         # Colecciones
         self.comentarios: List = []
@@ -39,6 +58,39 @@ class Requerimiento(ABC):
         # Validaciones
         self._validar_datos()
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            titulo: str,
+            descripcion: str,
+            solicitante,
+            estado: EstadoRequerimiento,
+            tecnico_asignado,
+            fecha_creacion: datetime,
+            fecha_resolucion: Optional[datetime]
+    ) -> "Requerimiento":
+        """
+        Rehidrata un requerimiento persistido sin pasar por __init__: lo que
+        viene de nuestra base ya se validó al escribirse. Las subclases lo
+        extienden con sus atributos propios. Las altas y modificaciones
+        siguen usando el constructor.
+        """
+        req = cls.__new__(cls)
+        req.id = id
+        req.titulo = titulo
+        req.descripcion = descripcion
+        req.solicitante = solicitante
+        req.estado = estado
+        req.tecnico_asignado = tecnico_asignado
+        req.fecha_creacion = fecha_creacion
+        req.fecha_resolucion = fecha_resolucion
+        req.posible_duplicado_de = None
+        req.version = 0
+        req.comentarios = []
+        req.eventos = []
+        return req
+
     def _validar_datos(self):
         """Validaciones comunes a todos los requerimientos"""
         if len(self.titulo) < 5:
@@ -80,7 +132,7 @@ class Requerimiento(ABC):
 
     def asignar_tecnico(self, tecnico, operador) -> None:
         """Asigna un técnico al requerimiento"""
-        if self.estado not in [EstadoRequerimiento.NUEVO, EstadoRequerimiento.ASIGNADO]:
+        if self.estado not in self.ESTADOS_ASIGNABLES:
             raise EstadoInvalidoException(
                 f"No se puede asignar técnico en estado {self.estado.value}"
             )
@@ -117,7 +169,7 @@ class Requerimiento(ABC):
                 "Solo el técnico asignado puede resolver el requerimiento"
             )
 
-        if self.estado == EstadoRequerimiento.RESUELTO:
+        if self.estado not in self.ESTADOS_RESOLUBLES:
             raise EstadoInvalidoException("El requerimiento ya está resuelto")
 
         self.estado = EstadoRequerimiento.RESUELTO
@@ -125,17 +177,21 @@ class Requerimiento(ABC):
 
     def reabrir(self, usuario, motivo: str) -> None:
         """Reabre un requerimiento resuelto"""
-        if self.estado != EstadoRequerimiento.RESUELTO:
+        if self.estado not in self.ESTADOS_REABRIBLES:
             raise EstadoInvalidoException(
                 "Solo se pueden reabrir requerimientos resueltos"
             )
 
-        if len(motivo) < 10:
-            raise ValidacionException("El motivo debe tener al menos 10 caracteres")
+        self.validar_motivo_reapertura(motivo)
 
         self.estado = EstadoRequerimiento.REABIERTO
         self.fecha_resolucion = None
 
+    @staticmethod
+    def validar_motivo_reapertura(motivo: str) -> None:
+        if len(motivo) < 10:
+            raise ValidacionException("El motivo debe tener al menos 10 caracteres")
+
     def get_tiempo_resolucion(self) -> Optional[str]:
         """Calcula el tiempo de resolución si está resuelto"""
         if not self.fecha_resolucion:
@@ -162,12 +218,14 @@ class Requerimiento(ABC):
         return f"<{self.__class__.__name__}(id={self.id}, estado='{self.estado.value}')>"
 
 
-from app.domain.enums import NivelUrgencia, CategoriaIncidente, CategoriaSolicitud
+from app.domain.enums import NivelUrgencia, CategoriaIncidente, CategoriaSolicitud, TipoServicio
 
 
 class Incidente(Requerimiento):
     """Requerimiento de tipo Incidente - Problema con servicio existente"""
 
+    __slots__ = ("nivel_urgencia", "categoria", "tipo_servicio", "es_masivo", "incidente_padre_id")
+
     def __init__(
             self,
             id: Optional[int],
@@ -179,15 +237,48 @@ class Incidente(Requerimiento):
             estado: EstadoRequerimiento = EstadoRequerimiento.NUEVO,
             tecnico_asignado=None,
             fecha_creacion: Optional[datetime] = None,
-            fecha_resolucion: Optional[datetime] = None
+            fecha_resolucion: Optional[datetime] = None,
+            tipo_servicio: Optional[TipoServicio] = None
     ):
         self.nivel_urgencia = nivel_urgencia
         self.categoria = categoria
+        self.tipo_servicio = tipo_servicio  # Servicio afectado, si el solicitante lo indicó
+        # Tormentas: el padre "masivo" agrupa los incidentes iguales de una caída
+        self.es_masivo = False
+        self.incidente_padre_id: Optional[int] = None
         super().__init__(
             id, titulo, descripcion, solicitante, estado,
             tecnico_asignado, fecha_creacion, fecha_resolucion
         )
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            titulo: str,
+            descripcion: str,
+            solicitante,
+            nivel_urgencia: Optional[NivelUrgencia],
+            categoria: Optional[CategoriaIncidente],
+            estado: EstadoRequerimiento,
+            tecnico_asignado,
+            fecha_creacion: datetime,
+            fecha_resolucion: Optional[datetime],
+            tipo_servicio: Optional[TipoServicio] = None,
+            es_masivo: bool = False,
+            incidente_padre_id: Optional[int] = None
+    ) -> "Incidente":
+        req = super().reconstruir(
+            id, titulo, descripcion, solicitante, estado,
+            tecnico_asignado, fecha_creacion, fecha_resolucion
+        )
+        req.nivel_urgencia = nivel_urgencia
+        req.categoria = categoria
+        req.tipo_servicio = tipo_servicio
+        req.es_masivo = es_masivo
+        req.incidente_padre_id = incidente_padre_id
+        return req
+
     def get_tipo(self) -> TipoRequerimiento:
         return TipoRequerimiento.INCIDENTE
 
@@ -220,6 +311,8 @@ class Incidente(Requerimiento):
 class Solicitud(Requerimiento):
     """Requerimiento de tipo Solicitud - Alta/baja de servicios"""
 
+    __slots__ = ("categoria",)
+
     def __init__(
             self,
             id: Optional[int],
@@ -238,6 +331,26 @@ class Solicitud(Requerimiento):
             tecnico_asignado, fecha_creacion, fecha_resolucion
         )
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            titulo: str,
+            descripcion: str,
+            solicitante,
+            categoria: Optional[CategoriaSolicitud],
+            estado: EstadoRequerimiento,
+            tecnico_asignado,
+            fecha_creacion: datetime,
+            fecha_resolucion: Optional[datetime]
+    ) -> "Solicitud":
+        req = super().reconstruir(
+            id, titulo, descripcion, solicitante, estado,
+            tecnico_asignado, fecha_creacion, fecha_resolucion
+        )
+        req.categoria = categoria
+        return req
+
     def get_tipo(self) -> TipoRequerimiento:
         return TipoRequerimiento.SOLICITUD
 
@@ -7,6 +7,8 @@ from app.domain.exceptions import ServicioException
 class Servicio:
     """Servicio suscrito por un solicitante"""
 
+    __slots__ = ("id", "tipo", "numero_servicio", "solicitante", "activo", "fecha_alta")
+
     def __init__(
             self,
             id: Optional[int],
@@ -27,6 +29,26 @@ class Servicio:
         if len(numero_servicio) < 5:
             raise ServicioException("El número de servicio debe tener al menos 5 caracteres")
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            tipo: TipoServicio,
+            numero_servicio: str,
+            solicitante,
+            activo: bool,
+            fecha_alta: Optional[datetime]
+    ) -> "Servicio":
+        """Rehidrata un servicio persistido sin revalidar el número"""
+        servicio = cls.__new__(cls)
+        servicio.id = id
+        servicio.tipo = tipo
+        servicio.numero_servicio = numero_servicio
+        servicio.solicitante = solicitante
+        servicio.activo = activo
+        servicio.fecha_alta = fecha_alta
+        return servicio
+
     def activar(self) -> None:
         """Activa el servicio"""
         if self.activo:
@@ -9,6 +9,9 @@ from app.domain.exceptions import EmailInvalidoException
 class Usuario(ABC):
     """Clase base abstracta para todos los tipos de usuario"""
 
+    # Sin __dict__: las subclases declaran solo sus atributos propios
+    __slots__ = ("id", "nombre", "email", "password_hash", "fecha_creacion", "ultimo_acceso")
+
     def __init__(
             self,
             id: Optional[int],
@@ -25,6 +28,30 @@ class Usuario(ABC):
         self.fecha_creacion = fecha_creacion or datetime.now()
         self.ultimo_acceso = ultimo_acceso
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            nombre: str,
+            email: Optional[Email],
+            password_hash: str,
+            fecha_creacion: Optional[datetime] = None,
+            ultimo_acceso: Optional[datetime] = None
+    ) -> "Usuario":
+        """
+        Rehidrata un usuario persistido sin pasar por __init__ (sin validar
+        email corporativo ni nombre: ya se validaron al registrarlo).
+        Las subclases lo extienden con sus atributos propios.
+        """
+        usuario = cls.__new__(cls)
+        usuario.id = id
+        usuario.nombre = nombre
+        usuario.email = email
+        usuario.password_hash = password_hash
+        usuario.fecha_creacion = fecha_creacion
+        usuario.ultimo_acceso = ultimo_acceso
+        return usuario
+
     @abstractmethod
     def get_tipo_usuario(self) -> TipoUsuario:
         """Retorna el tipo de usuario"""
@@ -60,6 +87,8 @@ class Usuario(ABC):
 class Solicitante(Usuario):
     """Usuario que reporta problemas y solicita servicios"""
 
+    __slots__ = ("servicios_suscritos", "requerimientos_creados")
+
     def __init__(
             self,
             id: Optional[int],
@@ -74,6 +103,22 @@ class Solicitante(Usuario):
         self.servicios_suscritos = servicios_suscritos or []
         self.requerimientos_creados = []
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            nombre: str,
+            email: Optional[Email],
+            password_hash: str,
+            servicios_suscritos: list = None,
+            fecha_creacion: Optional[datetime] = None,
+            ultimo_acceso: Optional[datetime] = None
+    ) -> "Solicitante":
+        usuario = super().reconstruir(id, nombre, email, password_hash, fecha_creacion, ultimo_acceso)
+        usuario.servicios_suscritos = servicios_suscritos or []
+        usuario.requerimientos_creados = []
+        return usuario
+
     def get_tipo_usuario(self) -> TipoUsuario:
         return TipoUsuario.SOLICITANTE
 
@@ -98,6 +143,8 @@ class Solicitante(Usuario):
 class EmpleadoSoporte(Usuario, ABC):
     """Clase base para empleados de soporte (Operador, Técnico)"""
 
+    __slots__ = ()
+
     def __init__(
             self,
             id: Optional[int],
@@ -119,6 +166,8 @@ class EmpleadoSoporte(Usuario, ABC):
 class Operador(EmpleadoSoporte):
     """Operador que asigna requerimientos a técnicos"""
 
+    __slots__ = ("requerimientos_gestionados",)
+
     def __init__(
             self,
             id: Optional[int],
@@ -131,6 +180,20 @@ class Operador(EmpleadoSoporte):
         super().__init__(id, nombre, email, password_hash, fecha_creacion, ultimo_acceso)
         self.requerimientos_gestionados = []
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            nombre: str,
+            email: Optional[Email],
+            password_hash: str,
+            fecha_creacion: Optional[datetime] = None,
+            ultimo_acceso: Optional[datetime] = None
+    ) -> "Operador":
+        usuario = super().reconstruir(id, nombre, email, password_hash, fecha_creacion, ultimo_acceso)
+        usuario.requerimientos_gestionados = []
+        return usuario
+
     def get_tipo_usuario(self) -> TipoUsuario:
         return TipoUsuario.OPERADOR
 
@@ -154,6 +217,8 @@ class Operador(EmpleadoSoporte):
 class Tecnico(EmpleadoSoporte):
     """Técnico que resuelve requerimientos"""
 
+    __slots__ = ("especialidades", "requerimientos_asignados")
+
     def __init__(
             self,
             id: Optional[int],
@@ -168,6 +233,22 @@ class Tecnico(EmpleadoSoporte):
         self.especialidades = especialidades or []
         self.requerimientos_asignados = []
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            nombre: str,
+            email: Optional[Email],
+            password_hash: str,
+            especialidades: list[str] = None,
+            fecha_creacion: Optional[datetime] = None,
+            ultimo_acceso: Optional[datetime] = None
+    ) -> "Tecnico":
+        usuario = super().reconstruir(id, nombre, email, password_hash, fecha_creacion, ultimo_acceso)
+        usuario.especialidades = especialidades or []
+        usuario.requerimientos_asignados = []
+        return usuario
+
     def get_tipo_usuario(self) -> TipoUsuario:
         return TipoUsuario.TECNICO
 
@@ -200,6 +281,8 @@ class Tecnico(EmpleadoSoporte):
 class Supervisor(Usuario):
     """Supervisor que monitorea operadores y técnicos"""
 
+    __slots__ = ("operadores_supervisados", "tecnicos_supervisados", "notificaciones")
+
     def __init__(
             self,
             id: Optional[int],
@@ -216,6 +299,22 @@ class Supervisor(Usuario):
         self.tecnicos_supervisados = tecnicos_supervisados or []
         self.notificaciones = []
 
+    @classmethod
+    def reconstruir(
+            cls,
+            id: int,
+            nombre: str,
+            email: Optional[Email],
+            password_hash: str,
+            fecha_creacion: Optional[datetime] = None,
+            ultimo_acceso: Optional[datetime] = None
+    ) -> "Supervisor":
+        usuario = super().reconstruir(id, nombre, email, password_hash, fecha_creacion, ultimo_acceso)
+        usuario.operadores_supervisados = []
+        usuario.tecnicos_supervisados = []
+        usuario.notificaciones = []
+        return usuario
+
     def get_tipo_usuario(self) -> TipoUsuario:
         return TipoUsuario.SUPERVISOR
 
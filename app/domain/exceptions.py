@@ -6,6 +6,14 @@ class EstadoInvalidoException(RequerimientoException):
     """El estado del requerimiento no permite la operación"""
     pass
 
+class ConflictoVersionException(RequerimientoException):
+    """El requerimiento cambió en la base desde que se leyó (control de concurrencia optimista)"""
+    pass
+
+class RequerimientoArchivadoException(RequerimientoException):
+    """El requerimiento está en el archivo de resueltos: se reabre para volver a modificarlo"""
+    pass
+
 class PermisosDenegadosException(Exception):
     """El usuario no tiene permisos para realizar la acción"""
     pass
@@ -3,6 +3,8 @@ from app.domain.entities.notificacion import Notificacion
 from app.repositories.notificacion_repository import NotificacionRepository
 from app.repositories.usuario_repository import UsuarioRepository
 from app.infrastructure.mongodb.sequence import SequenceGenerator
+from app.infrastructure.tiempos import medida
+from app.infrastructure.metricas import NOTIF_GENERADAS, NOTIF_FANOUT
 
 
 class Notificador:
@@ -16,6 +18,7 @@ class Notificador:
         self.notif_repo = notificacion_repo
         self.sequence = sequence_generator if sequence_generator else getattr(notificacion_repo, 'sequence', None)
 
+    @medida("notificaciones")
     async def notificar_evento(self, evento: Evento):
         """
         Genera notificaciones para los supervisores del responsable del evento.
@@ -23,6 +26,7 @@ class Notificador:
         actor = evento.responsable
 
         supervisores = await self.user_repo.buscar_supervisores_de_empleado(actor.id)
+        NOTIF_FANOUT.observe(len(supervisores))
 
         if not supervisores:
             return
@@ -41,4 +45,5 @@ class Notificador:
             )
 
             # 3. Persistir
-            await self.notif_repo.guardar(notificacion)
\ No newline at end of file
+            await self.notif_repo.guardar(notificacion)
+            NOTIF_GENERADAS.labels(evento.get_tipo_evento().value).inc()
\ No newline at end of file
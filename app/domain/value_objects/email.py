@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from app.domain.exceptions import EmailInvalidoException
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Email:
     """Value Object para emails - Inmutable"""
     valor: str
@@ -12,6 +12,16 @@ class Email:
         if not self._es_valido(self.valor):
             raise EmailInvalidoException(f"Email inválido: {self.valor}")
 
+    @classmethod
+    def confiable(cls, valor: str) -> "Email":
+        """
+        Email ya validado (leído de nuestra base): evita la regex de __post_init__.
+        Para datos de entrada usar siempre Email(valor).
+        """
+        email = object.__new__(cls)
+        object.__setattr__(email, "valor", valor)
+        return email
+
     @staticmethod
     def _es_valido(email: str) -> bool:
         patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
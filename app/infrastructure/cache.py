@@ -0,0 +1,75 @@
+"""
+Caché en memoria del proceso (LRU con vencimiento).
+
+Cada worker tiene la suya: la coherencia entre workers y nodos la da el bus
+de invalidación (app/infrastructure/mongodb/invalidacion.py), que borra las
+claves afectadas cuando cambia la colección de origen. El TTL es una red
+de seguridad por si se pierde algún aviso, o el único vencimiento en las
+cachés de agregados que no se suscriben (dashboard de operador).
+
+Guardar valores inmutables o copias (documentos, dicts de respuesta), nunca
+entidades de dominio que un request pueda modificar.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from app.infrastructure.metricas import CACHE_CONSULTAS
+
+
+class CacheLocal:
+    """
+    LRU con TTL. Cada clave lleva una versión que aumenta al invalidarla
+    (y todas a la vez al vaciar): quien lee de la base la toma con
+    version(clave) antes de la consulta y la pasa a guardar(), así un valor
+    leído antes de una invalidación concurrente de esa clave no se guarda
+    ya viejo. Invalidar otras claves no descarta el llenado.
+    """
+
+    def __init__(self, nombre: str, max_entradas: int = 10000, ttl_segundos: float = 300):
+        self.nombre = nombre
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._epoca = 0
+        self._versiones: Dict[Hashable, int] = {}
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def version(self, clave: Hashable) -> Tuple[int, int]:
+        """Versión actual de la clave, para pasarla a guardar()"""
+        return self._epoca, self._versiones.get(clave, 0)
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        entrada = self._entradas.get(clave)
+        if entrada is None or entrada[0] < time.monotonic():
+            if entrada is not None:
+                del self._entradas[clave]
+            CACHE_CONSULTAS.labels(self.nombre, "miss").inc()
+            return None
+
+        self._entradas.move_to_end(clave)
+        CACHE_CONSULTAS.labels(self.nombre, "hit").inc()
+        return entrada[1]
+
+    def guardar(self, clave: Hashable, valor: Any, version: Optional[Tuple[int, int]] = None) -> None:
+        if version is not None and version != self.version(clave):
+            # La clave se invalidó mientras se leía de la base
+            return
+        self._entradas[clave] = (time.monotonic() + self.ttl_segundos, valor)
+        self._entradas.move_to_end(clave)
+        if len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+
+    def invalidar(self, clave: Hashable) -> None:
+        if len(self._versiones) >= self.max_entradas:
+            # Acotar la memoria: empezar de cero equivale a invalidar todo
+            self._versiones.clear()
+            self._epoca += 1
+        self._versiones[clave] = self._versiones.get(clave, 0) + 1
+        self._entradas.pop(clave, None)
+
+    def vaciar(self) -> None:
+        self._epoca += 1
+        self._versiones.clear()
+        self._entradas.clear()
@@ -0,0 +1,209 @@
+"""
+Métricas de la aplicación (formato Prometheus).
+
+Todas las métricas se declaran en este módulo para tener un único catálogo
+de nombres y etiquetas. Los gauges declaran 'multiprocess_mode' para que
+sumen correctamente cuando uvicorn corre con varios workers.
+
+Con varios workers se debe definir PROMETHEUS_MULTIPROC_DIR (un directorio
+vacío y escribible) antes de arrancar: cada proceso escribe sus valores ahí
+y /metrics los agrega con MultiProcessCollector.
+"""
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# Buckets en segundos pensados para latencias de base de datos (0.5 ms .. 5 s)
+BUCKETS_DB = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Buckets en segundos para requests HTTP completos (5 ms .. 10 s)
+BUCKETS_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+HTTP_SOLICITUDES = Counter(
+    "http_solicitudes_total",
+    "Requests atendidos por ruta y status",
+    ["metodo", "ruta", "status"]
+)
+
+HTTP_DURACION = Histogram(
+    "http_solicitud_duracion_segundos",
+    "Duración de los requests por ruta",
+    ["metodo", "ruta"],
+    buckets=BUCKETS_HTTP
+)
+
+HTTP_EN_CURSO = Gauge(
+    "http_solicitudes_en_curso",
+    "Requests en procesamiento",
+    multiprocess_mode="livesum"
+)
+
+# ============================================================================
+# Pool de conexiones de MongoDB
+# ============================================================================
+
+MONGO_POOL_ESPERA = Histogram(
+    "mongo_pool_espera_checkout_segundos",
+    "Tiempo de espera para obtener una conexión del pool",
+    buckets=BUCKETS_DB
+)
+
+MONGO_POOL_CHECKOUT_FALLIDOS = Counter(
+    "mongo_pool_checkout_fallidos_total",
+    "Checkouts de conexión fallidos",
+    ["motivo"]
+)
+
+MONGO_POOL_EN_USO = Gauge(
+    "mongo_pool_conexiones_en_uso",
+    "Conexiones actualmente tomadas del pool",
+    multiprocess_mode="livesum"
+)
+
+MONGO_POOL_ABIERTAS = Gauge(
+    "mongo_pool_conexiones_abiertas",
+    "Conexiones abiertas contra el servidor",
+    multiprocess_mode="livesum"
+)
+
+# ============================================================================
+# Comandos de MongoDB
+# ============================================================================
+
+MONGO_COMANDO_DURACION = Histogram(
+    "mongo_comando_duracion_segundos",
+    "Duración de los comandos enviados a MongoDB",
+    ["comando", "coleccion"],
+    buckets=BUCKETS_DB
+)
+
+MONGO_COMANDO_DOCUMENTOS = Counter(
+    "mongo_comando_documentos_total",
+    "Documentos devueltos o afectados por los comandos",
+    ["comando", "coleccion"]
+)
+
+MONGO_COMANDO_BYTES = Counter(
+    "mongo_comando_respuesta_bytes_total",
+    "Tamaño BSON de las respuestas recibidas (estimado: 1 de cada MONGODB_MUESTREO_BYTES, escalado)",
+    ["comando", "coleccion"]
+)
+
+MONGO_COMANDO_ERRORES = Counter(
+    "mongo_comando_errores_total",
+    "Comandos que terminaron con error",
+    ["comando", "coleccion"]
+)
+
+MONGO_CONSULTAS_LENTAS = Counter(
+    "mongo_consultas_lentas_total",
+    "Comandos por encima del umbral de consulta lenta, por método de repositorio",
+    ["origen"]
+)
+
+# ============================================================================
+# Autenticación
+# ============================================================================
+
+BCRYPT_PENDIENTES = Gauge(
+    "bcrypt_operaciones_pendientes",
+    "Operaciones bcrypt en cola o en ejecución en el pool dedicado",
+    multiprocess_mode="livesum"
+)
+
+BCRYPT_DURACION = Histogram(
+    "bcrypt_duracion_segundos",
+    "Duración de hash/verificación bcrypt, incluida la espera en cola",
+    ["operacion"],
+    buckets=BUCKETS_HTTP
+)
+
+# ============================================================================
+# Notificaciones
+# ============================================================================
+
+NOTIF_GENERADAS = Counter(
+    "notificaciones_generadas_total",
+    "Notificaciones creadas por tipo de evento",
+    ["tipo_evento"]
+)
+
+NOTIF_FANOUT = Histogram(
+    "notificaciones_destinatarios_por_evento",
+    "Supervisores notificados por cada evento",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50)
+)
+
+# ============================================================================
+# Requerimientos
+# ============================================================================
+
+REQUERIMIENTOS_DUPLICADOS = Counter(
+    "requerimientos_posibles_duplicados_total",
+    "Incidentes creados que se enlazaron a otro abierto casi igual (ambito: solicitante / servicio)",
+    ["ambito"]
+)
+
+INCIDENTES_MASIVOS = Counter(
+    "incidentes_masivos_abiertos_total",
+    "Incidentes masivos abiertos automáticamente por tormentas",
+    ["tipo_servicio"]
+)
+
+INCIDENTES_CORRELACIONADOS = Counter(
+    "incidentes_correlacionados_total",
+    "Incidentes colgados de un incidente masivo",
+    ["tipo_servicio"]
+)
+
+REQUERIMIENTOS_ESCRITURAS_VERSIONADAS = Counter(
+    "requerimientos_escrituras_versionadas_total",
+    "Intentos de escritura con control de versión (resultado: ok / conflicto / agotado / archivado); "
+    "tasa de conflictos = conflicto / total",
+    ["operacion", "resultado"]
+)
+
+# ============================================================================
+# Cachés
+# ============================================================================
+
+CACHE_CONSULTAS = Counter(
+    "cache_consultas_total",
+    "Consultas a cachés y documentos precalculados (resultado: hit / miss)",
+    ["cache", "resultado"]
+)
+
+CACHE_INVALIDACIONES = Counter(
+    "cache_invalidaciones_total",
+    "Cambios recibidos por el bus de invalidación (alcance: clave / total)",
+    ["coleccion", "alcance"]
+)
+
+
+# ============================================================================
+# Exposición
+# ============================================================================
+
+def _multiproceso() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def generar_metricas() -> tuple[bytes, str]:
+    """Serializa las métricas en formato texto; agrega todos los workers si corresponde"""
+    if _multiproceso():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def marcar_proceso_terminado() -> None:
+    """Descarta los gauges 'live' del worker actual al cerrar (solo multiproceso)"""
+    if _multiproceso():
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -6,6 +7,41 @@ class MongoDBSettings(BaseSettings):
     MONGODB_URL: str = "mongodb://mongodb:27017"
     MONGODB_DB_NAME: str = "mesa_ayuda_db"
 
+    # Pool de conexiones (dimensionar con las métricas mongo_pool_*)
+    MONGODB_MAX_POOL_SIZE: int = 10
+    MONGODB_MIN_POOL_SIZE: int = 2
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = 300000
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = 5000  # Falla rápido en vez de encolar indefinidamente
+
+    # Timeouts
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 10000
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = None
+
+    # Compresión de red: lista separada por comas (zstd, snappy, zlib).
+    # Los que no tengan su librería instalada se ignoran.
+    MONGODB_COMPRESSORS: str = "zstd"
+
+    MONGODB_READ_PREFERENCE: str = "primary"
+
+    # Lecturas analíticas (reportes, dashboards, exportaciones) en secundarios,
+    # descartando los atrasados más de N segundos (mínimo admitido: 90)
+    MONGODB_LECTURAS_ANALITICAS_EN_SECUNDARIO: bool = True
+    MONGODB_MAX_STALENESS_SEGUNDOS: int = 90
+    # Sesión con consistencia causal por request (requiere replica set)
+    MONGODB_SESION_CAUSAL: bool = False
+
+    # Monitoreo de comandos: se loguean los que superen este umbral
+    MONGODB_SLOW_QUERY_MS: int = 100
+    # Tamaño BSON de las respuestas: se mide 1 de cada N (0 = solo en las
+    # lentas) porque exige re-codificar la respuesta; el contador se escala por N
+    MONGODB_MUESTREO_BYTES: int = 20
+
+    # Invalidación de cachés entre workers: change streams (requiere replica set)
+    # o, si no están disponibles, sondeo de la colección cache_epochs
+    MONGODB_CHANGE_STREAMS: bool = True
+    MONGODB_INVALIDACION_SONDEO_SEGUNDOS: float = 1.0
+
     class Config:
         env_file = ".env"
 
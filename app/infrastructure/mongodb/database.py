@@ -1,6 +1,9 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
 from typing import Optional
 from app.infrastructure.mongodb.config import mongodb_settings
+from app.infrastructure.mongodb.monitoreo import MonitorPool, MonitorComandos
+from app.infrastructure.mongodb.invalidacion import MonitorEscrituras
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +18,9 @@ class MongoDB:
     _client: Optional[AsyncIOMotorClient] = None
     _database: Optional[AsyncIOMotorDatabase] = None
 
+    # Colecciones de archivo: datos fríos, comprimidos con zstd a nivel de bloque
+    COLECCIONES_ARCHIVO = ["notificaciones_archivo", "requerimientos_archivo"]
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(MongoDB, cls).__new__(cls)
@@ -26,13 +32,22 @@ class MongoDB:
             try:
                 self._client = AsyncIOMotorClient(
                     mongodb_settings.MONGODB_URL,
-                    maxPoolSize=10,
-                    minPoolSize=2
+                    maxPoolSize=mongodb_settings.MONGODB_MAX_POOL_SIZE,
+                    minPoolSize=mongodb_settings.MONGODB_MIN_POOL_SIZE,
+                    maxIdleTimeMS=mongodb_settings.MONGODB_MAX_IDLE_TIME_MS,
+                    waitQueueTimeoutMS=mongodb_settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=mongodb_settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                    connectTimeoutMS=mongodb_settings.MONGODB_CONNECT_TIMEOUT_MS,
+                    socketTimeoutMS=mongodb_settings.MONGODB_SOCKET_TIMEOUT_MS,
+                    compressors=mongodb_settings.MONGODB_COMPRESSORS or None,
+                    readPreference=mongodb_settings.MONGODB_READ_PREFERENCE,
+                    event_listeners=[MonitorPool(), MonitorComandos(), MonitorEscrituras()]
                 )
                 self._database = self._client[mongodb_settings.MONGODB_DB_NAME]
                 await self._client.admin.command('ping')
                 logger.info(f"✅ Conectado a MongoDB: {mongodb_settings.MONGODB_DB_NAME}")
-                await self._crear_indices()
+                # Los índices se reconcilian en segundo plano (ver indices.py)
+                await self._crear_colecciones_archivo()
             except Exception as e:
                 logger.error(f"❌ Error al conectar a MongoDB: {e}")
                 raise
@@ -45,35 +60,32 @@ class MongoDB:
             self._database = None
             logger.info("🔌 Desconectado de MongoDB")
 
+    def get_client(self) -> AsyncIOMotorClient:
+        """Retorna el cliente (para abrir sesiones)"""
+        if self._client is None:
+            raise RuntimeError("Base de datos no inicializada")
+        return self._client
+
     def get_database(self) -> AsyncIOMotorDatabase:
         """Retorna la instancia de la base de datos"""
         if self._database is None:
             raise RuntimeError("Base de datos no inicializada")
         return self._database
 
-    async def _crear_indices(self) -> None:
-        """Crea índices para optimizar consultas"""
+    async def _crear_colecciones_archivo(self) -> None:
+        """Crea las colecciones de archivo con compresión zstd si no existen"""
         db = self.get_database()
-        try:
-            # Usuarios
-            await db.usuarios.create_index("email", unique=True)
-            await db.usuarios.create_index("tipo_usuario")
-
-            # Requerimientos
-            await db.requerimientos.create_index("solicitante_id")
-            await db.requerimientos.create_index("tecnico_asignado_id")
-            await db.requerimientos.create_index("estado")
-            await db.requerimientos.create_index([("estado", 1), ("fecha_creacion", -1)])
-
-            # Servicios
-            await db.servicios.create_index("solicitante_id")
-
-            # Notificaciones
-            await db.notificaciones.create_index([("supervisor_id", 1), ("leida", 1)])
-
-            logger.info("✅ Índices creados")
-        except Exception as e:
-            logger.warning(f"⚠️ Índices: {e}")
+        existentes = await db.list_collection_names()
+        for nombre in self.COLECCIONES_ARCHIVO:
+            if nombre in existentes:
+                continue
+            try:
+                await db.create_collection(
+                    nombre,
+                    storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}}
+                )
+            except OperationFailure as e:
+                logger.warning(f"⚠️ Colección de archivo {nombre}: {e}")
 
 
 mongodb = MongoDB()
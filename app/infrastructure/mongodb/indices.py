@@ -0,0 +1,314 @@
+"""
+Registro declarativo de índices de MongoDB.
+
+Es la única fuente de verdad sobre qué índices debe tener cada colección:
+la aplicación los reconcilia en segundo plano al iniciar y este módulo
+también puede ejecutarse como CLI para revisar o aplicar cambios:
+
+    python -m app.infrastructure.mongodb.indices             # solo reporta diferencias
+    python -m app.infrastructure.mongodb.indices --aplicar   # crea / ajusta índices
+    python -m app.infrastructure.mongodb.indices --aplicar --eliminar-sobrantes
+    python -m app.infrastructure.mongodb.indices --uso       # índices sin uso ($indexStats)
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Opciones que se comparan contra el índice existente para detectar desvíos
+OPCIONES_RELEVANTES = (
+    "unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "weights", "default_language"
+)
+
+
+@dataclass
+class Indice:
+    """Definición declarativa de un índice"""
+    coleccion: str
+    claves: List[Tuple[str, Any]]
+    nombre: Optional[str] = None
+    opciones: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.nombre is None:
+            # Mismo formato que genera MongoDB por defecto (ej. "estado_1_fecha_creacion_-1")
+            self.nombre = "_".join(f"{campo}_{direccion}" for campo, direccion in self.claves)
+
+    def to_model(self) -> IndexModel:
+        return IndexModel(self.claves, name=self.nombre, **self.opciones)
+
+
+@dataclass
+class ReporteIndices:
+    """Resultado de comparar el registro con lo que existe en la base"""
+    faltantes: List[Indice] = field(default_factory=list)
+    distintos: List[Tuple[Indice, dict]] = field(default_factory=list)
+    sobrantes: List[Tuple[str, str]] = field(default_factory=list)  # (coleccion, nombre)
+    retirados: List[Tuple[str, str]] = field(default_factory=list)  # (coleccion, nombre)
+
+    def sin_cambios(self) -> bool:
+        return not (self.faltantes or self.distintos or self.sobrantes or self.retirados)
+
+    def resumen(self) -> str:
+        lineas = [f"+ {i.coleccion}.{i.nombre} (faltante)" for i in self.faltantes]
+        lineas += [f"~ {i.coleccion}.{i.nombre} (opciones distintas)" for i, _ in self.distintos]
+        lineas += [f"- {coleccion}.{nombre} (no declarado)" for coleccion, nombre in self.sobrantes]
+        lineas += [f"- {coleccion}.{nombre} (retirado por configuración)" for coleccion, nombre in self.retirados]
+        return "\n".join(lineas) if lineas else "Índices sincronizados con el registro"
+
+
+def definir_indices() -> List[Indice]:
+    """Registro completo de índices de la aplicación"""
+    indices = [
+        # Usuarios
+        Indice("usuarios", [("email", 1)], opciones={"unique": True}),
+        Indice("usuarios", [("tipo_usuario", 1)]),
+
+        # Requerimientos
+        Indice("requerimientos", [("solicitante_id", 1)]),
+        Indice("requerimientos", [("tecnico_asignado_id", 1)]),
+        Indice("requerimientos", [("estado", 1)]),
+        Indice("requerimientos", [("tipo", 1)]),
+        Indice("requerimientos", [("fecha_creacion", -1)]),
+        Indice("requerimientos", [("estado", 1), ("fecha_creacion", -1)]),
+        # Incidentes masivos: a lo sumo un padre abierto por (servicio, categoría) y búsqueda de hijos
+        Indice(
+            "requerimientos", [("masivo_clave", 1)],
+            opciones={"unique": True, "sparse": True}
+        ),
+        Indice(
+            "requerimientos", [("incidente_padre_id", 1), ("estado", 1)],
+            opciones={"partialFilterExpression": {"incidente_padre_id": {"$type": "number"}}}
+        ),
+        # Búsqueda de texto (/requerimientos/buscar): una colección admite un solo índice de texto
+        Indice(
+            "requerimientos",
+            [("titulo", "text"), ("descripcion", "text"), ("comentarios.texto", "text")],
+            nombre="busqueda_texto",
+            opciones={
+                "weights": {"titulo": 10, "descripcion": 4, "comentarios.texto": 1},
+                "default_language": "spanish"
+            }
+        ),
+
+        # Servicios
+        Indice("servicios", [("solicitante_id", 1)]),
+        Indice("servicios", [("activo", 1)]),
+
+        # Notificaciones
+        Indice("notificaciones", [("supervisor_id", 1), ("leida", 1)]),
+
+        # Tokens revocados: búsqueda por token y expiración automática en 'expiracion'
+        Indice("tokens_revocados", [("token", 1)]),
+        Indice("tokens_revocados", [("expiracion", 1)], opciones={"expireAfterSeconds": 0}),
+    ]
+
+    if settings.NOTIF_TTL_DIAS > 0:
+        # Las notificaciones no leídas tienen fecha_lectura null y nunca expiran
+        indices.append(Indice(
+            "notificaciones", [("fecha_lectura", 1)],
+            nombre="fecha_lectura_ttl",
+            opciones={"expireAfterSeconds": settings.NOTIF_TTL_DIAS * 86400}
+        ))
+
+    return indices
+
+
+def definir_retirados() -> List[Tuple[str, str]]:
+    """
+    Índices (coleccion, nombre) que la configuración actual desactiva y deben
+    eliminarse aunque no se pida --eliminar-sobrantes: si quedaran, seguirían
+    actuando (ej. el TTL seguiría borrando notificaciones con NOTIF_TTL_DIAS=0).
+    """
+    retirados = []
+    if settings.NOTIF_TTL_DIAS <= 0:
+        retirados.append(("notificaciones", "fecha_lectura_ttl"))
+    return retirados
+
+
+class GestorIndices:
+    """
+    Reconcilia el registro de índices contra la base de datos.
+    Es idempotente: puede ejecutarse en cada arranque y desde varios workers.
+    """
+
+    def __init__(
+            self,
+            database: AsyncIOMotorDatabase,
+            indices: Optional[List[Indice]] = None,
+            retirados: Optional[List[Tuple[str, str]]] = None
+    ):
+        self.db = database
+        self.indices = indices if indices is not None else definir_indices()
+        self.retirados = retirados if retirados is not None else definir_retirados()
+
+    def _colecciones(self) -> List[str]:
+        return sorted({indice.coleccion for indice in self.indices} | {c for c, _ in self.retirados})
+
+    async def diferencias(self) -> ReporteIndices:
+        """Compara el registro con los índices existentes sin modificar nada"""
+        reporte = ReporteIndices()
+
+        for coleccion in self._colecciones():
+            existentes = await self.db[coleccion].index_information()
+            declarados = [i for i in self.indices if i.coleccion == coleccion]
+
+            for indice in declarados:
+                actual = existentes.get(indice.nombre)
+                if actual is None:
+                    reporte.faltantes.append(indice)
+                elif not self._coincide(indice, actual):
+                    reporte.distintos.append((indice, actual))
+
+            nombres = {i.nombre for i in declarados}
+            for nombre in existentes:
+                if nombre == "_id_" or nombre in nombres:
+                    continue
+                if (coleccion, nombre) in self.retirados:
+                    reporte.retirados.append((coleccion, nombre))
+                else:
+                    reporte.sobrantes.append((coleccion, nombre))
+
+        return reporte
+
+    async def aplicar(self, eliminar_sobrantes: bool = False) -> ReporteIndices:
+        """
+        Crea los índices faltantes, corrige los que difieren y elimina los
+        retirados por configuración. Los demás no declarados solo se
+        eliminan si se pide explícitamente.
+        """
+        reporte = await self.diferencias()
+
+        for coleccion in self._colecciones():
+            faltantes = [i.to_model() for i in reporte.faltantes if i.coleccion == coleccion]
+            if faltantes:
+                await self.db[coleccion].create_indexes(faltantes)
+
+        for indice, actual in reporte.distintos:
+            if self._solo_cambia_ttl(indice, actual):
+                # collMod ajusta el plazo sin reconstruir el índice
+                await self.db.command(
+                    "collMod", indice.coleccion,
+                    index={"name": indice.nombre, "expireAfterSeconds": indice.opciones["expireAfterSeconds"]}
+                )
+            else:
+                await self.db[indice.coleccion].drop_index(indice.nombre)
+                await self.db[indice.coleccion].create_indexes([indice.to_model()])
+
+        for coleccion, nombre in reporte.retirados:
+            await self.db[coleccion].drop_index(nombre)
+
+        if eliminar_sobrantes:
+            for coleccion, nombre in reporte.sobrantes:
+                await self.db[coleccion].drop_index(nombre)
+
+        return reporte
+
+    async def estadisticas_uso(self) -> List[dict]:
+        """
+        Uso de cada índice según $indexStats (contadores desde el último reinicio del servidor).
+
+        Returns:
+            List[dict]: {coleccion, nombre, operaciones, desde}
+        """
+        estadisticas = []
+        for coleccion in self._colecciones():
+            try:
+                cursor = self.db[coleccion].aggregate([{"$indexStats": {}}])
+                async for doc in cursor:
+                    estadisticas.append({
+                        "coleccion": coleccion,
+                        "nombre": doc["name"],
+                        "operaciones": doc["accesses"]["ops"],
+                        "desde": doc["accesses"]["since"]
+                    })
+            except OperationFailure as e:
+                logger.warning(f"⚠️ $indexStats en {coleccion}: {e}")
+        return estadisticas
+
+    async def sin_uso(self) -> List[dict]:
+        """Índices (excepto _id_) que no registran ninguna operación"""
+        return [
+            e for e in await self.estadisticas_uso()
+            if e["operaciones"] == 0 and e["nombre"] != "_id_"
+        ]
+
+    @staticmethod
+    def _normalizar_claves(claves) -> List[Tuple[str, Any]]:
+        normalizadas = []
+        for campo, direccion in claves:
+            if direccion == "text" or campo in ("_fts", "_ftsx"):
+                # MongoDB reporta los campos de texto como _fts/_ftsx (los campos
+                # reales quedan en 'weights', que se compara aparte)
+                if ("_fts", "text") not in normalizadas:
+                    normalizadas += [("_fts", "text"), ("_ftsx", 1)]
+                continue
+            normalizadas.append((campo, int(direccion) if isinstance(direccion, (int, float)) else direccion))
+        return normalizadas
+
+    def _coincide(self, indice: Indice, actual: dict) -> bool:
+        if self._normalizar_claves(indice.claves) != self._normalizar_claves(actual["key"]):
+            return False
+        return all(indice.opciones.get(op) == actual.get(op) for op in OPCIONES_RELEVANTES)
+
+    def _solo_cambia_ttl(self, indice: Indice, actual: dict) -> bool:
+        if "expireAfterSeconds" not in indice.opciones or "expireAfterSeconds" not in actual:
+            return False
+        if self._normalizar_claves(indice.claves) != self._normalizar_claves(actual["key"]):
+            return False
+        return all(
+            indice.opciones.get(op) == actual.get(op)
+            for op in OPCIONES_RELEVANTES if op != "expireAfterSeconds"
+        )
+
+
+async def reconciliar_indices(database: AsyncIOMotorDatabase) -> None:
+    """Reconciliación de arranque: aplica el registro sin eliminar índices ajenos (sí los retirados)"""
+    try:
+        reporte = await GestorIndices(database).aplicar()
+        if reporte.sin_cambios():
+            logger.info("✅ Índices sincronizados")
+        else:
+            logger.info(f"🔧 Índices reconciliados:\n{reporte.resumen()}")
+    except Exception as e:
+        logger.warning(f"⚠️ Índices: {e}")
+
+
+async def _main(argv: Optional[List[str]] = None) -> int:
+    from app.infrastructure.mongodb.database import mongodb
+
+    parser = argparse.ArgumentParser(description="Gestión de índices de MongoDB")
+    parser.add_argument("--aplicar", action="store_true", help="Crear y ajustar índices")
+    parser.add_argument("--eliminar-sobrantes", action="store_true", help="Eliminar índices no declarados")
+    parser.add_argument("--uso", action="store_true", help="Listar índices sin uso según $indexStats")
+    args = parser.parse_args(argv)
+
+    await mongodb.conectar()
+    try:
+        gestor = GestorIndices(mongodb.get_database())
+
+        if args.aplicar:
+            reporte = await gestor.aplicar(eliminar_sobrantes=args.eliminar_sobrantes)
+            print(reporte.resumen())
+        else:
+            reporte = await gestor.diferencias()
+            print(reporte.resumen())
+
+        if args.uso:
+            for e in await gestor.sin_uso():
+                print(f"? {e['coleccion']}.{e['nombre']} sin uso desde {e['desde']}")
+
+        return 0 if args.aplicar or reporte.sin_cambios() else 1
+    finally:
+        await mongodb.desconectar()
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
@@ -0,0 +1,238 @@
+"""
+Bus de invalidación de cachés entre workers y nodos.
+
+Cada caché en memoria (CacheLocal) se suscribe a la colección de la que
+salen sus datos. El bus escucha los cambios de esas colecciones y borra en
+todas las cachés suscriptas del proceso las claves afectadas.
+
+Dos modos:
+- Change streams (requiere replica set; alcanza con uno de un solo nodo):
+  un stream por colección, invalidación clave por clave.
+- Sondeo de 'cache_epochs' (standalone o change streams deshabilitados):
+  cada worker anota las colecciones en las que escribió (MonitorEscrituras)
+  y cada MONGODB_INVALIDACION_SONDEO_SEGUNDOS incrementa su época; quien ve
+  cambiar la época de una colección más allá de sus propios incrementos
+  vacía sus cachés completas.
+
+Las escrituras del propio worker invalidan además de forma local e
+inmediata en el repositorio, así que el bus solo cubre a los demás.
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Set
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, monitoring
+from pymongo.errors import OperationFailure, PyMongoError
+from app.infrastructure.cache import CacheLocal
+from app.infrastructure.mongodb.config import mongodb_settings
+from app.infrastructure.metricas import CACHE_INVALIDACIONES
+
+logger = logging.getLogger(__name__)
+
+COLECCION_EPOCAS = "cache_epochs"
+
+# Operaciones de change stream que afectan a un único documento
+_OPERACIONES_DOCUMENTO = ("insert", "update", "replace", "delete")
+# El stream reanudado ya no tiene historia: hay que empezar de nuevo
+_HISTORIA_PERDIDA = 286
+
+Claves = Callable[[dict], Iterable[Hashable]]
+
+
+def por_id(cambio: dict) -> Iterable[Hashable]:
+    """Clave por defecto: el _id del documento modificado"""
+    return (cambio["documentKey"]["_id"],)
+
+
+class _Suscripcion(NamedTuple):
+    cache: CacheLocal
+    claves: Optional[Claves]  # None: cualquier cambio vacía la caché
+    documento_completo: bool
+
+
+class BusInvalidacion:
+    """Registro de cachés por colección y tareas que escuchan los cambios (Singleton por proceso)"""
+
+    def __init__(self):
+        self._suscripciones: Dict[str, List[_Suscripcion]] = defaultdict(list)
+        self._tareas: List[asyncio.Task] = []
+        self._sucias: Set[str] = set()
+        self._bloqueo = threading.Lock()  # Los listeners corren en hilos del driver
+        self._epocas: Dict[str, int] = {}
+        self.modo: Optional[str] = None  # "change_streams" / "sondeo"
+
+    def suscribir(
+            self,
+            coleccion: str,
+            cache: CacheLocal,
+            claves: Optional[Claves] = por_id,
+            documento_completo: bool = False
+    ) -> None:
+        """
+        Invalida 'cache' cuando cambia 'coleccion'.
+
+        Args:
+            claves: Claves de la caché afectadas por un evento del change stream.
+                None vacía la caché ante cualquier cambio.
+            documento_completo: El cálculo de claves necesita 'fullDocument'
+                (se abre el stream con updateLookup). En los borrados no hay
+                documento: si 'claves' falla, se vacía la caché.
+        """
+        self._suscripciones[coleccion].append(_Suscripcion(cache, claves, documento_completo))
+
+    def limpiar(self) -> None:
+        """Descarta las suscripciones (al cerrar la aplicación)"""
+        self._suscripciones.clear()
+        self._epocas.clear()
+
+    def difundir(self, coleccion: str, cambio: Optional[dict] = None) -> None:
+        """Aplica un cambio a las cachés suscriptas. Sin 'cambio' las vacía."""
+        operacion = cambio.get("operationType") if cambio else None
+        for suscripcion in self._suscripciones.get(coleccion, ()):
+            if suscripcion.claves is None or operacion not in _OPERACIONES_DOCUMENTO:
+                suscripcion.cache.vaciar()
+                continue
+            try:
+                claves = list(suscripcion.claves(cambio))
+            except (KeyError, TypeError):
+                suscripcion.cache.vaciar()
+                continue
+            for clave in claves:
+                suscripcion.cache.invalidar(clave)
+
+        CACHE_INVALIDACIONES.labels(coleccion, "clave" if operacion in _OPERACIONES_DOCUMENTO else "total").inc()
+
+    def marcar_escritura(self, coleccion: str) -> None:
+        """Anota una escritura del proceso para publicarla en el próximo sondeo"""
+        if coleccion in self._suscripciones:
+            with self._bloqueo:
+                self._sucias.add(coleccion)
+
+    # ========================================================================
+    # Ciclo de vida
+    # ========================================================================
+
+    async def iniciar(self, database: AsyncIOMotorDatabase) -> None:
+        """Arranca la escucha. Se llama desde el lifespan después de registrar las cachés."""
+        if not self._suscripciones:
+            return
+
+        if mongodb_settings.MONGODB_CHANGE_STREAMS and await self._change_streams_disponibles(database):
+            self.modo = "change_streams"
+            self._tareas = [
+                asyncio.create_task(self._escuchar(database, coleccion), name=f"invalidacion:{coleccion}")
+                for coleccion in self._suscripciones
+            ]
+        else:
+            self.modo = "sondeo"
+            self._tareas = [asyncio.create_task(self._sondear(database), name="invalidacion:sondeo")]
+        logger.info(f"🧹 Invalidación de cachés por {self.modo}: {', '.join(self._suscripciones)}")
+
+    async def detener(self) -> None:
+        for tarea in self._tareas:
+            tarea.cancel()
+        for tarea in self._tareas:
+            try:
+                await tarea
+            except asyncio.CancelledError:
+                pass
+        self._tareas = []
+        self.modo = None
+
+    async def _change_streams_disponibles(self, database: AsyncIOMotorDatabase) -> bool:
+        coleccion = next(iter(self._suscripciones))
+        try:
+            async with database[coleccion].watch(max_await_time_ms=1) as stream:
+                await stream.try_next()
+            return True
+        except Exception as e:
+            # Standalone (OperationFailure 40573) o cliente sin soporte de watch
+            logger.warning(f"⚠️ Change streams no disponibles, se usa sondeo de {COLECCION_EPOCAS}: {e}")
+            return False
+
+    # ========================================================================
+    # Change streams
+    # ========================================================================
+
+    async def _escuchar(self, database: AsyncIOMotorDatabase, coleccion: str) -> None:
+        opciones = {}
+        if any(s.documento_completo for s in self._suscripciones[coleccion]):
+            opciones["full_document"] = "updateLookup"
+
+        token = None
+        while True:
+            try:
+                async with database[coleccion].watch(resume_after=token, **opciones) as stream:
+                    async for cambio in stream:
+                        self.difundir(coleccion, cambio)
+                        # Tras 'invalidate' (drop/rename) el stream no se puede reanudar
+                        token = None if cambio["operationType"] == "invalidate" else stream.resume_token
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                logger.warning(f"⚠️ Change stream de {coleccion} interrumpido: {e}")
+                if isinstance(e, OperationFailure) and e.code == _HISTORIA_PERDIDA:
+                    token = None
+                # Mientras estuvo caído pudieron perderse cambios
+                self.difundir(coleccion)
+                await asyncio.sleep(1)
+
+    # ========================================================================
+    # Sondeo de épocas
+    # ========================================================================
+
+    async def _sondear(self, database: AsyncIOMotorDatabase) -> None:
+        epocas = database[COLECCION_EPOCAS]
+        colecciones = list(self._suscripciones)
+        # Una colección sin documento de época equivale a época 0
+        self._epocas = dict.fromkeys(colecciones, 0)
+        intervalo = mongodb_settings.MONGODB_INVALIDACION_SONDEO_SEGUNDOS
+
+        while True:
+            with self._bloqueo:
+                sucias, self._sucias = self._sucias, set()
+            try:
+                for coleccion in sucias:
+                    doc = await epocas.find_one_and_update(
+                        {"_id": coleccion}, {"$inc": {"epoca": 1}},
+                        upsert=True, return_document=ReturnDocument.AFTER
+                    )
+                    # Si nadie más la incrementó desde la última vista, el único
+                    # cambio es el propio (ya invalidado localmente): no se vacía
+                    if doc["epoca"] == self._epocas.get(coleccion, 0) + 1:
+                        self._epocas[coleccion] = doc["epoca"]
+
+                async for doc in epocas.find({"_id": {"$in": colecciones}}):
+                    if self._epocas.get(doc["_id"]) != doc["epoca"]:
+                        self._epocas[doc["_id"]] = doc["epoca"]
+                        self.difundir(doc["_id"])
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                logger.warning(f"⚠️ Sondeo de {COLECCION_EPOCAS} fallido: {e}")
+                with self._bloqueo:
+                    self._sucias |= sucias
+            await asyncio.sleep(intervalo)
+
+
+bus_invalidacion = BusInvalidacion()
+
+
+class MonitorEscrituras(monitoring.CommandListener):
+    """Informa al bus las colecciones escritas por este proceso (modo sondeo)"""
+
+    _ESCRITURAS = frozenset(("insert", "update", "delete", "findAndModify"))
+
+    def started(self, event):
+        if event.command_name in self._ESCRITURAS:
+            coleccion = event.command.get(event.command_name)
+            if isinstance(coleccion, str):
+                bus_invalidacion.marcar_escritura(coleccion)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
@@ -0,0 +1,63 @@
+"""
+Ruteo de lecturas por método de repositorio.
+
+Cada repositorio abre su colección dos veces:
+- get_primaria: escrituras y lecturas que deben ver lo recién escrito
+  (buscar_por_id después de guardar, validaciones de negocio).
+- get_analitica: reportes, dashboards y exportaciones. Van a un secundario
+  (secondaryPreferred) siempre que su atraso no supere
+  MONGODB_MAX_STALENESS_SEGUNDOS; si no hay ninguno, al primario.
+
+Con MONGODB_SESION_CAUSAL cada request abre una sesión con consistencia
+causal (MiddlewareSesionCausal). Los métodos que la pasan con
+session=sesion() leen en el secundario al menos lo que el mismo request ya
+escribió con ella.
+"""
+from contextvars import ContextVar
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.read_preferences import Primary, SecondaryPreferred
+from app.infrastructure.mongodb.config import mongodb_settings
+
+_sesion_causal: ContextVar[Optional[AsyncIOMotorClientSession]] = ContextVar("sesion_causal", default=None)
+
+
+def get_primaria(database: AsyncIOMotorDatabase, nombre: str) -> AsyncIOMotorCollection:
+    """Colección fijada al primario, independiente de MONGODB_READ_PREFERENCE"""
+    return database.get_collection(nombre, read_preference=Primary())
+
+
+def get_analitica(database: AsyncIOMotorDatabase, nombre: str) -> AsyncIOMotorCollection:
+    """Colección para lecturas pesadas que toleran datos algo atrasados"""
+    if not mongodb_settings.MONGODB_LECTURAS_ANALITICAS_EN_SECUNDARIO:
+        return get_primaria(database, nombre)
+    return database.get_collection(
+        nombre,
+        read_preference=SecondaryPreferred(max_staleness=mongodb_settings.MONGODB_MAX_STALENESS_SEGUNDOS)
+    )
+
+
+def sesion() -> Optional[AsyncIOMotorClientSession]:
+    """Sesión causal del request en curso, o None"""
+    return _sesion_causal.get()
+
+
+class MiddlewareSesionCausal:
+    """Middleware ASGI: una sesión con consistencia causal por request HTTP"""
+
+    def __init__(self, app, cliente_factory):
+        self.app = app
+        # El cliente se crea en el lifespan, después de armar la aplicación
+        self.cliente_factory = cliente_factory
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with await self.cliente_factory().start_session(causal_consistency=True) as s:
+            token = _sesion_causal.set(s)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _sesion_causal.reset(token)
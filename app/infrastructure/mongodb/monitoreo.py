@@ -0,0 +1,223 @@
+"""
+Listeners de monitoreo del driver de MongoDB.
+Se registran al crear el cliente en MongoDB.conectar.
+"""
+import functools
+import inspect
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+import bson
+from pymongo import monitoring
+from app.infrastructure.mongodb.config import mongodb_settings
+from app.infrastructure.tiempos import registrar_db
+from app.infrastructure.metricas import (
+    MONGO_POOL_ESPERA,
+    MONGO_POOL_CHECKOUT_FALLIDOS,
+    MONGO_POOL_EN_USO,
+    MONGO_POOL_ABIERTAS,
+    MONGO_COMANDO_DURACION,
+    MONGO_COMANDO_DOCUMENTOS,
+    MONGO_COMANDO_BYTES,
+    MONGO_COMANDO_ERRORES,
+    MONGO_CONSULTAS_LENTAS
+)
+
+logger = logging.getLogger("app.mongodb.consultas_lentas")
+
+# Método de repositorio que originó la consulta en curso.
+# Motor ejecuta el driver en un executor copiando el contexto, por lo que
+# el valor es visible desde los listeners.
+origen_consulta: ContextVar[Optional[str]] = ContextVar("origen_consulta", default=None)
+
+
+def instrumentar(cls):
+    """
+    Decorador de clase para repositorios: cada método async marca en
+    'origen_consulta' el nombre Clase.metodo mientras se ejecuta.
+    """
+    for nombre, metodo in list(vars(cls).items()):
+        if nombre.startswith("__") or not inspect.iscoroutinefunction(metodo):
+            continue
+        setattr(cls, nombre, _con_origen(metodo, f"{cls.__name__}.{nombre}"))
+    return cls
+
+
+def _con_origen(metodo, origen: str):
+    @functools.wraps(metodo)
+    async def envoltura(*args, **kwargs):
+        token = origen_consulta.set(origen)
+        try:
+            return await metodo(*args, **kwargs)
+        finally:
+            origen_consulta.reset(token)
+    return envoltura
+
+
+# Campo del comando donde viaja el filtro, según el tipo de comando
+_CAMPOS_FILTRO = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+    "update": "updates",
+    "delete": "deletes",
+}
+
+
+def forma_consulta(valor: Any) -> Any:
+    """
+    Reduce un filtro a su forma: conserva campos y operadores y reemplaza
+    los valores por '?', para loguear sin exponer datos.
+    """
+    if isinstance(valor, dict):
+        return {k: forma_consulta(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        if valor and all(isinstance(v, (dict, list, tuple)) for v in valor):
+            return [forma_consulta(v) for v in valor]
+        return ["?"]
+    return "?"
+
+
+class MonitorPool(monitoring.ConnectionPoolListener):
+    """
+    Publica la utilización del pool y el tiempo de espera de cada checkout.
+    El checkout ocurre de forma sincrónica en el hilo del executor de Motor,
+    así que el inicio se guarda por hilo cuando el driver no informa 'duration'.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _registrar_espera(self, event) -> float:
+        duracion = getattr(event, "duration", None)
+        if duracion is None:
+            inicio = getattr(self._local, "inicio", None)
+            duracion = time.perf_counter() - inicio if inicio is not None else 0.0
+        return duracion
+
+    def connection_check_out_started(self, event):
+        self._local.inicio = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_ESPERA.observe(self._registrar_espera(event))
+        MONGO_POOL_EN_USO.inc()
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_ESPERA.observe(self._registrar_espera(event))
+        MONGO_POOL_CHECKOUT_FALLIDOS.labels(motivo=str(event.reason)).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_EN_USO.dec()
+
+    def connection_created(self, event):
+        MONGO_POOL_ABIERTAS.inc()
+
+    def connection_closed(self, event):
+        MONGO_POOL_ABIERTAS.dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+
+class MonitorComandos(monitoring.CommandListener):
+    """
+    Registra duración, colección y documentos de cada comando (y bytes de
+    una muestra), y loguea los que superan MONGODB_SLOW_QUERY_MS junto con
+    el método de repositorio que los originó y la forma (sanitizada) del filtro.
+    """
+
+    def __init__(self, umbral_lento_ms: Optional[int] = None, muestreo_bytes: Optional[int] = None):
+        self.umbral_lento = (
+            umbral_lento_ms if umbral_lento_ms is not None else mongodb_settings.MONGODB_SLOW_QUERY_MS
+        ) / 1000
+        self.muestreo_bytes = (
+            muestreo_bytes if muestreo_bytes is not None else mongodb_settings.MONGODB_MUESTREO_BYTES
+        )
+        self._respuestas = itertools.count()
+        # (request_id, connection_id) -> (coleccion, comando)
+        self._en_curso: Dict[Tuple[int, Any], Tuple[str, dict]] = {}
+
+    @staticmethod
+    def _coleccion(event) -> str:
+        objetivo = event.command.get(event.command_name)
+        if isinstance(objetivo, str):
+            return objetivo
+        # getMore lleva el id del cursor; la colección viaja en 'collection'
+        return event.command.get("collection", "-")
+
+    @staticmethod
+    def _documentos(reply: dict) -> int:
+        cursor = reply.get("cursor")
+        if cursor is not None:
+            return len(cursor.get("firstBatch", cursor.get("nextBatch", ())))
+        if "n" in reply:
+            return reply["n"]
+        return 1 if reply.get("value") is not None else 0
+
+    def started(self, event):
+        self._en_curso[(event.request_id, event.connection_id)] = (self._coleccion(event), event.command)
+
+    def succeeded(self, event):
+        coleccion, comando = self._en_curso.pop((event.request_id, event.connection_id), ("-", None))
+        duracion = event.duration_micros / 1_000_000
+        registrar_db(duracion)
+        documentos = self._documentos(event.reply)
+
+        MONGO_COMANDO_DURACION.labels(event.command_name, coleccion).observe(duracion)
+        MONGO_COMANDO_DOCUMENTOS.labels(event.command_name, coleccion).inc(documentos)
+
+        # Re-codificar la respuesta cuesta tanto como leerla: solo una muestra
+        tamanio = None
+        if self.muestreo_bytes > 0 and next(self._respuestas) % self.muestreo_bytes == 0:
+            tamanio = len(bson.encode(event.reply))
+            MONGO_COMANDO_BYTES.labels(event.command_name, coleccion).inc(tamanio * self.muestreo_bytes)
+
+        if duracion >= self.umbral_lento:
+            if tamanio is None:
+                tamanio = len(bson.encode(event.reply))
+            self._loguear_lenta(event, coleccion, comando, duracion, documentos, tamanio)
+
+    def failed(self, event):
+        coleccion, _ = self._en_curso.pop((event.request_id, event.connection_id), ("-", None))
+        duracion = event.duration_micros / 1_000_000
+        registrar_db(duracion)
+        MONGO_COMANDO_DURACION.labels(event.command_name, coleccion).observe(duracion)
+        MONGO_COMANDO_ERRORES.labels(event.command_name, coleccion).inc()
+
+    def _loguear_lenta(self, event, coleccion, comando, duracion, documentos, tamanio):
+        origen = origen_consulta.get() or "desconocido"
+        MONGO_CONSULTAS_LENTAS.labels(origen).inc()
+
+        campo = _CAMPOS_FILTRO.get(event.command_name)
+        forma = forma_consulta(comando.get(campo)) if comando and campo else None
+
+        logger.warning(
+            f"🐢 {origen} {event.command_name} {coleccion} "
+            f"{duracion * 1000:.1f} ms docs={documentos} bytes={tamanio} filtro={forma}",
+            extra={
+                "origen": origen,
+                "comando": event.command_name,
+                "coleccion": coleccion,
+                "duracion_ms": round(duracion * 1000, 2),
+                "documentos": documentos,
+                "bytes": tamanio,
+                "filtro": forma,
+            }
+        )
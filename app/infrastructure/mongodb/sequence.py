@@ -1,6 +1,8 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import ReturnDocument
+from app.infrastructure.mongodb.monitoreo import instrumentar
 
+@instrumentar
 class SequenceGenerator:
     """Genera IDs secuenciales para simular AUTO_INCREMENT"""
 
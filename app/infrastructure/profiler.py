@@ -0,0 +1,136 @@
+"""
+Profiler estadístico bajo demanda del worker en ejecución.
+
+Toma muestras durante un tiempo acotado y devuelve las pilas en formato
+"collapsed" (una línea 'marco;marco;marco cantidad'), compatible con
+flamegraph.pl, speedscope e inferno.
+
+Modos:
+    wall  Recorre las tareas de asyncio desde el propio event loop y registra
+          en qué await está cada una. Muestra dónde se va el tiempo de
+          espera (MongoDB, bcrypt, locks) de los requests en curso.
+    cpu   Un hilo muestrea sys._current_frames() de todos los hilos y
+          descarta los que están esperando (selector del loop, colas de los
+          executors). Muestra qué código ocupa CPU, incluido el que bloquea
+          el event loop. La detección de espera es heurística.
+
+Solo se perfila el proceso que atiende el request; con varios workers cada
+uno debe perfilarse por separado. Este módulo solo se importa si
+PROFILER_HABILITADO está activo.
+"""
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+MODOS = ("wall", "cpu")
+
+# (archivo, función) del marco superior de un hilo que está esperando
+_ESPERAS = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+def _etiqueta(codigo, linea: Optional[int] = None) -> str:
+    archivo = os.path.basename(codigo.co_filename)
+    return f"{codigo.co_name} ({archivo}:{linea or codigo.co_firstlineno})"
+
+
+def _pila_de_frame(frame: Optional[FrameType]) -> list:
+    marcos = []
+    while frame is not None:
+        marcos.append(_etiqueta(frame.f_code))
+        frame = frame.f_back
+    marcos.reverse()
+    return marcos
+
+
+def _pila_de_tarea(tarea: asyncio.Task) -> list:
+    """Cadena de awaits de una tarea, desde la corrutina raíz hasta la espera actual"""
+    marcos = []
+    actual = tarea.get_coro()
+    while actual is not None:
+        codigo = getattr(actual, "cr_code", None) or getattr(actual, "gi_code", None)
+        if codigo is None:
+            # Future u otro awaitable sin marco propio: es la espera en sí
+            marcos.append("<await>")
+            break
+        frame = getattr(actual, "cr_frame", None) or getattr(actual, "gi_frame", None)
+        marcos.append(_etiqueta(codigo, frame.f_lineno if frame else None))
+        actual = getattr(actual, "cr_await", None) or getattr(actual, "gi_yieldfrom", None)
+    return marcos
+
+
+def _nombre_hilo(nombre: str) -> str:
+    # "ThreadPoolExecutor-0_3" / "bcrypt_1" -> un solo marco raíz por pool
+    return re.sub(r"[-_]\d+(_\d+)?$", "", nombre)
+
+
+def _colapsar(conteos: Counter) -> str:
+    return "\n".join(f"{pila} {cantidad}" for pila, cantidad in conteos.most_common()) + "\n"
+
+
+class Perfilador:
+    """Ejecuta un perfil a la vez por proceso"""
+
+    def __init__(self, intervalo_ms: float):
+        self.intervalo = intervalo_ms / 1000
+        self._lock = asyncio.Lock()
+
+    @property
+    def ocupado(self) -> bool:
+        return self._lock.locked()
+
+    async def perfilar(self, segundos: float, modo: str) -> str:
+        if modo not in MODOS:
+            raise ValueError(f"Modo de perfil inválido: {modo}")
+
+        async with self._lock:
+            if modo == "wall":
+                conteos = await self._muestrear_tareas(segundos)
+            else:
+                conteos = await asyncio.to_thread(self._muestrear_hilos, segundos)
+        return _colapsar(conteos)
+
+    async def _muestrear_tareas(self, segundos: float) -> Counter:
+        propia = asyncio.current_task()
+        conteos = Counter()
+        fin = time.monotonic() + segundos
+
+        while time.monotonic() < fin:
+            for tarea in asyncio.all_tasks():
+                if tarea is propia:
+                    continue
+                pila = _pila_de_tarea(tarea)
+                if pila:
+                    conteos[";".join(pila)] += 1
+            await asyncio.sleep(self.intervalo)
+
+        return conteos
+
+    def _muestrear_hilos(self, segundos: float) -> Counter:
+        propio = threading.get_ident()
+        conteos = Counter()
+        fin = time.monotonic() + segundos
+
+        while time.monotonic() < fin:
+            nombres = {hilo.ident: hilo.name for hilo in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                codigo = frame.f_code
+                if (os.path.basename(codigo.co_filename), codigo.co_name) in _ESPERAS:
+                    continue
+                raiz = f"hilo:{_nombre_hilo(nombres.get(ident, str(ident)))}"
+                conteos[";".join([raiz] + _pila_de_frame(frame))] += 1
+            time.sleep(self.intervalo)
+
+        return conteos
@@ -0,0 +1,44 @@
+"""
+Respuestas JSON del camino rápido de lectura.
+
+Los listados de mayor volumen no reconstruyen entidades de dominio: los
+repositorios mapean los documentos de MongoDB directamente a diccionarios
+con la forma del schema de respuesta, y se serializan con orjson.
+
+El response_model de la ruta se sigue declarando (documentación OpenAPI),
+pero FastAPI no lo aplica cuando el endpoint devuelve un Response ya
+armado; por eso la validación contra el schema se hace acá, una sola vez.
+"""
+from typing import Any, Dict, Type
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.config import settings
+from app.infrastructure.tiempos import medir
+
+_adaptadores: Dict[Any, TypeAdapter] = {}
+
+
+class RespuestaJSON(JSONResponse):
+    """JSONResponse serializada con orjson (datetime y enums nativos)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def respuesta_directa(contenido: Any, esquema: Type, status_code: int = 200) -> RespuestaJSON:
+    """
+    Arma la respuesta del camino rápido.
+
+    Con VALIDAR_RESPUESTAS_DIRECTAS el contenido se valida contra 'esquema'
+    antes de serializar: un desvío entre el mapeo y el schema falla igual
+    que lo haría el response_model. Deshabilitado, se confía en el mapeo.
+    """
+    with medir("serializacion"):
+        if settings.VALIDAR_RESPUESTAS_DIRECTAS:
+            adaptador = _adaptadores.get(esquema)
+            if adaptador is None:
+                adaptador = _adaptadores[esquema] = TypeAdapter(esquema)
+            adaptador.validate_python(contenido)
+
+        return RespuestaJSON(contenido, status_code=status_code)
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TareaPeriodica:
+    """
+    Ejecuta una corrutina en segundo plano a intervalos regulares.
+    Se inicia y detiene desde el ciclo de vida de la aplicación (lifespan).
+    """
+
+    def __init__(
+            self,
+            nombre: str,
+            funcion: Callable[[], Awaitable],
+            intervalo_segundos: float,
+            ejecutar_al_iniciar: bool = True
+    ):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.intervalo_segundos = intervalo_segundos
+        self.ejecutar_al_iniciar = ejecutar_al_iniciar
+        self._task: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        """Programa la tarea en el event loop actual"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._bucle(), name=self.nombre)
+
+    async def detener(self) -> None:
+        """Cancela la tarea y espera a que termine"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _bucle(self) -> None:
+        if not self.ejecutar_al_iniciar:
+            await asyncio.sleep(self.intervalo_segundos)
+
+        while True:
+            try:
+                await self.funcion()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Un fallo puntual no debe matar la tarea; se reintenta en el próximo ciclo
+                logger.warning(f"⚠️ Tarea '{self.nombre}' falló: {e}")
+            await asyncio.sleep(self.intervalo_segundos)
@@ -0,0 +1,191 @@
+"""
+Desglose de latencia por request.
+
+Cada request HTTP tiene un TiemposSolicitud en un ContextVar. Las fases
+se miden con 'medir' y son exclusivas: el tiempo de una fase anidada o de
+un comando de MongoDB se descuenta de la fase que la contiene, de modo que
+la suma de las fases aproxima el total del request.
+
+Fases:
+    auth           get_current_user (JWT + carga del usuario)
+    servicio       función del endpoint (lógica de dominio y servicios)
+    notificaciones Notificador.notificar_evento
+    db             comandos de MongoDB (MonitorComandos)
+    serializacion  resto del manejador de FastAPI: validación del body y
+                   validación/serialización Pydantic de la respuesta
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from fastapi.routing import APIRoute
+from app.config import settings
+from app.infrastructure.metricas import HTTP_SOLICITUDES, HTTP_DURACION, HTTP_EN_CURSO
+
+logger = logging.getLogger("app.solicitudes")
+
+
+class TiemposSolicitud:
+    """Acumulador de tiempo (en segundos) por fase de un request"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fases: Dict[str, float] = {}
+        # Los listeners del driver corren en threads del executor de Motor
+        self._lock = threading.Lock()
+
+    def sumar(self, fase: str, segundos: float, contenedora: Optional[str] = None) -> None:
+        with self._lock:
+            self.fases[fase] = self.fases.get(fase, 0.0) + segundos
+            if contenedora is not None:
+                self.fases[contenedora] = self.fases.get(contenedora, 0.0) - segundos
+
+    def total(self) -> float:
+        return time.perf_counter() - self.inicio
+
+    def a_milisegundos(self) -> Dict[str, float]:
+        # Con fan-out concurrente una fase puede quedar levemente negativa
+        return {fase: round(max(seg, 0.0) * 1000, 2) for fase, seg in self.fases.items()}
+
+    def server_timing(self) -> str:
+        metricas = [f"{fase};dur={ms}" for fase, ms in self.a_milisegundos().items()]
+        metricas.append(f"total;dur={round(self.total() * 1000, 2)}")
+        return ", ".join(metricas)
+
+
+tiempos_solicitud: ContextVar[Optional[TiemposSolicitud]] = ContextVar("tiempos_solicitud", default=None)
+fase_actual: ContextVar[Optional[str]] = ContextVar("fase_actual", default=None)
+
+
+@contextmanager
+def medir(fase: str):
+    """Mide un bloque como fase del request actual (no hace nada fuera de un request)"""
+    tiempos = tiempos_solicitud.get()
+    if tiempos is None:
+        yield
+        return
+
+    contenedora = fase_actual.get()
+    token = fase_actual.set(fase)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        fase_actual.reset(token)
+        tiempos.sumar(fase, time.perf_counter() - inicio, contenedora)
+
+
+def medida(fase: str):
+    """Decorador equivalente a 'medir' para corrutinas"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        async def envoltura(*args, **kwargs):
+            with medir(fase):
+                return await funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def registrar_db(segundos: float) -> None:
+    """Suma tiempo de MongoDB al request actual; lo invoca MonitorComandos"""
+    tiempos = tiempos_solicitud.get()
+    if tiempos is not None:
+        tiempos.sumar("db", segundos, fase_actual.get())
+
+
+class RutaMedida(APIRoute):
+    """
+    APIRoute que separa la función del endpoint ('servicio') del resto del
+    manejador de FastAPI ('serializacion'). Se usa como route_class de los routers.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = medida("servicio")(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        manejador = super().get_route_handler()
+
+        async def manejador_medido(request):
+            with medir("serializacion"):
+                return await manejador(request)
+
+        return manejador_medido
+
+
+def plantilla_ruta(scope) -> Optional[str]:
+    """Path declarado de la ruta (ej. /api/v1/requerimientos/{id}); None si no hubo match"""
+    # FastAPI >= 0.13x conserva la ruta original del router y expone el path con prefijo aparte
+    contexto = scope.get("fastapi", {}).get("effective_route_context")
+    if contexto is not None and getattr(contexto, "path", None):
+        return contexto.path
+    return getattr(scope.get("route"), "path", None)
+
+
+class MiddlewareTiempos:
+    """
+    Middleware ASGI: crea el TiemposSolicitud del request, agrega el header
+    Server-Timing, registra una línea de log con ruta, status y fases y
+    actualiza las métricas HTTP de /metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tiempos = TiemposSolicitud()
+        token = tiempos_solicitud.set(tiempos)
+        status = 500
+        HTTP_EN_CURSO.inc()
+
+        async def enviar(mensaje):
+            nonlocal status
+            if mensaje["type"] == "http.response.start":
+                status = mensaje["status"]
+                if settings.SERVER_TIMING_HABILITADO:
+                    mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                        (b"server-timing", tiempos.server_timing().encode("latin-1"))
+                    ]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            tiempos_solicitud.reset(token)
+            HTTP_EN_CURSO.dec()
+            self._registrar(scope, status, tiempos)
+
+    @staticmethod
+    def _registrar(scope, status: int, tiempos: TiemposSolicitud) -> None:
+        plantilla = plantilla_ruta(scope)
+        total = tiempos.total()
+
+        # Las rutas inexistentes comparten etiqueta para no multiplicar series
+        ruta_metrica = plantilla or "sin_ruta"
+        HTTP_SOLICITUDES.labels(scope["method"], ruta_metrica, status).inc()
+        HTTP_DURACION.labels(scope["method"], ruta_metrica).observe(total)
+
+        plantilla = plantilla or scope["path"]
+        total_ms = round(total * 1000, 2)
+        fases = tiempos.a_milisegundos()
+
+        logger.info(
+            f"⏱️ {scope['method']} {plantilla} {status} {total_ms} ms "
+            + " ".join(f"{fase}={ms}" for fase, ms in fases.items()),
+            extra={
+                "metodo": scope["method"],
+                "ruta": plantilla,
+                "status": status,
+                "total_ms": total_ms,
+                "fases_ms": fases,
+            }
+        )
@@ -1,7 +1,8 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import bcrypt
 import passlib.handlers.bcrypt
 from app.services.exceptions import (
@@ -23,6 +24,17 @@ from app.routers import (
     asignaciones, notificaciones, servicios, reportes
 )
 from app.infrastructure.mongodb.database import mongodb
+from app.infrastructure.mongodb.indices import reconciliar_indices
+from app.infrastructure.mongodb.invalidacion import bus_invalidacion
+from app.infrastructure.mongodb.lecturas import MiddlewareSesionCausal
+from app.infrastructure.mongodb.config import mongodb_settings
+from app.infrastructure.tareas import TareaPeriodica
+from app.infrastructure.tiempos import MiddlewareTiempos, RutaMedida
+from app.infrastructure.metricas import generar_metricas, marcar_proceso_terminado
+from app.dependencies.contenedor import contenedor
+from app.config import settings
+from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
 import logging
 
 
@@ -49,11 +61,76 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Error al iniciar: {e}")
         raise
 
+    # Reconciliación de índices en segundo plano: no bloquea el arranque
+    db = mongodb.get_database()
+    tarea_indices = asyncio.create_task(reconciliar_indices(db))
+
+    # Repositorios y servicios compartidos por todos los requests
+    contenedor.inicializar(db)
+    # Coherencia de las cachés en memoria entre workers
+    await bus_invalidacion.iniciar(db)
+
+    # Tareas de mantenimiento en segundo plano
+    notif_repo = contenedor.notificacion_repo
+    req_repo = contenedor.requerimiento_repo
+    tareas = [
+        TareaPeriodica(
+            "reconciliar_contadores_notificaciones",
+            notif_repo.reconciliar_contadores,
+            settings.NOTIF_RECONCILIACION_SEGUNDOS
+        )
+    ]
+    if settings.DUPLICADOS_HABILITADO:
+        async def reconstruir_indice_duplicados():
+            cantidad = await contenedor.req_service.reconstruir_indice_duplicados()
+            logger.info(f"🔁 Índice de duplicados: {cantidad} incidentes abiertos")
+
+        tareas.append(TareaPeriodica(
+            "reconstruir_indice_duplicados",
+            reconstruir_indice_duplicados,
+            settings.DUPLICADOS_RECONSTRUCCION_SEGUNDOS
+        ))
+
+    if settings.NOTIF_ARCHIVO_HABILITADO:
+        async def archivar_notificaciones():
+            limite = datetime.now() - timedelta(days=settings.NOTIF_ARCHIVO_DIAS)
+            cantidad = await notif_repo.archivar_leidas(limite, settings.NOTIF_ARCHIVO_LOTE)
+            if cantidad:
+                logger.info(f"🗄️ {cantidad} notificaciones archivadas")
+
+        tareas.append(TareaPeriodica(
+            "archivar_notificaciones",
+            archivar_notificaciones,
+            settings.NOTIF_ARCHIVO_INTERVALO_SEGUNDOS
+        ))
+
+    if settings.REQ_ARCHIVO_MESES > 0:
+        async def archivar_requerimientos():
+            limite = datetime.now() - relativedelta(months=settings.REQ_ARCHIVO_MESES)
+            cantidad = await req_repo.archivar_resueltos(limite, settings.REQ_ARCHIVO_LOTE)
+            if cantidad:
+                logger.info(f"🗄️ {cantidad} requerimientos resueltos archivados")
+
+        tareas.append(TareaPeriodica(
+            "archivar_requerimientos",
+            archivar_requerimientos,
+            settings.REQ_ARCHIVO_INTERVALO_SEGUNDOS
+        ))
+
+    for tarea in tareas:
+        tarea.iniciar()
+
     yield  # La aplicación se ejecuta aquí
 
-    # Shutdown: Desconectar de MongoDB
+    # Shutdown: Detener tareas y desconectar de MongoDB
     logger.info("🛑 Cerrando aplicación...")
+    tarea_indices.cancel()
+    for tarea in tareas:
+        await tarea.detener()
+    await bus_invalidacion.detener()
+    contenedor.limpiar()
     await mongodb.desconectar()
+    marcar_proceso_terminado()
     logger.info("✅ Aplicación cerrada correctamente")
 
 
@@ -78,6 +155,7 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan  # ← Gestión del ciclo de vida
 )
+app.router.route_class = RutaMedida
 @app.exception_handler(NotFoundException)
 async def not_found_handler(request: Request, exc: NotFoundException):
     return JSONResponse(
@@ -115,6 +193,13 @@ async def value_error_handler(request: Request, exc: ValueError):
         content={"detail": str(exc)}
     )
 
+# Sesión causal por request: las lecturas en secundarios ven lo escrito antes en el mismo request
+if mongodb_settings.MONGODB_SESION_CAUSAL:
+    app.add_middleware(MiddlewareSesionCausal, cliente_factory=mongodb.get_client)
+
+# Desglose de latencia por fase (Server-Timing + log por request)
+app.add_middleware(MiddlewareTiempos)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -134,6 +219,10 @@ app.include_router(notificaciones.router, prefix="/api/v1/notificaciones", tags=
 app.include_router(servicios.router, prefix="/api/v1/servicios", tags=["Servicios"])
 app.include_router(reportes.router, prefix="/api/v1/reportes", tags=["Reportes"])
 
+if settings.PROFILER_HABILITADO:
+    from app.routers import diagnostico
+    app.include_router(diagnostico.router, prefix="/api/v1/admin", tags=["Diagnóstico"])
+
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -162,3 +251,10 @@ async def health_check():
         "mongodb": mongodb_status
     }
 
+
+if settings.METRICAS_HABILITADAS:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metricas():
+        """Métricas en formato Prometheus (agrega todos los workers si PROMETHEUS_MULTIPROC_DIR está definido)"""
+        contenido, content_type = generar_metricas()
+        return Response(content=contenido, media_type=content_type)
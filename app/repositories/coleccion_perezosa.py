@@ -0,0 +1,139 @@
+"""
+Colecciones perezosas para el historial de un requerimiento (comentarios y eventos).
+
+Leer la historia completa en cada lectura encarece listados y transiciones
+que nunca la usan. El repositorio entrega en su lugar una ColeccionPerezosa:
+- Si el documento se leyó sin la historia, nada se trae hasta que se pide
+  con 'await cargar()' (todo) o 'await ultimos(n)' ($slice: -n).
+- Si ya vino en el documento (completa o solo los últimos elementos), los
+  subdocumentos se guardan crudos y se construyen recién al pedirlos.
+- Lo agregado con append() no necesita cargar nada: queda en 'nuevos' y
+  RequerimientoRepository.guardar lo persiste con $push.
+
+Construir entidades puede requerir buscar autores (async), por eso el
+acceso síncrono (iterar, len, índices) solo vale después de cargar(); antes
+levanta HistoriaNoCargadaException, que indica un error de programación.
+La excepción son los índices negativos sobre lo que ya está en memoria
+(ej. eventos[-1] recién agregado o traído con ultimos(n)).
+"""
+from typing import Awaitable, Callable, Generic, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Subdocumentos crudos -> entidades
+Constructor = Callable[[List[dict]], Awaitable[List[T]]]
+# Cantidad de últimos elementos (None = todos) -> subdocumentos crudos
+Cargador = Callable[[Optional[int]], Awaitable[List[dict]]]
+
+
+class HistoriaNoCargadaException(RuntimeError):
+    """Acceso síncrono a una colección que no se cargó con 'await cargar()'"""
+    pass
+
+
+class ColeccionPerezosa(Generic[T]):
+    """Historia de un requerimiento que se trae de MongoDB recién al usarla"""
+
+    __slots__ = ("_construir", "_cargador", "_crudos", "_completa", "_items", "nuevos")
+
+    def __init__(
+            self,
+            construir: Constructor,
+            cargador: Cargador,
+            crudos: Optional[List[dict]] = None,
+            completa: bool = True
+    ):
+        """
+        Args:
+            crudos: Subdocumentos que ya vinieron en la lectura, o None si
+                se proyectaron afuera.
+            completa: Si 'crudos' es toda la historia o solo los últimos
+                elementos ($slice).
+        """
+        self._construir = construir
+        self._cargador = cargador
+        self._crudos = crudos
+        self._completa = crudos is not None and completa
+        self._items: Optional[List[T]] = None
+        self.nuevos: List[T] = []
+
+    @property
+    def cargada(self) -> bool:
+        """Si está toda en memoria y construida (admite acceso síncrono)"""
+        return self._completa and self._items is not None
+
+    async def cargar(self) -> "ColeccionPerezosa[T]":
+        """Trae (si hace falta) y construye la historia completa"""
+        if not self._completa:
+            self._crudos = await self._cargador(None)
+            self._completa = True
+            self._items = None
+        await self._construir_items()
+        return self
+
+    async def ultimos(self, n: int) -> List[T]:
+        """Los últimos n elementos, trayendo solo esos si no están en memoria"""
+        if n <= 0:
+            return []
+        faltan = n - len(self.nuevos)
+        if faltan <= 0:
+            return self.nuevos[-n:]
+
+        if not self._completa and self._disponibles() < faltan:
+            self._crudos = await self._cargador(faltan)
+            # Si vinieron menos de los pedidos, es toda la historia
+            self._completa = len(self._crudos) < faltan
+            self._items = None
+        await self._construir_items()
+        return self._items[-faltan:] + self.nuevos
+
+    async def ultimo(self) -> Optional[T]:
+        ultimos = await self.ultimos(1)
+        return ultimos[0] if ultimos else None
+
+    def append(self, item: T) -> None:
+        self.nuevos.append(item)
+
+    def confirmar(self) -> None:
+        """Los nuevos ya se persistieron: pasan a ser los últimos conocidos"""
+        if self._items is None:
+            # Subdocumentos sin construir: se descartan y se releen si se piden
+            self._crudos = []
+            self._items = []
+            self._completa = False
+        self._items.extend(self.nuevos)
+        self.nuevos = []
+
+    async def _construir_items(self) -> None:
+        if self._items is None:
+            self._items = await self._construir(self._crudos or [])
+
+    def _disponibles(self) -> int:
+        """Cuántos de los últimos elementos persistidos hay en memoria"""
+        if self._items is not None:
+            return len(self._items)
+        return len(self._crudos or [])
+
+    def _lista(self) -> List[T]:
+        if not self.cargada:
+            raise HistoriaNoCargadaException(
+                "Historia no cargada: usar 'await cargar()' o 'await ultimos(n)' antes de accederla"
+            )
+        return self._items + self.nuevos
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._lista())
+
+    def __len__(self) -> int:
+        return len(self._lista())
+
+    def __getitem__(self, indice):
+        if not self.cargada and isinstance(indice, int) and indice < 0:
+            conocidos = (self._items or []) + self.nuevos
+            if -indice <= len(conocidos):
+                return conocidos[indice]
+        return self._lista()[indice]
+
+    def __repr__(self) -> str:
+        estado = "cargada" if self.cargada else "sin cargar"
+        return f"<ColeccionPerezosa({estado}, nuevos={len(self.nuevos)})>"
@@ -1,12 +1,17 @@
+from collections import Counter
+from datetime import datetime
 from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, ReplaceOne, UpdateOne
 from app.infrastructure.mongodb.sequence import SequenceGenerator
 from app.domain.entities.notificacion import Notificacion
 from app.domain.entities.evento import Evento
 from app.domain.entities.requerimiento import Incidente, Solicitud
 from app.domain.entities.usuario import Supervisor, Usuario
-from app.domain.enums import TipoEvento, TipoRequerimiento, NivelUrgencia, TipoUsuario
-from app.domain.value_objects.email import Email
+from app.domain.enums import TipoEvento, TipoRequerimiento, NivelUrgencia, TipoUsuario, EstadoRequerimiento
+from app.infrastructure.mongodb.monitoreo import instrumentar
+from app.infrastructure.metricas import CACHE_CONSULTAS
+from app.infrastructure.cache import CacheLocal
 
 
 class UsuarioSnapshot(Usuario):
@@ -15,6 +20,8 @@ class UsuarioSnapshot(Usuario):
     desde snapshots de notificaciones donde no se requiere comportamiento real.
     """
 
+    __slots__ = ()
+
     def get_tipo_usuario(self) -> TipoUsuario:
         return TipoUsuario.SOLICITANTE
 
@@ -28,6 +35,9 @@ class EventoSnapshot(Evento):
     """
     Clase concreta para reconstruir eventos desde snapshots.
     """
+
+    __slots__ = ("_tipo",)
+
     def __init__(self, tipo: TipoEvento, responsable, fecha_hora, descripcion: str, requerimiento):
         self._tipo = tipo
         super().__init__(
@@ -39,17 +49,42 @@ class EventoSnapshot(Evento):
             fecha_hora=fecha_hora
         )
 
+    @classmethod
+    def reconstruir(cls, tipo: TipoEvento, responsable, fecha_hora, descripcion: str, requerimiento) -> "EventoSnapshot":
+        evento = super().reconstruir(
+            None, f"Evento: {tipo.value}", descripcion, responsable, requerimiento, fecha_hora
+        )
+        evento._tipo = tipo
+        return evento
+
     def get_tipo_evento(self) -> TipoEvento:
         return self._tipo
 
     def get_descripcion_detallada(self) -> str:
         return self.descripcion
 
+@instrumentar
 class NotificacionRepository:
-    def __init__(self, database: AsyncIOMotorDatabase, usuario_repository):
+    """
+    Repositorio de notificaciones.
+    Mantiene además un documento contador por supervisor (total / no leídas)
+    en 'notificaciones_contadores', actualizado atómicamente en cada escritura,
+    para que el badge de no leídas sea una búsqueda puntual por _id.
+    """
+
+    def __init__(
+            self,
+            database: AsyncIOMotorDatabase,
+            usuario_repository,
+            cache_contadores: Optional[CacheLocal] = None
+    ):
         self.collection = database["notificaciones"]
+        self.contadores = database["notificaciones_contadores"]
+        self.archivo = database["notificaciones_archivo"]
         self.user_repo = usuario_repository
         self.sequence = SequenceGenerator(database)
+        # (total, no_leidas) por supervisor_id; la invalidan _incrementar_contador y el bus
+        self.cache_contadores = cache_contadores
 
     async def guardar(self, notif: Notificacion) -> Notificacion:
         req = notif.evento.requerimiento
@@ -81,7 +116,27 @@ class NotificacionRepository:
             }
         }
 
-        await self.collection.replace_one({"_id": notif.id}, doc, upsert=True)
+        # Devuelve el documento previo para saber si es un alta o un cambio de estado
+        previo = await self.collection.find_one_and_replace(
+            {"_id": notif.id},
+            doc,
+            projection={"leida": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+
+        if previo is None:
+            await self._incrementar_contador(
+                notif.supervisor.id,
+                total=1,
+                no_leidas=0 if notif.leida else 1
+            )
+        elif previo["leida"] != notif.leida:
+            await self._incrementar_contador(
+                notif.supervisor.id,
+                no_leidas=-1 if notif.leida else 1
+            )
+
         return notif
 
     async def buscar_por_id(self, id: int) -> Optional[Notificacion]:
@@ -91,8 +146,19 @@ class NotificacionRepository:
         return await self._to_entity(doc)
 
     async def eliminar(self, id: int) -> bool:
-        result = await self.collection.delete_one({"_id": id})
-        return result.deleted_count > 0
+        doc = await self.collection.find_one_and_delete(
+            {"_id": id},
+            projection={"supervisor_id": 1, "leida": 1}
+        )
+        if doc is None:
+            return False
+
+        await self._incrementar_contador(
+            doc["supervisor_id"],
+            total=-1,
+            no_leidas=0 if doc["leida"] else -1
+        )
+        return True
 
     async def buscar_todos(self) -> List[Notificacion]:
         cursor = self.collection.find().limit(100)
@@ -115,65 +181,248 @@ class NotificacionRepository:
 
         return [await self._to_entity(doc) for doc in docs]
 
-    async def contar_por_supervisor(self, supervisor_id: int, leida: Optional[bool] = None) -> int:
+    async def listar_resumen(
+            self,
+            supervisor_id: int,
+            leida: Optional[bool] = None,
+            page: int = 0,
+            size: int = 20
+    ) -> List[dict]:
+        """
+        Camino rápido del listado: documentos mapeados directamente a la forma de
+        NotificacionResponse, sin reconstruir Notificacion/Evento/Requerimiento.
+        """
         query = {"supervisor_id": supervisor_id}
         if leida is not None:
             query["leida"] = leida
-        return await self.collection.count_documents(query)
+
+        cursor = self.collection.find(query).sort("fecha_creacion", -1).skip(page * size).limit(size)
+        return [self._to_resumen(doc) async for doc in cursor]
+
+    async def contar_por_supervisor(self, supervisor_id: int, leida: Optional[bool] = None) -> int:
+        total, no_leidas = await self.obtener_contadores(supervisor_id)
+        return self.total_filtrado(total, no_leidas, leida)
+
+    @staticmethod
+    def total_filtrado(total: int, no_leidas: int, leida: Optional[bool]) -> int:
+        """Total que corresponde al filtro 'leida' a partir de los contadores"""
+        if leida is None:
+            return total
+        return no_leidas if leida is False else total - no_leidas
+
+    async def obtener_contadores(self, supervisor_id: int) -> tuple[int, int]:
+        """
+        Retorna (total, no_leidas) del supervisor con una única búsqueda por _id.
+        Si el contador todavía no existe (datos previos a la reconciliación),
+        cae al conteo sobre el índice (supervisor_id, leida).
+        """
+        if self.cache_contadores is not None:
+            contadores = self.cache_contadores.obtener(supervisor_id)
+            if contadores is not None:
+                return contadores
+            version = self.cache_contadores.version(supervisor_id)
+
+        contador = await self.contadores.find_one({"_id": supervisor_id})
+        if contador is not None:
+            CACHE_CONSULTAS.labels("contadores_notificaciones", "hit").inc()
+            contadores = contador["total"], contador["no_leidas"]
+            if self.cache_contadores is not None:
+                self.cache_contadores.guardar(supervisor_id, contadores, version)
+            return contadores
+
+        CACHE_CONSULTAS.labels("contadores_notificaciones", "miss").inc()
+        total = await self.collection.count_documents({"supervisor_id": supervisor_id})
+        no_leidas = await self.collection.count_documents(
+            {"supervisor_id": supervisor_id, "leida": False}
+        )
+        return total, no_leidas
+
+    async def marcar_todas_leidas(self, supervisor_id: int) -> int:
+        """Marca como leídas todas las notificaciones pendientes del supervisor"""
+        result = await self.collection.update_many(
+            {"supervisor_id": supervisor_id, "leida": False},
+            {"$set": {"leida": True, "fecha_lectura": datetime.now()}}
+        )
+        if result.modified_count:
+            await self._incrementar_contador(supervisor_id, no_leidas=-result.modified_count)
+        return result.modified_count
+
+    async def reconciliar_contadores(self) -> int:
+        """
+        Recalcula los contadores de todos los supervisores a partir de la colección.
+        Corrige desvíos por escrituras concurrentes o borrados externos (TTL, scripts).
+
+        Returns:
+            int: Cantidad de contadores reescritos
+        """
+        pipeline = [
+            {
+                "$group": {
+                    "_id": "$supervisor_id",
+                    "total": {"$sum": 1},
+                    "no_leidas": {"$sum": {"$cond": ["$leida", 0, 1]}}
+                }
+            }
+        ]
+        supervisores = []
+        operaciones = []
+        async for doc in self.collection.aggregate(pipeline):
+            supervisores.append(doc["_id"])
+            operaciones.append(ReplaceOne(
+                {"_id": doc["_id"]},
+                {"total": doc["total"], "no_leidas": doc["no_leidas"]},
+                upsert=True
+            ))
+
+        if operaciones:
+            await self.contadores.bulk_write(operaciones, ordered=False)
+
+        # Supervisores que ya no tienen notificaciones
+        await self.contadores.delete_many({"_id": {"$nin": supervisores}})
+        if self.cache_contadores is not None:
+            self.cache_contadores.vaciar()
+        return len(operaciones)
+
+    async def archivar_leidas(self, antes_de: datetime, lote: int = 1000) -> int:
+        """
+        Mueve por lotes al archivo las notificaciones leídas antes de 'antes_de'.
+        Mantiene acotados la colección caliente y el índice (supervisor_id, leida).
+        La copia es idempotente (upsert por _id), por lo que un lote interrumpido
+        se completa sin duplicados en la siguiente ejecución.
+
+        Returns:
+            int: Cantidad de notificaciones archivadas
+        """
+        filtro = {"leida": True, "fecha_lectura": {"$lt": antes_de}}
+        archivadas = 0
+
+        while True:
+            docs = await self.collection.find(filtro).sort("fecha_lectura", 1).limit(lote).to_list(length=lote)
+            if not docs:
+                break
+
+            await self.archivo.bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+                ordered=False
+            )
+            await self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+
+            # Eran leídas: solo cambia el total de cada supervisor
+            por_supervisor = Counter(doc["supervisor_id"] for doc in docs)
+            await self.contadores.bulk_write(
+                [
+                    UpdateOne({"_id": supervisor_id}, {"$inc": {"total": -cantidad}})
+                    for supervisor_id, cantidad in por_supervisor.items()
+                ],
+                ordered=False
+            )
+
+            archivadas += len(docs)
+            if len(docs) < lote:
+                break
+
+        return archivadas
+
+    async def _incrementar_contador(self, supervisor_id: int, total: int = 0, no_leidas: int = 0) -> None:
+        """
+        Aplica el cambio al contador del supervisor. Se llama después de
+        escribir la notificación; si el contador no existe (notificaciones
+        previas a la primera reconciliación), se crea con el conteo de la
+        colección, que ya incluye esta escritura, en vez de partir de 0.
+        """
+        incremento = {"$inc": {"total": total, "no_leidas": no_leidas}}
+        result = await self.contadores.update_one({"_id": supervisor_id}, incremento)
+        if result.matched_count == 0:
+            total_actual = await self.collection.count_documents({"supervisor_id": supervisor_id})
+            no_leidas_actual = await self.collection.count_documents(
+                {"supervisor_id": supervisor_id, "leida": False}
+            )
+            sembrado = await self.contadores.update_one(
+                {"_id": supervisor_id},
+                {"$setOnInsert": {"total": total_actual, "no_leidas": no_leidas_actual}},
+                upsert=True
+            )
+            if sembrado.upserted_id is None:
+                # Otro request lo creó en el medio: se aplica el cambio sobre el suyo
+                await self.contadores.update_one({"_id": supervisor_id}, incremento)
+        if self.cache_contadores is not None:
+            self.cache_contadores.invalidar(supervisor_id)
+
+    @staticmethod
+    def _to_resumen(doc: dict) -> dict:
+        evento = doc["evento"]
+        req_data = evento["requerimiento"]
+        return {
+            "id": doc["_id"],
+            "leida": doc["leida"],
+            "fechaHoraGenerada": doc["fecha_creacion"],
+            "fechaLectura": doc.get("fecha_lectura"),
+            "evento": {
+                "tipo": evento["tipo"],
+                "descripcion": evento["descripcion"],
+                "requerimiento": {
+                    "id": req_data["id"],
+                    "titulo": req_data["titulo"],
+                    "urgencia": req_data.get("nivel_urgencia")
+                },
+                "responsable": {"id": evento["responsable"]["id"], "nombre": evento["responsable"]["nombre"]}
+            }
+        }
 
     async def _to_entity(self, doc: dict) -> Notificacion:
-        supervisor = Supervisor(
+        """
+        Rehidrata la notificación desde su snapshot sin revalidar (ya se validó
+        al guardarse). Supervisor, requerimiento y responsable son parciales:
+        solo tienen lo que guarda el snapshot.
+        """
+        supervisor = Supervisor.reconstruir(
             id=doc["supervisor_id"],
             nombre="Supervisor",
-            email=Email("proxy@system.local"),
+            email=None,
             password_hash=""
         )
 
-        req_data = doc["evento"]["requerimiento"]
-        tipo_req = TipoRequerimiento(req_data["tipo"])
-
-        desc_placeholder = "Descripción no disponible en vista de notificación."
+        evento_data = doc["evento"]
+        req_data = evento_data["requerimiento"]
+        comunes = {
+            "id": req_data["id"],
+            "titulo": req_data["titulo"],
+            "descripcion": "Descripción no disponible en vista de notificación.",
+            "solicitante": None,
+            "estado": EstadoRequerimiento.NUEVO,
+            "tecnico_asignado": None,
+            "fecha_creacion": doc["fecha_creacion"],
+            "fecha_resolucion": None,
+            "categoria": None
+        }
 
-        if tipo_req == TipoRequerimiento.INCIDENTE:
+        if TipoRequerimiento(req_data["tipo"]) == TipoRequerimiento.INCIDENTE:
             urgencia = NivelUrgencia(req_data["nivel_urgencia"]) if req_data.get("nivel_urgencia") else None
-            requerimiento = Incidente(
-                id=req_data["id"],
-                titulo=req_data["titulo"],
-                descripcion=desc_placeholder,
-                solicitante=None,
-                categoria=None,
-                nivel_urgencia=urgencia
-            )
+            requerimiento = Incidente.reconstruir(**comunes, nivel_urgencia=urgencia)
         else:
-            requerimiento = Solicitud(
-                id=req_data["id"],
-                titulo=req_data["titulo"],
-                descripcion=desc_placeholder,
-                solicitante=None,
-                categoria=None
-            )
+            requerimiento = Solicitud.reconstruir(**comunes)
 
-        resp_data = doc["evento"]["responsable"]
-        responsable = UsuarioSnapshot(
+        resp_data = evento_data["responsable"]
+        responsable = UsuarioSnapshot.reconstruir(
             id=resp_data["id"],
             nombre=resp_data["nombre"],
-            email=Email("snapshot@system.local"),
+            email=None,
             password_hash=""
         )
 
-        evento = EventoSnapshot(
-            tipo=TipoEvento(doc["evento"]["tipo"]),
-            descripcion=doc["evento"]["descripcion"],
+        evento = EventoSnapshot.reconstruir(
+            tipo=TipoEvento(evento_data["tipo"]),
+            descripcion=evento_data["descripcion"],
             requerimiento=requerimiento,
             responsable=responsable,
-            fecha_hora=doc["evento"]["fecha_hora"]
+            fecha_hora=evento_data["fecha_hora"]
         )
 
-        return Notificacion(
+        return Notificacion.reconstruir(
             id=doc["_id"],
             evento=evento,
             supervisor=supervisor,
             fecha_hora_generada=doc["fecha_creacion"],
             leida=doc["leida"],
             fecha_lectura=doc.get("fecha_lectura")
-        )
\ No newline at end of file
+        )
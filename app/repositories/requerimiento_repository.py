@@ -1,40 +1,539 @@
-from typing import List, Optional, Dict, Any
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from app.domain.entities.requerimiento import Requerimiento, Incidente, Solicitud
-from app.domain.enums import TipoRequerimiento, EstadoRequerimiento, NivelUrgencia, CategoriaIncidente, CategoriaSolicitud
+from app.domain.entities.usuario import Usuario, Tecnico
+from app.domain.entities.comentario import Comentario
+from app.domain.entities.evento import (
+    Evento, EventoCreacion, EventoAsignacion, EventoDerivacion, EventoResolucion, EventoReapertura,
+    EventoComentario
+)
+from app.domain.exceptions import ConflictoVersionException, RequerimientoArchivadoException
+from app.domain.enums import (
+    TipoRequerimiento, EstadoRequerimiento, NivelUrgencia, CategoriaIncidente, CategoriaSolicitud, TipoServicio,
+    TipoUsuario, TipoEvento
+)
 from app.infrastructure.mongodb.sequence import SequenceGenerator
+from app.infrastructure.mongodb.monitoreo import instrumentar
+from app.infrastructure.mongodb.lecturas import get_primaria, get_analitica, sesion
+from app.repositories.coleccion_perezosa import ColeccionPerezosa
+from app.repositories.notificacion_repository import UsuarioSnapshot
 
 
+# Campos que necesita el listado (sin comentarios ni eventos, que son lo más pesado)
+_PROYECCION_RESUMEN = {
+    "tipo": 1, "titulo": 1, "categoria": 1, "nivel_urgencia": 1, "estado": 1,
+    "solicitante_id": 1, "tecnico_asignado_id": 1, "fecha_creacion": 1
+}
+
+# La historia se lee aparte y bajo demanda (ver coleccion_perezosa.py)
+_PROYECCION_SIN_HISTORIA = {"comentarios": 0, "eventos": 0}
+# Listados: sin comentarios y solo el último evento (actividad, derivaciones)
+_PROYECCION_LISTADO = {"comentarios": 0, "eventos": {"$slice": -1}}
+_CAMPOS_HISTORIA = ("comentarios", "eventos")
+
+_CLASES_EVENTO = {
+    TipoEvento.CREACION: EventoCreacion,
+    TipoEvento.ASIGNACION: EventoAsignacion,
+    TipoEvento.DERIVACION: EventoDerivacion,
+    TipoEvento.RESOLUCION: EventoResolucion,
+    TipoEvento.REAPERTURA: EventoReapertura,
+    TipoEvento.COMENTARIO: EventoComentario,
+}
+
+# Columnas de la exportación: todo lo plano del documento (sin comentarios ni
+# eventos); los nombres de solicitante y técnico ya vienen denormalizados
+CAMPOS_EXPORTACION = (
+    "_id", "tipo", "titulo", "descripcion", "categoria", "nivel_urgencia", "estado",
+    "tipo_servicio", "solicitante_id", "solicitante_nombre", "tecnico_asignado_id",
+    "tecnico_asignado_nombre", "fecha_creacion", "fecha_resolucion", "es_masivo",
+    "incidente_padre_id", "posible_duplicado_de"
+)
+
+
+def _valores(estados) -> List[str]:
+    return sorted(e.value for e in estados)
+
+
+@instrumentar
 class RequerimientoRepository:
     def __init__(self, database: AsyncIOMotorDatabase, usuario_repository):
-        self.collection = database["requerimientos"]
+        self.collection = get_primaria(database, "requerimientos")
+        # Reportes, dashboards y búsquedas: a un secundario si hay (ver lecturas.py)
+        self.analitica = get_analitica(database, "requerimientos")
+        self.archivo = database["requerimientos_archivo"]
+        self.archivo_analitica = get_analitica(database, "requerimientos_archivo")
         self.sequence = SequenceGenerator(database)
         self.usuario_repo = usuario_repository
 
     async def guardar(self, requerimiento: Requerimiento) -> Requerimiento:
+        """
+        Alta o actualización con control de concurrencia optimista: la
+        escritura solo se aplica si el documento sigue en la versión que se
+        leyó, y cada una la incrementa. Los campos planos se reescriben; de
+        comentarios y eventos leídos del repositorio se agregan con $push
+        solo los nuevos, sin necesidad de haber cargado la historia.
+
+        Raises:
+            ConflictoVersionException: Otro request lo modificó en el medio
+                (el llamador relee y reintenta, ver services/concurrencia.py)
+            RequerimientoArchivadoException: Se leyó del archivo (buscar_por_id
+                cae ahí), que no se modifica: reintentar no serviría
+        """
         if requerimiento.id is None:
             requerimiento.id = await self.sequence.get_next("requerimiento_id")
+            doc = self._to_document_con_historia(requerimiento)
+            doc["version"] = 1
+            await self.collection.insert_one(doc, session=sesion())
+            requerimiento.version = 1
+            return requerimiento
+
+        cambios = self._to_document(requerimiento)
+        del cambios["_id"]
+        cambios["version"] = requerimiento.version + 1
+        actualizacion = {"$set": cambios}
+        if "masivo_clave" not in cambios:
+            actualizacion["$unset"] = {"masivo_clave": ""}
+
+        # La historia no se reescribe: solo se agrega lo nuevo
+        for campo, a_documento in (
+                ("comentarios", self._comentario_a_documento),
+                ("eventos", self._evento_a_documento)
+        ):
+            coleccion = getattr(requerimiento, campo)
+            if isinstance(coleccion, ColeccionPerezosa):
+                if coleccion.nuevos:
+                    actualizacion.setdefault("$push", {})[campo] = {
+                        "$each": [a_documento(x) for x in coleccion.nuevos]
+                    }
+            else:
+                cambios[campo] = [a_documento(x) for x in coleccion]
+
+        resultado = await self.collection.update_one(
+            # Los documentos previos al versionado no tienen el campo (None lo matchea)
+            {"_id": requerimiento.id, "version": requerimiento.version or None},
+            actualizacion,
+            session=sesion()
+        )
+        if resultado.matched_count == 0:
+            if await self.collection.count_documents({"_id": requerimiento.id}, limit=1) == 0:
+                raise RequerimientoArchivadoException(
+                    f"El requerimiento {requerimiento.id} está archivado: reabrirlo para modificarlo"
+                )
+            raise ConflictoVersionException(
+                f"El requerimiento {requerimiento.id} cambió desde la versión {requerimiento.version}"
+            )
 
-        doc = self._to_document(requerimiento)
-        await self.collection.replace_one({"_id": requerimiento.id}, doc, upsert=True)
+        for campo in _CAMPOS_HISTORIA:
+            coleccion = getattr(requerimiento, campo)
+            if isinstance(coleccion, ColeccionPerezosa):
+                coleccion.confirmar()
+        requerimiento.version = cambios["version"]
         return requerimiento
 
-    async def buscar_por_id(self, id: int) -> Optional[Requerimiento]:
-        doc = await self.collection.find_one({"_id": id})
+    async def buscar_por_id(self, id: int, con_historia: bool = False) -> Optional[Requerimiento]:
+        """
+        Por defecto sin comentarios ni eventos: se traen al pedirlos
+        (cargar_historia, o cargar()/ultimos(n) sobre cada colección).
+        Con 'con_historia' vienen en la misma lectura.
+        """
+        proyeccion = None if con_historia else _PROYECCION_SIN_HISTORIA
+        doc = await self.collection.find_one({"_id": id}, proyeccion)
+        if doc is None:
+            # Los resueltos antiguos viven en el archivo
+            doc = await self.archivo.find_one({"_id": id}, proyeccion)
         return await self._to_entity(doc) if doc else None
 
+    async def cargar_historia(self, requerimiento: Requerimiento) -> Requerimiento:
+        """Deja comentarios y eventos en memoria para recorrerlos sin await"""
+        for campo in _CAMPOS_HISTORIA:
+            coleccion = getattr(requerimiento, campo)
+            if isinstance(coleccion, ColeccionPerezosa):
+                await coleccion.cargar()
+        return requerimiento
+
     async def siguiente_id_comentario(self) -> int:
         """Genera el siguiente ID único para un comentario"""
         return await self.sequence.get_next("comentario_id")
 
     async def buscar_con_filtros(self, filtros: dict, page: int, size: int) -> tuple[List[Requerimiento], int]:
-        """Método genérico para listar con paginación"""
-        cursor = self.collection.find(filtros).sort("fecha_creacion", -1).skip(page * size).limit(size)
+        """Método genérico para listar con paginación (con el último evento, sin comentarios)"""
+        cursor = self.collection.find(filtros, _PROYECCION_LISTADO).sort("fecha_creacion", -1).skip(page * size).limit(size)
         total = await self.collection.count_documents(filtros)
         docs = await cursor.to_list(length=size)
-        entidades = [await self._to_entity(doc) for doc in docs]
+        entidades = [await self._to_entity(doc, eventos_completos=False) for doc in docs]
         return entidades, total
 
+    @staticmethod
+    def filtro_visibilidad(
+            usuario: Usuario,
+            estado: Optional[EstadoRequerimiento] = None,
+            tipo: Optional[TipoRequerimiento] = None
+    ) -> dict:
+        """
+        Traduce los permisos de lectura del usuario a un filtro de MongoDB:
+        solicitantes ven los propios, técnicos los asignados y el resto todos.
+        Solo usa id y rol, así que también acepta el Principal de app/dependencies/auth.py.
+        """
+        filtros = {}
+        rol = usuario.get_tipo_usuario()
+        if rol == TipoUsuario.SOLICITANTE:
+            filtros["solicitante_id"] = usuario.id
+        elif rol == TipoUsuario.TECNICO:
+            filtros["tecnico_asignado_id"] = usuario.id
+
+        if estado is not None:
+            filtros["estado"] = estado.value
+        if tipo is not None:
+            filtros["tipo"] = tipo.value
+        return filtros
+
+    async def listar_resumen(self, filtros: dict, page: int, size: int) -> tuple[List[dict], int]:
+        """
+        Camino rápido del listado: devuelve diccionarios con la forma de
+        RequerimientoListaResponse sin reconstruir entidades. Solicitantes y
+        técnicos se resuelven con una única consulta $in a usuarios.
+        """
+        cursor = (
+            self.collection.find(filtros, _PROYECCION_RESUMEN)
+            .sort("fecha_creacion", -1).skip(page * size).limit(size)
+        )
+        docs, total = await asyncio.gather(
+            cursor.to_list(length=size),
+            self.collection.count_documents(filtros)
+        )
+
+        ids = [doc["solicitante_id"] for doc in docs]
+        ids += [doc["tecnico_asignado_id"] for doc in docs if doc.get("tecnico_asignado_id")]
+        usuarios = await self.usuario_repo.buscar_resumenes(ids)
+
+        ahora = datetime.now()
+        return [self._to_resumen(doc, usuarios, ahora) for doc in docs], total
+
+    async def buscar_texto(
+            self,
+            q: str,
+            filtros: dict,
+            size: int,
+            despues_de: Optional[Tuple[float, int]] = None,
+            patron_comentarios: Optional[str] = None
+    ) -> tuple[List[dict], bool]:
+        """
+        Búsqueda por el índice de texto (busqueda_texto), ordenada por relevancia
+        y luego por _id para que el cursor (score, id) sea estable.
+        Devuelve documentos proyectados (sin eventos) y si quedan más resultados.
+        """
+        pipeline = [
+            {"$match": {"$text": {"$search": q}, **filtros}},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+        ]
+        if despues_de is not None:
+            score, id = despues_de
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": score}},
+                {"score": score, "_id": {"$gt": id}}
+            ]}})
+
+        # Solo los comentarios que contienen algún término, para armar fragmentos
+        comentarios = {"$slice": [{"$filter": {
+            "input": {"$ifNull": ["$comentarios", []]},
+            "as": "c",
+            "cond": {"$regexMatch": {"input": "$$c.texto", "regex": patron_comentarios, "options": "i"}}
+        }}, 3]} if patron_comentarios else []
+
+        pipeline += [
+            {"$sort": {"score": -1, "_id": 1}},
+            {"$limit": size + 1},
+            {"$project": {
+                "tipo": 1, "titulo": 1, "descripcion": 1, "estado": 1, "fecha_creacion": 1, "score": 1,
+                "comentarios": {"$map": {"input": comentarios, "as": "c", "in": "$$c.texto"}}
+            }}
+        ]
+
+        docs = await self.analitica.aggregate(pipeline, session=sesion()).to_list(length=size + 1)
+        return docs[:size], len(docs) > size
+
+    def iterar_incidentes_abiertos(self):
+        """
+        Cursor con lo necesario para el índice de duplicados:
+        _id, solicitante_id, tipo_servicio, titulo y descripcion.
+        """
+        return self.collection.find(
+            {
+                "tipo": TipoRequerimiento.INCIDENTE.value,
+                "estado": {"$ne": EstadoRequerimiento.RESUELTO.value}
+            },
+            {"solicitante_id": 1, "tipo_servicio": 1, "titulo": 1, "descripcion": 1}
+        )
+
+    # --- TRANSICIONES DE ESTADO ATÓMICAS ---
+
+    async def transicionar(
+            self,
+            id: int,
+            guardas: dict,
+            cambios: dict,
+            eventos: List[Evento],
+            comentarios: List[Comentario] = (),
+            quitar: Tuple[str, ...] = ()
+    ) -> Optional[Requerimiento]:
+        """
+        Aplica una transición en un único findOneAndUpdate: las guardas del
+        dominio viajan como predicados del filtro y el evento se agrega con
+        $push, sin leer ni reescribir el documento entero. Dos operadores
+        concurrentes no se pisan: el segundo no encuentra el documento.
+
+        Returns:
+            El requerimiento actualizado (sin la historia, que se trae bajo
+            demanda), o None si no existe o ya no cumple las guardas (el
+            llamador decide qué error corresponde).
+        """
+        actualizacion = {
+            "$set": cambios,
+            "$push": {"eventos": {"$each": [self._evento_a_documento(e) for e in eventos]}},
+            "$inc": {"version": 1}
+        }
+        if comentarios:
+            actualizacion["$push"]["comentarios"] = {
+                "$each": [self._comentario_a_documento(c) for c in comentarios]
+            }
+        if quitar:
+            actualizacion["$unset"] = dict.fromkeys(quitar, "")
+
+        doc = await self.collection.find_one_and_update(
+            {"_id": id, **guardas},
+            actualizacion,
+            projection=_PROYECCION_SIN_HISTORIA,
+            return_document=ReturnDocument.AFTER,
+            session=sesion()
+        )
+        return await self._to_entity(doc) if doc else None
+
+    async def asignar(
+            self,
+            id: int,
+            tecnico: Tecnico,
+            evento: Evento,
+            comentarios: List[Comentario] = ()
+    ) -> Optional[Requerimiento]:
+        """Asignación condicional (ver Requerimiento.asignar_tecnico)"""
+        return await self.transicionar(
+            id,
+            {"estado": {"$in": _valores(Requerimiento.ESTADOS_ASIGNABLES)}},
+            {
+                "estado": EstadoRequerimiento.ASIGNADO.value,
+                "tecnico_asignado_id": tecnico.id,
+                "tecnico_asignado_nombre": tecnico.nombre
+            },
+            [evento],
+            comentarios
+        )
+
+    async def resolver(
+            self,
+            id: int,
+            tecnico: Tecnico,
+            fecha_resolucion: datetime,
+            eventos: List[Evento],
+            comentarios: List[Comentario] = ()
+    ) -> Optional[Requerimiento]:
+        """Resolución condicional (ver Requerimiento.resolver)"""
+        return await self.transicionar(
+            id,
+            {
+                "estado": {"$in": _valores(Requerimiento.ESTADOS_RESOLUBLES)},
+                "tecnico_asignado_id": tecnico.id
+            },
+            {"estado": EstadoRequerimiento.RESUELTO.value, "fecha_resolucion": fecha_resolucion},
+            eventos,
+            comentarios,
+            # Un masivo resuelto libera su clave para que la próxima tormenta abra otro
+            quitar=("masivo_clave",)
+        )
+
+    async def reabrir(self, id: int, evento: Evento) -> Optional[Requerimiento]:
+        """Reapertura condicional (ver Requerimiento.reabrir)"""
+        return await self.transicionar(
+            id,
+            {"estado": {"$in": _valores(Requerimiento.ESTADOS_REABRIBLES)}},
+            {"estado": EstadoRequerimiento.REABIERTO.value, "fecha_resolucion": None},
+            [evento]
+        )
+
+    # --- EXPORTACIÓN ---
+
+    async def iterar_exportacion(
+            self,
+            desde: Optional[datetime] = None,
+            hasta: Optional[datetime] = None,
+            batch_size: int = 1000
+    ):
+        """
+        Recorre con un cursor (activos y luego archivo) los requerimientos
+        creados en [desde, hasta), proyectando solo CAMPOS_EXPORTACION.
+        Nunca materializa la lista: la memoria no depende de la cantidad.
+        """
+        filtro = {}
+        if desde is not None or hasta is not None:
+            filtro["fecha_creacion"] = {}
+            if desde is not None:
+                filtro["fecha_creacion"]["$gte"] = desde
+            if hasta is not None:
+                filtro["fecha_creacion"]["$lt"] = hasta
+        proyeccion = dict.fromkeys(CAMPOS_EXPORTACION, 1)
+
+        for coleccion in (self.analitica, self.archivo_analitica):
+            cursor = coleccion.find(filtro, proyeccion, session=sesion()).sort("_id", 1).batch_size(batch_size)
+            async for doc in cursor:
+                yield doc
+
+    # --- INCIDENTES MASIVOS ---
+
+    async def buscar_masivo_abierto(self, masivo_clave: str) -> Optional[int]:
+        """ID del incidente masivo abierto para la clave 'tipo_servicio:categoria'"""
+        doc = await self.collection.find_one({"masivo_clave": masivo_clave}, {"_id": 1})
+        return doc["_id"] if doc else None
+
+    async def crear_masivo(self, padre: Incidente) -> int:
+        """
+        Guarda un incidente masivo nuevo. Si otro proceso ya abrió uno para la
+        misma clave (índice único sobre masivo_clave) devuelve el existente.
+        """
+        try:
+            await self.guardar(padre)
+            return padre.id
+        except DuplicateKeyError:
+            return await self.buscar_masivo_abierto(
+                f"{padre.tipo_servicio.value}:{padre.categoria.value}"
+            )
+
+    async def adjuntar_a_masivo(
+            self,
+            padre_id: int,
+            tipo_servicio: str,
+            categoria: str,
+            desde: datetime
+    ) -> int:
+        """Cuelga del padre, en una sola escritura, los incidentes sueltos de la clave creados desde 'desde'"""
+        resultado = await self.collection.update_many(
+            {
+                "_id": {"$ne": padre_id},
+                "tipo": TipoRequerimiento.INCIDENTE.value,
+                "tipo_servicio": tipo_servicio,
+                "categoria": categoria,
+                "estado": EstadoRequerimiento.NUEVO.value,
+                "fecha_creacion": {"$gte": desde},
+                "incidente_padre_id": None,
+                "es_masivo": {"$ne": True}
+            },
+            {"$set": {"incidente_padre_id": padre_id}, "$inc": {"version": 1}}
+        )
+        return resultado.modified_count
+
+    async def asignar_hijos(self, padre_id: int, tecnico: Tecnico, tecnico_anterior_id: Optional[int] = None) -> int:
+        """
+        Propaga en bloque la asignación del padre a sus hijos aún sin técnico
+        y, en una reasignación, a los que seguían al técnico anterior del padre.
+        Los que tomó otro técnico por su cuenta no se tocan.
+        """
+        resultado = await self.collection.update_many(
+            {
+                "incidente_padre_id": padre_id,
+                "estado": {"$in": [EstadoRequerimiento.NUEVO.value, EstadoRequerimiento.ASIGNADO.value]},
+                "tecnico_asignado_id": {"$in": [None, tecnico_anterior_id]}
+            },
+            {"$set": {
+                "tecnico_asignado_id": tecnico.id,
+                "tecnico_asignado_nombre": tecnico.nombre,
+                "estado": EstadoRequerimiento.ASIGNADO.value
+            }, "$inc": {"version": 1}}
+        )
+        return resultado.modified_count
+
+    async def resolver_hijos(self, padre_id: int, fecha_resolucion: datetime) -> List[int]:
+        """
+        Cierra en bloque los hijos abiertos de un incidente masivo resuelto.
+
+        Returns:
+            List[int]: IDs de los hijos cerrados (los que quedaron con esta
+            fecha_resolucion, que es la del padre)
+        """
+        await self.collection.update_many(
+            {
+                "incidente_padre_id": padre_id,
+                "estado": {"$ne": EstadoRequerimiento.RESUELTO.value}
+            },
+            {"$set": {
+                "estado": EstadoRequerimiento.RESUELTO.value,
+                "fecha_resolucion": fecha_resolucion
+            }, "$inc": {"version": 1}}
+        )
+        return await self.collection.distinct("_id", {
+            "incidente_padre_id": padre_id,
+            "estado": EstadoRequerimiento.RESUELTO.value,
+            "fecha_resolucion": fecha_resolucion
+        })
+
+    # --- ARCHIVO DE RESUELTOS ---
+
+    async def archivar_resueltos(self, antes_de: datetime, lote: int = 500) -> int:
+        """
+        Mueve por lotes al archivo los requerimientos resueltos antes de 'antes_de'.
+        Así la colección activa y sus índices contienen solo el conjunto de trabajo.
+
+        Returns:
+            int: Cantidad de requerimientos archivados
+        """
+        filtro = {
+            "estado": EstadoRequerimiento.RESUELTO.value,
+            "fecha_resolucion": {"$lt": antes_de}
+        }
+        archivados = 0
+
+        while True:
+            docs = await self.collection.find(filtro).limit(lote).to_list(length=lote)
+            if not docs:
+                break
+
+            ids = [doc["_id"] for doc in docs]
+            await self.archivo.bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+                ordered=False
+            )
+            resultado = await self.collection.delete_many(
+                {"_id": {"$in": ids}, "estado": EstadoRequerimiento.RESUELTO.value}
+            )
+
+            # Si alguno se reabrió mientras tanto sigue activo: se descarta su copia archivada
+            if resultado.deleted_count < len(ids):
+                reabiertos = await self.collection.distinct("_id", {"_id": {"$in": ids}})
+                await self.archivo.delete_many({"_id": {"$in": reabiertos}})
+
+            archivados += resultado.deleted_count
+            if len(docs) < lote:
+                break
+
+        return archivados
+
+    async def restaurar_desde_archivo(self, id: int) -> bool:
+        """
+        Devuelve un requerimiento archivado a la colección activa (ej. al reabrirlo).
+        Se copia antes de borrar del archivo para no perderlo ante una falla intermedia.
+
+        Returns:
+            bool: True si estaba archivado y fue restaurado
+        """
+        doc = await self.archivo.find_one({"_id": id})
+        if doc is None:
+            return False
+
+        await self.collection.replace_one({"_id": id}, doc, upsert=True)
+        await self.archivo.delete_one({"_id": id})
+        return True
+
     # --- AGREGACIONES PARA REPORTES (Dashboard) ---
 
     async def obtener_metricas_globales(self) -> Dict[str, Any]:
@@ -51,12 +550,12 @@ class RequerimientoRepository:
                 }
             }
         ]
-        resultado = await self.collection.aggregate(pipeline).to_list(1)
+        resultado = await self.analitica.aggregate(pipeline, session=sesion()).to_list(1)
         return resultado[0] if resultado else {}
 
     async def obtener_distribucion_estado(self) -> Dict[str, int]:
         pipeline = [{"$group": {"_id": "$estado", "count": {"$sum": 1}}}]
-        cursor = self.collection.aggregate(pipeline)
+        cursor = self.analitica.aggregate(pipeline, session=sesion())
         return {doc["_id"]: doc["count"] for doc in await cursor.to_list(None)}
 
     async def obtener_distribucion_urgencia(self) -> Dict[str, int]:
@@ -64,7 +563,7 @@ class RequerimientoRepository:
             {"$match": {"tipo": "INCIDENTE"}},
             {"$group": {"_id": "$nivel_urgencia", "count": {"$sum": 1}}}
         ]
-        cursor = self.collection.aggregate(pipeline)
+        cursor = self.analitica.aggregate(pipeline, session=sesion())
         return {doc["_id"]: doc["count"] for doc in await cursor.to_list(None)}
 
     async def obtener_incidentes_criticos_pendientes(self) -> List[dict]:
@@ -74,14 +573,14 @@ class RequerimientoRepository:
             "nivel_urgencia": "CRITICO",
             "estado": {"$ne": "RESUELTO"}
         }
-        cursor = self.collection.find(query, {
+        cursor = self.analitica.find(query, {
             "_id": 1, "titulo": 1, "tecnico_asignado_nombre": 1,
             "fecha_creacion": 1, "fecha_resolucion": 1
-        }).sort("fecha_creacion", 1)
+        }, session=sesion()).sort("fecha_creacion", 1)
         return await cursor.to_list(length=50)
 
     def _to_document(self, req: Requerimiento) -> dict:
-        """Convierte entidad a documento MongoDB"""
+        """Convierte entidad a documento MongoDB (campos planos, sin la historia)"""
         doc = {
             "_id": req.id,
             "tipo": req.get_tipo().value,
@@ -94,41 +593,88 @@ class RequerimientoRepository:
             "tecnico_asignado_nombre": req.tecnico_asignado.nombre if req.tecnico_asignado else None,
             "fecha_creacion": req.fecha_creacion,
             "fecha_resolucion": req.fecha_resolucion,
-            "comentarios": [
-                {
-                    "id": c.id,
-                    "texto": c.texto,
-                    "autor_id": c.autor.id,
-                    "autor_nombre": c.autor.nombre,
-                    "fecha_hora": c.fecha_hora
-                }
-                for c in req.comentarios
-            ],
-            "eventos": [
-                {
-                    "id": e.id,
-                    "tipo": e.get_tipo_evento().value,
-                    "titulo": e.titulo,
-                    "descripcion": e.descripcion,
-                    "responsable_id": e.responsable.id,
-                    "responsable_nombre": e.responsable.nombre,
-                    "fecha_hora": e.fecha_hora
-                }
-                for e in req.eventos
-            ]
+            "posible_duplicado_de": req.posible_duplicado_de
         }
 
         # Campos específicos por tipo
         if isinstance(req, Incidente):
             doc["nivel_urgencia"] = req.nivel_urgencia.value
             doc["categoria"] = req.categoria.value
+            doc["tipo_servicio"] = req.tipo_servicio.value if req.tipo_servicio else None
+            doc["es_masivo"] = req.es_masivo
+            doc["incidente_padre_id"] = req.incidente_padre_id
+            if req.es_masivo and req.tipo_servicio and req.estado != EstadoRequerimiento.RESUELTO:
+                # Solo mientras está abierto: el índice único disperso impide dos padres por clave
+                doc["masivo_clave"] = f"{req.tipo_servicio.value}:{req.categoria.value}"
         else:  # Solicitud
             doc["categoria"] = req.categoria.value
 
         return doc
 
-    async def _to_entity(self, doc: dict) -> Requerimiento:
-        """Convierte documento MongoDB a entidad"""
+    def _to_document_con_historia(self, req: Requerimiento) -> dict:
+        """Documento de alta: campos planos más comentarios y eventos"""
+        doc = self._to_document(req)
+        doc["comentarios"] = [self._comentario_a_documento(c) for c in req.comentarios]
+        doc["eventos"] = [self._evento_a_documento(e) for e in req.eventos]
+        return doc
+
+    @staticmethod
+    def _comentario_a_documento(c) -> dict:
+        return {
+            "id": c.id,
+            "texto": c.texto,
+            "autor_id": c.autor.id,
+            "autor_nombre": c.autor.nombre,
+            "fecha_hora": c.fecha_hora
+        }
+
+    @staticmethod
+    def _evento_a_documento(e) -> dict:
+        doc = {
+            "id": e.id,
+            "tipo": e.get_tipo_evento().value,
+            "titulo": e.titulo,
+            "descripcion": e.descripcion,
+            "responsable_id": e.responsable.id,
+            "responsable_nombre": e.responsable.nombre,
+            "fecha_hora": e.fecha_hora
+        }
+        if isinstance(e, EventoDerivacion):
+            # La interconsulta (dashboard del técnico) muestra origen y motivo
+            doc["tecnico_origen_id"] = e.tecnico_origen.id
+            doc["tecnico_origen_nombre"] = e.tecnico_origen.nombre
+            doc["tecnico_destino_id"] = e.tecnico_destino.id
+            doc["tecnico_destino_nombre"] = e.tecnico_destino.nombre
+            doc["motivo"] = e.motivo
+        return doc
+
+    @staticmethod
+    def _to_resumen(doc: dict, usuarios: Dict[int, dict], ahora: datetime) -> dict:
+        """Documento -> fila de listado (misma prioridad que calcular_prioridad)"""
+        dias = (ahora - doc["fecha_creacion"]).days
+        nivel_urgencia = doc.get("nivel_urgencia")
+        prioridad = dias + (NivelUrgencia(nivel_urgencia).get_peso() if nivel_urgencia else 0)
+        tecnico_id = doc.get("tecnico_asignado_id")
+
+        return {
+            "id": doc["_id"],
+            "tipo": doc["tipo"],
+            "titulo": doc["titulo"],
+            "categoria": doc["categoria"],
+            "nivelUrgencia": nivel_urgencia,
+            "estado": doc["estado"],
+            "prioridad": prioridad,
+            "solicitante": usuarios.get(doc["solicitante_id"]),
+            "tecnico_asignado": usuarios.get(tecnico_id) if tecnico_id else None,
+            "fecha_creacion": doc["fecha_creacion"],
+            "dias_desde_creacion": dias
+        }
+
+    async def _to_entity(self, doc: dict, eventos_completos: bool = True) -> Requerimiento:
+        """
+        Convierte documento MongoDB a entidad (sin revalidar: ya se validó al guardarse).
+        'eventos_completos' es False si la lectura trajo solo los últimos ($slice).
+        """
         # Cargar relaciones
         solicitante = await self.usuario_repo.buscar_por_id(doc["solicitante_id"])
         tecnico = None
@@ -140,7 +686,7 @@ class RequerimientoRepository:
 
         # Crear requerimiento según tipo
         if tipo == TipoRequerimiento.INCIDENTE:
-            req = Incidente(
+            req = Incidente.reconstruir(
                 id=doc["_id"],
                 titulo=doc["titulo"],
                 descripcion=doc["descripcion"],
@@ -150,10 +696,13 @@ class RequerimientoRepository:
                 estado=estado,
                 tecnico_asignado=tecnico,
                 fecha_creacion=doc["fecha_creacion"],
-                fecha_resolucion=doc.get("fecha_resolucion")
+                fecha_resolucion=doc.get("fecha_resolucion"),
+                tipo_servicio=TipoServicio(doc["tipo_servicio"]) if doc.get("tipo_servicio") else None,
+                es_masivo=doc.get("es_masivo", False),
+                incidente_padre_id=doc.get("incidente_padre_id")
             )
         else:
-            req = Solicitud(
+            req = Solicitud.reconstruir(
                 id=doc["_id"],
                 titulo=doc["titulo"],
                 descripcion=doc["descripcion"],
@@ -165,7 +714,69 @@ class RequerimientoRepository:
                 fecha_resolucion=doc.get("fecha_resolucion")
             )
 
-        # Comentarios y eventos se cargan bajo demanda o se ignoran
-        # (ya están en el documento si se necesitan para display)
+        req.posible_duplicado_de = doc.get("posible_duplicado_de")
+        req.version = doc.get("version", 0)
+
+        # Comentarios y eventos: los que vinieron en el documento, o bajo demanda
+        req.comentarios = ColeccionPerezosa(
+            lambda crudos: self._construir_comentarios(req, crudos),
+            lambda n: self._cargar_historia(req.id, "comentarios", n),
+            doc.get("comentarios")
+        )
+        req.eventos = ColeccionPerezosa(
+            lambda crudos: self._construir_eventos(req, crudos),
+            lambda n: self._cargar_historia(req.id, "eventos", n),
+            doc.get("eventos"),
+            eventos_completos
+        )
+        return req
+
+    async def _cargar_historia(self, id: int, campo: str, n: Optional[int]) -> List[dict]:
+        """Los últimos n subdocumentos de 'campo' ($slice), o todos con n=None"""
+        proyeccion = {"_id": 1, campo: 1 if n is None else {"$slice": -n}}
+        doc = await self.collection.find_one({"_id": id}, proyeccion, session=sesion())
+        if doc is None:
+            doc = await self.archivo.find_one({"_id": id}, proyeccion)
+        return (doc or {}).get(campo) or []
+
+    async def _construir_comentarios(self, req: Requerimiento, crudos: List[dict]) -> List[Comentario]:
+        # Un autor comenta varias veces: cada uno se busca una sola vez (y suele estar en caché)
+        autores = {}
+        for autor_id in {c["autor_id"] for c in crudos}:
+            autores[autor_id] = await self.usuario_repo.buscar_por_id(autor_id)
+
+        comentarios = []
+        for c in crudos:
+            autor = autores[c["autor_id"]] or self._snapshot(c["autor_id"], c.get("autor_nombre"))
+            comentarios.append(Comentario.reconstruir(c["id"], c["texto"], autor, req, c["fecha_hora"]))
+        return comentarios
+
+    async def _construir_eventos(self, req: Requerimiento, crudos: List[dict]) -> List[Evento]:
+        # Del responsable solo se muestran id y nombre, que ya están en el subdocumento
+        return [
+            _CLASES_EVENTO[TipoEvento(e["tipo"])].reconstruir(
+                e.get("id"),
+                e["titulo"],
+                e["descripcion"],
+                self._snapshot(e["responsable_id"], e.get("responsable_nombre")),
+                req,
+                e["fecha_hora"],
+                **self._datos_evento(e)
+            )
+            for e in crudos
+        ]
+
+    @classmethod
+    def _datos_evento(cls, e: dict) -> dict:
+        """Campos propios del tipo de evento (ver _evento_a_documento)"""
+        if e["tipo"] != TipoEvento.DERIVACION.value or "tecnico_origen_id" not in e:
+            return {}
+        return {
+            "tecnico_origen": cls._snapshot(e["tecnico_origen_id"], e.get("tecnico_origen_nombre")),
+            "tecnico_destino": cls._snapshot(e["tecnico_destino_id"], e.get("tecnico_destino_nombre")),
+            "motivo": e.get("motivo")
+        }
 
-        return req
\ No newline at end of file
+    @staticmethod
+    def _snapshot(id: int, nombre: Optional[str]) -> UsuarioSnapshot:
+        return UsuarioSnapshot.reconstruir(id=id, nombre=nombre or "", email=None, password_hash="")
\ No newline at end of file
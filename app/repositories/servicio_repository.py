@@ -2,14 +2,18 @@ from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.domain.entities.servicio import Servicio
 from app.domain.entities.usuario import Solicitante
-from app.domain.value_objects.email import Email
 from app.domain.enums import TipoServicio
 from app.infrastructure.mongodb.sequence import SequenceGenerator
+from app.infrastructure.mongodb.monitoreo import instrumentar
+from app.infrastructure.cache import CacheLocal
 
+@instrumentar
 class ServicioRepository:
-    def __init__(self, database: AsyncIOMotorDatabase):
+    def __init__(self, database: AsyncIOMotorDatabase, cache_usuarios: Optional[CacheLocal] = None):
         self.collection = database["servicios"]
         self.sequence = SequenceGenerator(database)
+        # Los usuarios cacheados incluyen sus servicios (ver UsuarioRepository)
+        self.cache_usuarios = cache_usuarios
 
     async def guardar(self, servicio: Servicio) -> Servicio:
         """Guarda o actualiza un servicio en la colección independiente"""
@@ -27,6 +31,8 @@ class ServicioRepository:
         }
 
         await self.collection.replace_one({"_id": servicio.id}, doc, upsert=True)
+        if self.cache_usuarios is not None and doc["solicitante_id"] is not None:
+            self.cache_usuarios.invalidar(doc["solicitante_id"])
         return servicio
 
     async def buscar_por_id(self, id: int) -> Optional[Servicio]:
@@ -48,14 +54,14 @@ class ServicioRepository:
     def _to_entity(self, doc: dict) -> Servicio:
         solicitante_proxy = None
         if doc.get("solicitante_id"):
-            solicitante_proxy = Solicitante(
+            solicitante_proxy = Solicitante.reconstruir(
                 id=doc["solicitante_id"],
                 nombre="Ref", # Placeholder
-                email=Email("ref@internal.com"),
+                email=None,
                 password_hash=""
             )
 
-        return Servicio(
+        return Servicio.reconstruir(
             id=doc["_id"],
             tipo=TipoServicio(doc["tipo"]),
             numero_servicio=doc["numero_servicio"],
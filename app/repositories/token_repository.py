@@ -1,18 +1,13 @@
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.infrastructure.mongodb.monitoreo import instrumentar
 
+@instrumentar
 class TokenRepository:
     def __init__(self, database: AsyncIOMotorDatabase):
+        # Índices (token y TTL sobre 'expiracion') declarados en app/infrastructure/mongodb/indices.py
         self.collection = database["tokens_revocados"]
 
-    async def crear_indice_ttl(self):
-        """
-        Crea un índice TTL para que los tokens se borren automáticamente
-        de la base de datos cuando llegue su fecha de expiración.
-        """
-        # expireAfterSeconds=0 significa que expira exactamente en la fecha del campo 'expiracion'
-        await self.collection.create_index("expiracion", expireAfterSeconds=0)
-
     async def revocar(self, token: str, expiracion: datetime):
         """Guarda el token en la lista negra"""
         await self.collection.insert_one({
@@ -2,7 +2,7 @@
 Repositorio de Usuarios con MongoDB.
 Implementa persistencia y reconstrucción de entidades (Usuario y sus subclases).
 """
-from typing import Optional, List
+from typing import Optional, List, Dict
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 # Imports explícitos de entidades para evitar ciclos con app.domain
@@ -13,19 +13,26 @@ from app.domain.entities.servicio import Servicio
 from app.domain.value_objects.email import Email
 from app.domain.enums import TipoUsuario, TipoServicio
 from app.infrastructure.mongodb.sequence import SequenceGenerator
+from app.infrastructure.mongodb.monitoreo import instrumentar
+from app.infrastructure.cache import CacheLocal
+from app.infrastructure.mongodb.lecturas import get_primaria, sesion
 
 
+@instrumentar
 class UsuarioRepository:
     """
     Repositorio concreto de usuarios.
     Utiliza Aggregation Framework para lecturas complejas (joins) y métodos estándar para escrituras.
     """
 
-    def __init__(self, database: AsyncIOMotorDatabase):
-        self.collection = database["usuarios"]
+    def __init__(self, database: AsyncIOMotorDatabase, cache: Optional[CacheLocal] = None):
+        self.collection = get_primaria(database, "usuarios")
         # No guardamos referencia a 'servicios' aquí para escritura,
         # pero la usaremos implícitamente en los $lookup de lectura.
         self.sequence = SequenceGenerator(database)
+        # Documentos (usuario + servicios_data) por _id; la invalidan este
+        # repositorio, ServicioRepository y el bus de invalidación
+        self.cache = cache
 
     # ========================================================================
     # Operaciones de Escritura (Create / Update / Delete)
@@ -47,16 +54,24 @@ class UsuarioRepository:
         await self.collection.replace_one(
             {"_id": usuario.id},
             doc,
-            upsert=True
+            upsert=True,
+            session=sesion()
         )
+        self.invalidar(usuario.id)
 
         return usuario
 
     async def eliminar(self, id: int) -> bool:
         """Elimina un usuario por su ID"""
         result = await self.collection.delete_one({"_id": id})
+        self.invalidar(id)
         return result.deleted_count > 0
 
+    def invalidar(self, id: int) -> None:
+        """Descarta el usuario de la caché local (los demás workers se enteran por el bus)"""
+        if self.cache is not None:
+            self.cache.invalidar(id)
+
     # ========================================================================
     # Operaciones de Lectura (Read)
     # ========================================================================
@@ -65,8 +80,20 @@ class UsuarioRepository:
         """
         Busca un usuario por ID.
         Si es un Solicitante, trae sus servicios usando $lookup.
+        Con caché se guarda el documento y se rehidrata una entidad nueva en
+        cada llamada, así nadie comparte una instancia que otro modifica.
         """
-        return await self._buscar_uno_con_relaciones({"_id": id})
+        if self.cache is None:
+            return await self._buscar_uno_con_relaciones({"_id": id})
+
+        doc = self.cache.obtener(id)
+        if doc is None:
+            version = self.cache.version(id)
+            doc = await self._buscar_documento_con_relaciones({"_id": id})
+            if doc is None:
+                return None
+            self.cache.guardar(id, doc, version)
+        return await self._to_entity(doc)
 
     async def buscar_por_email(self, email: str) -> Optional[Usuario]:
         """
@@ -80,6 +107,21 @@ class UsuarioRepository:
         count = await self.collection.count_documents({"email": email})
         return count > 0
 
+    async def buscar_resumenes(self, ids) -> Dict[int, dict]:
+        """
+        Datos públicos ({id, nombre, email}) de varios usuarios en una sola consulta.
+        Lo usan los listados del camino rápido en lugar de un buscar_por_id por fila.
+        """
+        ids = list(set(ids))
+        if not ids:
+            return {}
+
+        cursor = self.collection.find({"_id": {"$in": ids}}, {"nombre": 1, "email": 1})
+        return {
+            doc["_id"]: {"id": doc["_id"], "nombre": doc["nombre"], "email": doc["email"]}
+            async for doc in cursor
+        }
+
     # ========================================================================
     # Búsquedas Específicas por Rol
     # ========================================================================
@@ -135,6 +177,14 @@ class UsuarioRepository:
     # ========================================================================
 
     async def _buscar_uno_con_relaciones(self, filtro: dict) -> Optional[Usuario]:
+        doc = await self._buscar_documento_con_relaciones(filtro)
+        if doc is None:
+            return None
+
+        # Convertimos el documento enriquecido a Entidad
+        return await self._to_entity(doc)
+
+    async def _buscar_documento_con_relaciones(self, filtro: dict) -> Optional[dict]:
         """
         Ejecuta una agregación para obtener el usuario y sus servicios (JOIN) en una sola consulta.
         """
@@ -153,12 +203,7 @@ class UsuarioRepository:
 
         cursor = self.collection.aggregate(pipeline)
         resultados = await cursor.to_list(length=1)
-
-        if not resultados:
-            return None
-
-        # Convertimos el documento enriquecido a Entidad
-        return await self._to_entity(resultados[0])
+        return resultados[0] if resultados else None
 
     def _to_document(self, usuario: Usuario) -> dict:
         """Serializa la Entidad a estructura de MongoDB"""
@@ -187,9 +232,10 @@ class UsuarioRepository:
         """
         Deserializa el documento MongoDB a la Entidad correcta.
         Maneja la reconstrucción de objetos ValueObject (Email) y listas anidadas.
+        Los datos ya se validaron al guardarse: se rehidrata sin constructores.
         """
         # Value Objects
-        email = Email(doc["email"])
+        email = Email.confiable(doc["email"])
 
         # Determinación de tipo para instanciar la clase correcta
         tipo_str = doc.get("tipo_usuario")
@@ -212,7 +258,7 @@ class UsuarioRepository:
             servicios = []
             if "servicios_data" in doc:
                 for s_data in doc["servicios_data"]:
-                    servicios.append(Servicio(
+                    servicios.append(Servicio.reconstruir(
                         id=s_data["_id"],
                         tipo=TipoServicio(s_data["tipo"]),
                         numero_servicio=s_data["numero_servicio"],
@@ -221,16 +267,16 @@ class UsuarioRepository:
                         fecha_alta=s_data.get("fecha_alta")
                     ))
 
-            return Solicitante(
+            return Solicitante.reconstruir(
                 **base_args,
                 servicios_suscritos=servicios
             )
 
         elif tipo == TipoUsuario.OPERADOR:
-            return Operador(**base_args)
+            return Operador.reconstruir(**base_args)
 
         elif tipo == TipoUsuario.TECNICO:
-            return Tecnico(
+            return Tecnico.reconstruir(
                 **base_args,
                 especialidades=doc.get("especialidades", [])
             )
@@ -238,7 +284,7 @@ class UsuarioRepository:
         elif tipo == TipoUsuario.SUPERVISOR:
             # Nota: Los supervisados se cargan "lazy" o mediante otra consulta si se requieren completos.
             # Aquí devolvemos el Supervisor base.
-            return Supervisor(**base_args)
+            return Supervisor.reconstruir(**base_args)
 
         else:
             # Fallback seguro
@@ -9,8 +9,9 @@ from app.schemas.asignacion import (
 from app.dependencies.auth import verificar_rol_operador, verificar_rol_tecnico
 from app.services.asignacion_service import AsignacionService
 from app.dependencies.services import get_asignacion_service
+from app.infrastructure.tiempos import RutaMedida
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
 
 @router.post("/{id}/asignar", response_model=AsignacionResponse)
 async def asignar_tecnico(
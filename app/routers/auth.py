@@ -5,8 +5,9 @@ from app.schemas.auth import LoginRequest, LoginResponse, RegistroRequest, Usuar
 from app.services.authentication_service import AutenticacionService
 from app.dependencies.services import get_auth_service
 from app.services.exceptions import UnauthorizedException
+from app.infrastructure.tiempos import RutaMedida
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
 security = HTTPBearer()
 
 
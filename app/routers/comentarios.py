@@ -4,8 +4,9 @@ from app.schemas.comentario import CrearComentarioRequest, ComentarioResponse, L
 from app.dependencies.auth import get_current_user
 from app.services.comentario_service import ComentarioService
 from app.dependencies.services import get_comentario_service
+from app.infrastructure.tiempos import RutaMedida
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
 
 @router.post("/{id}/comentarios", response_model=ComentarioResponse, status_code=status.HTTP_201_CREATED)
 async def agregar_comentario(
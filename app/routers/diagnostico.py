@@ -0,0 +1,36 @@
+import os
+from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import Literal
+from app.config import settings
+from app.dependencies.auth import principal_supervisor
+from app.infrastructure.profiler import Perfilador
+from app.infrastructure.tiempos import RutaMedida
+
+# Solo se registra en app/main.py si PROFILER_HABILITADO está activo
+router = APIRouter(route_class=RutaMedida)
+
+perfilador = Perfilador(intervalo_ms=settings.PROFILER_INTERVALO_MS)
+
+
+@router.get("/profiler", response_class=PlainTextResponse)
+async def perfilar_worker(
+        segundos: float = Query(10, gt=0, le=settings.PROFILER_MAX_SEGUNDOS),
+        modo: Literal["wall", "cpu"] = Query("wall"),
+        current_user=Depends(principal_supervisor)
+):
+    """
+    Perfil estadístico del worker que atiende el request.
+    Devuelve pilas colapsadas (flamegraph.pl / speedscope).
+    """
+    if perfilador.ocupado:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya hay un perfil en curso en este worker"
+        )
+
+    perfil = await perfilador.perfilar(segundos, modo)
+    return PlainTextResponse(
+        perfil,
+        headers={"Content-Disposition": f'attachment; filename="perfil-{modo}-{os.getpid()}.folded"'}
+    )
@@ -3,11 +3,13 @@ from typing import List, Optional
 from app.schemas.notificacion import (
     NotificacionResponse, PaginatedNotificacionesResponse, MarcarLeidasResponse
 )
-from app.dependencies.auth import verificar_rol_supervisor
+from app.dependencies.auth import verificar_rol_supervisor, principal_supervisor
 from app.services.notificacion_service import NotificacionService
 from app.dependencies.services import get_notificacion_service
+from app.infrastructure.tiempos import RutaMedida
+from app.infrastructure.respuestas import respuesta_directa
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
 
 
 @router.get("", response_model=PaginatedNotificacionesResponse)
@@ -15,29 +17,24 @@ async def listar_notificaciones(
         leida: Optional[bool] = Query(None),
         page: int = Query(0, ge=0),
         size: int = Query(20, ge=1, le=100),
-        current_user=Depends(verificar_rol_supervisor),
+        current_user=Depends(principal_supervisor),
         service: NotificacionService = Depends(get_notificacion_service)
 ):
-    notificaciones, total = await service.listar_notificaciones(
+    # Camino rápido: filas mapeadas desde los documentos, sin entidades
+    notificaciones, total, total_no_leidas = await service.listar_resumen(
         supervisor_id=current_user.id,
         leida=leida,
         page=page,
         size=size
     )
 
-    # Calcular total de no leídas para el contador del frontend
-    total_no_leidas = await service.notif_repo.contar_por_supervisor(
-        supervisor_id=current_user.id,
-        leida=False
-    )
-
-    return {
+    return respuesta_directa({
         "content": notificaciones,
         "totalNoLeidas": total_no_leidas,
         "totalElements": total,
         "page": page,
         "size": size
-    }
+    }, PaginatedNotificacionesResponse)
 
 
 @router.patch("/{id}/leer", response_model=NotificacionResponse)
@@ -1,21 +1,47 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from app.schemas.reporte import DashboardOperadorResponse, DashboardTecnicoResponse
-from app.dependencies.auth import verificar_rol_operador, verificar_rol_tecnico, get_current_user
+from app.dependencies.auth import principal_operador, principal_tecnico, principal_gestion
 from app.services.reporte_service import ReporteService
 from app.dependencies.services import get_reporte_service
+from app.infrastructure.tiempos import RutaMedida
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
+
+_TIPOS_EXPORTACION = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
 
 @router.get("/dashboard-operador", response_model=DashboardOperadorResponse)
 async def dashboard_operador(
-    current_user = Depends(verificar_rol_operador),
+    current_user = Depends(principal_operador),
     service: ReporteService = Depends(get_reporte_service)
 ):
     return await service.obtener_dashboard_operador()
 
 @router.get("/dashboard-tecnico", response_model=DashboardTecnicoResponse)
 async def dashboard_tecnico(
-    current_user = Depends(verificar_rol_tecnico),
+    current_user = Depends(principal_tecnico),
+    service: ReporteService = Depends(get_reporte_service)
+):
+    return await service.obtener_dashboard_tecnico(current_user.id)
+
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_requerimientos(
+    formato: Literal["csv", "ndjson"] = Query("csv"),
+    desde: Optional[datetime] = Query(None, description="Creados desde (inclusive)"),
+    hasta: Optional[datetime] = Query(None, description="Creados hasta (exclusive)"),
+    current_user = Depends(principal_gestion),
     service: ReporteService = Depends(get_reporte_service)
 ):
-    return await service.obtener_dashboard_tecnico(current_user.id)
\ No newline at end of file
+    """Exportación completa de requerimientos, transmitida directo desde el cursor"""
+    nombre = "requerimientos"
+    if desde:
+        nombre += f"_desde_{desde.date().isoformat()}"
+    if hasta:
+        nombre += f"_hasta_{hasta.date().isoformat()}"
+    return StreamingResponse(
+        service.exportar(formato, desde, hasta),
+        media_type=_TIPOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'}
+    )
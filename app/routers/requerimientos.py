@@ -6,19 +6,24 @@ from app.schemas.requerimiento import (
     RequerimientoListaResponse,
     ResolverRequerimientoRequest,
     ReabrirRequerimientoRequest,
-    PaginatedResponse
+    PaginatedResponse,
+    BusquedaResponse
 )
 from app.schemas.enums import EstadoRequerimiento, TipoRequerimiento
 from app.dependencies.auth import (
     get_current_user,
+    get_principal,
+    Principal,
     verificar_rol_solicitante,
     verificar_rol_tecnico
 )
 from app.services.requerimiento_service import RequerimientoService
 from app.dependencies.services import get_req_service
+from app.infrastructure.tiempos import RutaMedida
+from app.infrastructure.respuestas import respuesta_directa
 
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
 
 @router.post("", response_model=RequerimientoResponse, status_code=status.HTTP_201_CREATED)
 async def crear_requerimiento(
@@ -33,7 +38,8 @@ async def crear_requerimiento(
         titulo=request.titulo,
         descripcion=request.descripcion,
         categoria=request.categoria,
-        nivel_urgencia=request.nivel_urgencia
+        nivel_urgencia=request.nivel_urgencia,
+        tipo_servicio=request.tipo_servicio
     )
 
 @router.get("", response_model=PaginatedResponse[RequerimientoListaResponse])
@@ -42,10 +48,11 @@ async def listar_requerimientos(
         tipo: Optional[TipoRequerimiento] = Query(None),
         page: int = Query(0, ge=0),
         size: int = Query(20, ge=1, le=100),
-        current_user=Depends(get_current_user),
+        current_user: Principal = Depends(get_principal),
         service: RequerimientoService = Depends(get_req_service)
 ):
-    requerimientos, total = await service.listar_requerimientos(
+    # Camino rápido: filas mapeadas desde los documentos, sin entidades
+    requerimientos, total = await service.listar_resumen(
         usuario_actual=current_user,
         estado=estado,
         tipo=tipo,
@@ -54,7 +61,7 @@ async def listar_requerimientos(
     )
 
     total_pages = (total + size - 1) // size
-    return {
+    return respuesta_directa({
         "content": requerimientos,
         "page": page,
         "size": size,
@@ -62,7 +69,30 @@ async def listar_requerimientos(
         "total_pages": total_pages,
         "is_first": page == 0,
         "is_last": page >= total_pages - 1
-    }
+    }, PaginatedResponse[RequerimientoListaResponse])
+
+
+@router.get("/buscar", response_model=BusquedaResponse)
+async def buscar_requerimientos(
+        q: str = Query(..., min_length=2, max_length=200),
+        cursor: Optional[str] = Query(None),
+        size: int = Query(20, ge=1, le=100),
+        current_user: Principal = Depends(get_principal),
+        service: RequerimientoService = Depends(get_req_service)
+):
+    # Declarada antes de /{id} para que "buscar" no se tome como id
+    resultados, siguiente = await service.buscar(
+        usuario_actual=current_user,
+        q=q,
+        cursor=cursor,
+        size=size
+    )
+
+    return respuesta_directa({
+        "content": resultados,
+        "size": size,
+        "next_cursor": siguiente
+    }, BusquedaResponse)
 
 
 @router.get("/{id}", response_model=RequerimientoResponse)
@@ -6,8 +6,9 @@ from app.dependencies.auth import verificar_rol_solicitante, get_current_user
 from app.services.servicio_service import ServicioService
 from app.dependencies.services import get_servicio_service
 from app.services.exceptions import NotFoundException
+from app.infrastructure.tiempos import RutaMedida
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
 
 @router.get("/mis-servicios", response_model=MisServiciosResponse)
 async def listar_mis_servicios(
@@ -5,10 +5,11 @@ from app.schemas.usuario import (
     TecnicoResponse, SupervisionResponse, ConfigurarSupervisionRequest
 )
 from app.services.authentication_service import AutenticacionService
-from app.dependencies.auth import get_current_user, verificar_rol_operador, verificar_rol_supervisor
+from app.dependencies.auth import get_current_user, verificar_rol_supervisor, principal_operador
 from app.dependencies.services import get_auth_service, get_usuario_repo
+from app.infrastructure.tiempos import RutaMedida
 
-router = APIRouter()
+router = APIRouter(route_class=RutaMedida)
 
 
 @router.get("/me", response_model=UsuarioPerfilResponse)
@@ -29,9 +30,9 @@ async def actualizar_perfil(
     if request.passwordNuevo:
         if not request.passwordActual:
             raise HTTPException(status_code=400, detail="Password actual requerido")
-        if not auth_service.verificar_password(request.passwordActual, current_user.password_hash):
+        if not await auth_service.verificar_password(request.passwordActual, current_user.password_hash):
             raise HTTPException(status_code=400, detail="Password actual incorrecto")
-        current_user.password_hash = auth_service.hash_password(request.passwordNuevo)
+        current_user.password_hash = await auth_service.hash_password(request.passwordNuevo)
 
     if request.nombre:
         current_user.actualizar_nombre(request.nombre)
@@ -43,7 +44,7 @@ async def actualizar_perfil(
 @router.get("/tecnicos", response_model=List[TecnicoResponse])
 async def listar_tecnicos(
         especialidad: str = None,
-        current_user=Depends(verificar_rol_operador),
+        current_user=Depends(principal_operador),
         user_repo=Depends(get_usuario_repo)
 ):
     tecnicos = await user_repo.buscar_tecnicos(especialidad=especialidad)
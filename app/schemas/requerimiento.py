@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field, field_validator, model_validator, ConfigD
 from typing import Optional, List, Generic, TypeVar, Any
 from datetime import datetime
 from app.schemas.enums import (
-    TipoRequerimiento, EstadoRequerimiento, NivelUrgencia
+    TipoRequerimiento, EstadoRequerimiento, NivelUrgencia, TipoServicio
 )
 
 class CrearRequerimientoRequest(BaseModel):
@@ -11,6 +11,14 @@ class CrearRequerimientoRequest(BaseModel):
     descripcion: str = Field(..., min_length=10, max_length=2000, description="Descripción detallada")
     categoria: str = Field(..., description="Categoría del requerimiento")
     nivel_urgencia: Optional[NivelUrgencia] = Field(None, description="Urgencia (solo para INCIDENTE)")
+    tipo_servicio: Optional[TipoServicio] = Field(None, description="Servicio afectado (opcional, solo para INCIDENTE)")
+
+    @field_validator('tipo_servicio')
+    @classmethod
+    def validar_servicio_incidente(cls, v, info):
+        if v is not None and info.data.get('tipo') == TipoRequerimiento.SOLICITUD:
+            raise ValueError('tipo_servicio no debe especificarse para SOLICITUD')
+        return v
 
     @field_validator('nivel_urgencia')
     @classmethod
@@ -66,6 +74,18 @@ class ComentarioInfo(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode='before')
+    @classmethod
+    def map_domain(cls, v: Any) -> Any:
+        if hasattr(v, 'autor') and not isinstance(v, dict):
+            return {
+                "id": v.id,
+                "texto": v.texto,
+                "autor": {"id": v.autor.id, "nombre": v.autor.nombre},
+                "fecha_hora": v.fecha_hora
+            }
+        return v
+
 class EventoInfo(BaseModel):
     id: Optional[int] = None
     tipo: str
@@ -103,6 +123,10 @@ class RequerimientoResponse(BaseModel):
     fecha_creacion: datetime
     fecha_resolucion: Optional[datetime] = None
     dias_desde_creacion: int
+    tipo_servicio: Optional[TipoServicio] = None
+    posible_duplicado_de: Optional[int] = None
+    es_masivo: bool = False
+    incidente_padre_id: Optional[int] = None
     comentarios: List[ComentarioInfo] = []
     eventos: List[EventoInfo] = []
 
@@ -126,6 +150,10 @@ class RequerimientoResponse(BaseModel):
                 "fecha_creacion": v.fecha_creacion,
                 "fecha_resolucion": v.fecha_resolucion,
                 "dias_desde_creacion": v.get_dias_desde_creacion(),
+                "tipo_servicio": getattr(v, 'tipo_servicio', None),
+                "posible_duplicado_de": v.posible_duplicado_de,
+                "es_masivo": getattr(v, 'es_masivo', False),
+                "incidente_padre_id": getattr(v, 'incidente_padre_id', None),
                 "comentarios": v.comentarios,
                 "eventos": v.obtener_historial()
             }
@@ -176,6 +204,24 @@ class PaginatedResponse(BaseModel, Generic[T]):
     is_first: bool
     is_last: bool
 
+class FragmentoInfo(BaseModel):
+    campo: str
+    texto: str
+
+class ResultadoBusquedaResponse(BaseModel):
+    id: int
+    tipo: TipoRequerimiento
+    titulo: str
+    estado: EstadoRequerimiento
+    fecha_creacion: datetime
+    score: float
+    fragmentos: List[FragmentoInfo]
+
+class BusquedaResponse(BaseModel):
+    content: List[ResultadoBusquedaResponse]
+    size: int
+    next_cursor: Optional[str] = None
+
 class ResolverRequerimientoRequest(BaseModel):
     comentarioResolucion: Optional[str] = Field(None, min_length=10, max_length=1000, description="Comentario de resolución")
 
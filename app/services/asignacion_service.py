@@ -2,6 +2,8 @@ from typing import Optional
 from app.domain import Operador, Tecnico, Requerimiento, EventoFactory, Notificador
 from app.domain.enums import TipoEvento
 from app.services.exceptions import NotFoundException, UnauthorizedException
+from app.services.requerimiento_service import rechazar_transicion
+from app.services.concurrencia import aplicar_con_reintentos
 
 
 class AsignacionService:
@@ -49,13 +51,6 @@ class AsignacionService:
             UnauthorizedException: Si el usuario no es operador
             EstadoInvalidoException: Si el estado no permite asignación
         """
-        # Obtener requerimiento
-        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id)
-        if not requerimiento:
-            raise NotFoundException(
-                f"Requerimiento {requerimiento_id} no encontrado"
-            )
-
         # Obtener técnico
         tecnico = await self.usuario_repo.buscar_por_id(tecnico_id)
         if not tecnico or not isinstance(tecnico, Tecnico):
@@ -66,36 +61,39 @@ class AsignacionService:
         if not operador or not isinstance(operador, Operador):
             raise UnauthorizedException("Solo operadores pueden asignar técnicos")
 
-        # Agregar comentario si se proporciona
+        # Comentario opcional: viaja en la misma escritura que la asignación
+        comentarios = []
         if comentario:
             from app.domain import Comentario
-            comentario_obj = Comentario(
-                id=None,
+            comentarios.append(Comentario(
+                id=await self.req_repo.siguiente_id_comentario(),
                 texto=comentario,
                 autor=operador,
-                requerimiento=requerimiento
-            )
-            requerimiento.agregar_comentario(comentario_obj)
+                requerimiento=None
+            ))
 
-        # Asignar técnico (validaciones en el dominio)
-        requerimiento.asignar_tecnico(tecnico, operador)
-
-        # Crear evento de asignación
         evento = EventoFactory.crear_evento(
             tipo=TipoEvento.ASIGNACION,
-            requerimiento=requerimiento,
+            requerimiento=None,
             responsable=operador,
             tecnico_asignado=tecnico
         )
-        requerimiento.agregar_evento(evento)
 
-        # Guardar
-        requerimiento_actualizado = await self.req_repo.guardar(requerimiento)
+        # Asignar: guardas del dominio aplicadas como filtro de la actualización
+        requerimiento = await self.req_repo.asignar(requerimiento_id, tecnico, evento, comentarios)
+        if requerimiento is None:
+            await rechazar_transicion(
+                self.req_repo, requerimiento_id, lambda r: r.asignar_tecnico(tecnico, operador)
+            )
+        if getattr(requerimiento, "es_masivo", False):
+            # Un incidente masivo se asigna una vez: los hijos siguen al padre
+            await self.req_repo.asignar_hijos(requerimiento.id, tecnico)
 
         # Notificar
+        evento.requerimiento = requerimiento
         await self.notificador.notificar_evento(evento)
 
-        return requerimiento_actualizado
+        return requerimiento
 
     async def reasignar_tecnico(
             self,
@@ -116,13 +114,6 @@ class AsignacionService:
         Returns:
             Requerimiento: Requerimiento actualizado
         """
-        # Obtener requerimiento
-        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id)
-        if not requerimiento:
-            raise NotFoundException(
-                f"Requerimiento {requerimiento_id} no encontrado"
-            )
-
         # Obtener nuevo técnico
         nuevo_tecnico = await self.usuario_repo.buscar_por_id(nuevo_tecnico_id)
         if not nuevo_tecnico or not isinstance(nuevo_tecnico, Tecnico):
@@ -133,23 +124,31 @@ class AsignacionService:
         if not operador or not isinstance(operador, Operador):
             raise UnauthorizedException("Solo operadores pueden reasignar técnicos")
 
-        # Reasignar (validaciones en el dominio)
-        requerimiento.reasignar_tecnico(nuevo_tecnico, operador)
+        async def reasignar(requerimiento):
+            tecnico_anterior = requerimiento.tecnico_asignado
+            # Reasignar (validaciones en el dominio)
+            requerimiento.reasignar_tecnico(nuevo_tecnico, operador)
+
+            # Crear evento de reasignación (usando ASIGNACION)
+            evento = EventoFactory.crear_evento(
+                tipo=TipoEvento.ASIGNACION,
+                requerimiento=requerimiento,
+                responsable=operador,
+                tecnico_asignado=nuevo_tecnico
+            )
+            requerimiento.agregar_evento(evento)
+            return evento, tecnico_anterior.id
 
-        # Crear evento de reasignación (usando ASIGNACION)
-        evento = EventoFactory.crear_evento(
-            tipo=TipoEvento.ASIGNACION,
-            requerimiento=requerimiento,
-            responsable=operador,
-            tecnico_asignado=nuevo_tecnico
+        # Guardar con control de versión
+        requerimiento_actualizado, (evento, tecnico_anterior_id) = await aplicar_con_reintentos(
+            self.req_repo, requerimiento_id, "reasignar", reasignar
         )
-        requerimiento.agregar_evento(evento)
-
-        # Guardar
-        requerimiento_actualizado = await self.req_repo.guardar(requerimiento)
+        if getattr(requerimiento_actualizado, "es_masivo", False):
+            # Los hijos que seguían al técnico anterior pasan al nuevo
+            await self.req_repo.asignar_hijos(requerimiento_actualizado.id, nuevo_tecnico, tecnico_anterior_id)
 
         # Notificar
-        self.notificador.notificar_evento(evento)
+        await self.notificador.notificar_evento(evento)
 
         return requerimiento_actualizado
 
@@ -176,13 +175,6 @@ class AsignacionService:
             NotFoundException: Si no existen los recursos
             UnauthorizedException: Si no es el técnico asignado
         """
-        # Obtener requerimiento
-        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id)
-        if not requerimiento:
-            raise NotFoundException(
-                f"Requerimiento {requerimiento_id} no encontrado"
-            )
-
         # Obtener técnicos
         tecnico_origen = await self.usuario_repo.buscar_por_id(tecnico_origen_id)
         if not tecnico_origen or not isinstance(tecnico_origen, Tecnico):
@@ -192,24 +184,28 @@ class AsignacionService:
         if not tecnico_destino or not isinstance(tecnico_destino, Tecnico):
             raise NotFoundException(f"Técnico destino {tecnico_destino_id} no encontrado")
 
-        # Derivar (validaciones en el dominio)
-        requerimiento.derivar_a_tecnico(tecnico_destino, tecnico_origen, motivo)
+        async def derivar(requerimiento):
+            # Derivar (validaciones en el dominio)
+            requerimiento.derivar_a_tecnico(tecnico_destino, tecnico_origen, motivo)
+
+            # Crear evento de derivación
+            evento = EventoFactory.crear_evento(
+                tipo=TipoEvento.DERIVACION,
+                requerimiento=requerimiento,
+                responsable=tecnico_origen,
+                tecnico_origen=tecnico_origen,
+                tecnico_destino=tecnico_destino,
+                motivo=motivo
+            )
+            requerimiento.agregar_evento(evento)
+            return evento
 
-        # Crear evento de derivación
-        evento = EventoFactory.crear_evento(
-            tipo=TipoEvento.DERIVACION,
-            requerimiento=requerimiento,
-            responsable=tecnico_origen,
-            tecnico_origen=tecnico_origen,
-            tecnico_destino=tecnico_destino,
-            motivo=motivo
+        # Guardar con control de versión
+        requerimiento_actualizado, evento = await aplicar_con_reintentos(
+            self.req_repo, requerimiento_id, "derivar", derivar
         )
-        requerimiento.agregar_evento(evento)
-
-        # Guardar
-        requerimiento_actualizado = await self.req_repo.guardar(requerimiento)
 
         # Notificar
-        self.notificador.notificar_evento(evento)
+        await self.notificador.notificar_evento(evento)
 
         return requerimiento_actualizado
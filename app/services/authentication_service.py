@@ -1,4 +1,6 @@
+import asyncio
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
@@ -11,10 +13,25 @@ from app.config import settings
 from app.repositories.token_repository import TokenRepository
 from app.repositories.usuario_repository import UsuarioRepository
 from app.repositories.servicio_repository import ServicioRepository
+from app.infrastructure.metricas import BCRYPT_PENDIENTES, BCRYPT_DURACION
 
 # Configuración de encriptación de passwords
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt es CPU-bound y libera el GIL: corre en un pool propio para no
+# bloquear el event loop ni competir con el executor de Motor
+_executor_bcrypt = ThreadPoolExecutor(max_workers=settings.BCRYPT_HILOS, thread_name_prefix="bcrypt")
+
+
+async def _ejecutar_bcrypt(operacion: str, funcion, *args):
+    BCRYPT_PENDIENTES.inc()
+    try:
+        with BCRYPT_DURACION.labels(operacion).time():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_executor_bcrypt, funcion, *args)
+    finally:
+        BCRYPT_PENDIENTES.dec()
+
 
 class AutenticacionService:
     """
@@ -44,20 +61,20 @@ class AutenticacionService:
         """
         return hashlib.sha256(password.encode('utf-8')).hexdigest()
 
-    def hash_password(self, password: str) -> str:
+    async def hash_password(self, password: str) -> str:
         """
         Genera hash de password usando SHA-256 + bcrypt.
         """
         password_pre_hashed = self._pre_hash_password(password)
-        return pwd_context.hash(password_pre_hashed)
+        return await _ejecutar_bcrypt("hash", pwd_context.hash, password_pre_hashed)
 
-    def verificar_password(self, password_plano: str, password_hash: str) -> bool:
+    async def verificar_password(self, password_plano: str, password_hash: str) -> bool:
         """
         Verifica si un password coincide con su hash.
         """
         try:
             password_pre_hashed = self._pre_hash_password(password_plano)
-            return pwd_context.verify(password_pre_hashed, password_hash)
+            return await _ejecutar_bcrypt("verificar", pwd_context.verify, password_pre_hashed, password_hash)
         except Exception:
             return False
 
@@ -193,7 +210,7 @@ class AutenticacionService:
         email_vo = Email(email)
 
         # Hash del password
-        password_hash = self.hash_password(password)
+        password_hash = await self.hash_password(password)
 
         # Crear usuario según tipo
         if tipo_usuario == TipoUsuario.SOLICITANTE:
@@ -275,7 +292,7 @@ class AutenticacionService:
             raise UnauthorizedException("Credenciales inválidas")
 
         # Verificar password
-        if not self.verificar_password(password, usuario.password_hash):
+        if not await self.verificar_password(password, usuario.password_hash):
             raise UnauthorizedException("Credenciales inválidas")
 
         # Actualizar último acceso
@@ -0,0 +1,126 @@
+"""
+Utilidades de la búsqueda de texto de requerimientos: cursor opaco de
+paginación y fragmentos con los términos resaltados.
+
+El índice de texto de MongoDB aplica stemming en español e ignora acentos,
+pero no informa qué palabras coincidieron. Los fragmentos se arman acá con
+una aproximación equivalente: comparación sin acentos y por raíz (prefijo).
+"""
+import base64
+import html
+import json
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MARCA_INICIO = "<mark>"
+MARCA_FIN = "</mark>"
+
+# El índice en español ignora estas palabras: no se resaltan
+PALABRAS_VACIAS = {
+    "de", "la", "el", "los", "las", "un", "una", "y", "o", "en", "sin", "con",
+    "por", "para", "que", "del", "al", "se", "no", "mi", "su", "me", "es"
+}
+
+_VARIANTES = {"a": "aáàä", "e": "eéèë", "i": "iíìï", "o": "oóòö", "u": "uúùü", "n": "nñ"}
+
+
+def codificar_cursor(score: float, id: int) -> str:
+    """Cursor opaco con la posición (relevancia, id) del último resultado entregado"""
+    crudo = json.dumps([score, id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        score, id = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return float(score), int(id)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor de búsqueda inválido")
+
+
+def sin_acentos(texto: str) -> str:
+    """Minúsculas sin diacríticos, conservando la longitud (las posiciones valen para el original)"""
+    return "".join(unicodedata.normalize("NFD", c)[0].lower()[0] for c in texto)
+
+
+def terminos(q: str) -> List[str]:
+    """Raíces de los términos positivos de la consulta (ignora los excluidos con '-')"""
+    raices = []
+    for palabra in re.findall(r'-?[\w]+', q.replace('"', " ")):
+        if palabra.startswith("-") or len(palabra) < 2:
+            continue
+        palabra = sin_acentos(palabra)
+        if palabra in PALABRAS_VACIAS:
+            continue
+        raiz = palabra if len(palabra) <= 4 else palabra[:max(4, len(palabra) - 2)]
+        if raiz not in raices:
+            raices.append(raiz)
+    return raices
+
+
+def patron_mongo(raices: Sequence[str]) -> Optional[str]:
+    """
+    Regex para $regexMatch que tolera acentos (los datos guardados los conservan).
+    El inicio de palabra se ancla con un lookbehind de propiedades Unicode:
+    en el PCRE de MongoDB \\b solo reconoce letras ASCII y no vería el
+    comienzo de "área" o "él".
+    """
+    if not raices:
+        return None
+    alternativas = [
+        "".join(f"[{_VARIANTES[c]}]" if c in _VARIANTES else re.escape(c) for c in raiz)
+        for raiz in raices
+    ]
+    return r"(?<![\p{L}\p{N}_])(" + "|".join(alternativas) + ")"
+
+
+def _recortar(texto: str, normalizado: str, patron: re.Pattern, ancho: int) -> Optional[str]:
+    primera = patron.search(normalizado)
+    if primera is None:
+        return None
+
+    inicio = max(0, primera.start() - ancho // 3)
+    fin = min(len(texto), inicio + ancho)
+    # Extender a límites de palabra para no cortar a la mitad
+    while inicio > 0 and not texto[inicio - 1].isspace():
+        inicio -= 1
+    while fin < len(texto) and not texto[fin].isspace():
+        fin += 1
+
+    partes = ["…" if inicio > 0 else ""]
+    cursor = inicio
+    for coincidencia in patron.finditer(normalizado, inicio, fin):
+        partes.append(html.escape(texto[cursor:coincidencia.start()]))
+        partes.append(MARCA_INICIO + html.escape(texto[coincidencia.start():coincidencia.end()]) + MARCA_FIN)
+        cursor = coincidencia.end()
+    partes.append(html.escape(texto[cursor:fin]))
+    partes.append("…" if fin < len(texto) else "")
+    return "".join(partes)
+
+
+def fragmentos(
+        campos: Sequence[Tuple[str, str]],
+        raices: Sequence[str],
+        maximo: int = 3,
+        ancho: int = 120
+) -> List[Dict[str, str]]:
+    """
+    Fragmentos resaltados (HTML escapado, términos entre <mark>) de los campos
+    (nombre, texto) que contienen alguno de los términos, en el orden recibido.
+    """
+    if not raices:
+        return []
+
+    patron = re.compile(r"\b(?:" + "|".join(re.escape(r) for r in raices) + r")\w*")
+    resultado = []
+    for campo, texto in campos:
+        if not texto:
+            continue
+        fragmento = _recortar(texto, sin_acentos(texto), patron, ancho)
+        if fragmento is not None:
+            resultado.append({"campo": campo, "texto": fragmento})
+            if len(resultado) >= maximo:
+                break
+    return resultado
@@ -2,6 +2,7 @@ from typing import List
 from app.domain import Comentario, Usuario, EventoFactory
 from app.domain.enums import TipoEvento
 from app.services.exceptions import NotFoundException, UnauthorizedException
+from app.services.concurrencia import aplicar_con_reintentos
 
 
 class ComentarioService:
@@ -46,47 +47,43 @@ class ComentarioService:
             NotFoundException: Si no existen los recursos
             UnauthorizedException: Si no tiene permisos
         """
-        # Obtener requerimiento
-        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id)
-        if not requerimiento:
-            raise NotFoundException(
-                f"Requerimiento {requerimiento_id} no encontrado"
-            )
-
         # Obtener usuario
         usuario = await self.usuario_repo.buscar_por_id(usuario_id)
         if not usuario:
             raise NotFoundException(f"Usuario {usuario_id} no encontrado")
 
-        # Verificar permisos
-        if not usuario.puede_comentar_requerimiento(requerimiento):
-            raise UnauthorizedException(
-                "No tiene permisos para comentar en este requerimiento"
-            )
-
-        # Crear comentario
         nuevo_id = await self.req_repo.siguiente_id_comentario()
-        comentario = Comentario(
-            id=nuevo_id,
-            texto=texto,
-            autor=usuario,
-            requerimiento=requerimiento
-        )
 
-        # Agregar al requerimiento
-        requerimiento.agregar_comentario(comentario)
+        async def comentar(requerimiento):
+            # Verificar permisos
+            if not usuario.puede_comentar_requerimiento(requerimiento):
+                raise UnauthorizedException(
+                    "No tiene permisos para comentar en este requerimiento"
+                )
+
+            # Crear comentario y agregarlo al requerimiento
+            comentario = Comentario(
+                id=nuevo_id,
+                texto=texto,
+                autor=usuario,
+                requerimiento=requerimiento
+            )
+            requerimiento.agregar_comentario(comentario)
+
+            # Crear evento de comentario
+            evento = EventoFactory.crear_evento(
+                tipo=TipoEvento.COMENTARIO,
+                requerimiento=requerimiento,
+                responsable=usuario,
+                comentario=comentario
+            )
+            requerimiento.agregar_evento(evento)
+            return comentario, evento
 
-        # Crear evento de comentario
-        evento = EventoFactory.crear_evento(
-            tipo=TipoEvento.COMENTARIO,
-            requerimiento=requerimiento,
-            responsable=usuario,
-            comentario=comentario
+        # Guardar con control de versión: ante un conflicto se relee y se vuelve a comentar
+        _, (comentario, evento) = await aplicar_con_reintentos(
+            self.req_repo, requerimiento_id, "comentar", comentar
         )
-        requerimiento.agregar_evento(evento)
-
-        # Guardar requerimiento con el nuevo comentario
-        await self.req_repo.guardar(requerimiento)
 
         # Notificar
         await self.notificador.notificar_evento(evento)
@@ -126,7 +123,8 @@ class ComentarioService:
             )
 
         # Retornar comentarios ordenados por fecha
+        comentarios = await requerimiento.comentarios.cargar()
         return sorted(
-            requerimiento.comentarios,
+            comentarios,
             key=lambda c: c.fecha_hora
         )
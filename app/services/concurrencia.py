@@ -0,0 +1,64 @@
+"""
+Reintentos de operaciones sobre un requerimiento ante conflictos de versión.
+
+RequerimientoRepository.guardar solo reescribe el documento si sigue en la
+versión leída. Cuando otro request ganó la carrera, la operación de dominio
+se vuelve a aplicar sobre una lectura fresca (con un backoff corto y
+aleatorio), hasta REQ_CONFLICTO_REINTENTOS veces; después se responde 409.
+Así los tickets muy concurridos no necesitan bloqueos globales.
+"""
+import asyncio
+import random
+from typing import Awaitable, Callable, Tuple, TypeVar
+from app.domain import Requerimiento, ConflictoVersionException, RequerimientoArchivadoException
+from app.services.exceptions import NotFoundException, ConflictException
+from app.infrastructure.metricas import REQUERIMIENTOS_ESCRITURAS_VERSIONADAS
+from app.config import settings
+
+T = TypeVar("T")
+
+
+async def aplicar_con_reintentos(
+        req_repo,
+        requerimiento_id: int,
+        nombre: str,
+        operacion: Callable[[Requerimiento], Awaitable[T]]
+) -> Tuple[Requerimiento, T]:
+    """
+    Lee el requerimiento, le aplica 'operacion' (que lo modifica vía el
+    dominio) y lo guarda. La operación debe poder repetirse: en cada
+    intento recibe una entidad recién leída.
+
+    Returns:
+        (requerimiento guardado, resultado de la operación)
+
+    Raises:
+        NotFoundException: Si el requerimiento no existe o solo está en el
+            archivo (no se modifica; reabrir lo restaura)
+        ConflictException: Si se agotan los reintentos
+    """
+    for intento in range(settings.REQ_CONFLICTO_REINTENTOS + 1):
+        requerimiento = await req_repo.buscar_por_id(requerimiento_id)
+        if not requerimiento:
+            raise NotFoundException(f"Requerimiento {requerimiento_id} no encontrado")
+
+        resultado = await operacion(requerimiento)
+        try:
+            await req_repo.guardar(requerimiento)
+        except RequerimientoArchivadoException as e:
+            REQUERIMIENTOS_ESCRITURAS_VERSIONADAS.labels(nombre, "archivado").inc()
+            raise NotFoundException(str(e))
+        except ConflictoVersionException:
+            REQUERIMIENTOS_ESCRITURAS_VERSIONADAS.labels(nombre, "conflicto").inc()
+            if intento < settings.REQ_CONFLICTO_REINTENTOS:
+                espera = settings.REQ_CONFLICTO_ESPERA_MS * (2 ** intento) / 1000
+                await asyncio.sleep(random.uniform(0, espera))
+            continue
+
+        REQUERIMIENTOS_ESCRITURAS_VERSIONADAS.labels(nombre, "ok").inc()
+        return requerimiento, resultado
+
+    REQUERIMIENTOS_ESCRITURAS_VERSIONADAS.labels(nombre, "agotado").inc()
+    raise ConflictException(
+        f"El requerimiento {requerimiento_id} está siendo modificado por otros usuarios; reintente"
+    )
@@ -0,0 +1,200 @@
+"""
+Detección de incidentes casi duplicados con MinHash + LSH en memoria.
+
+Cada incidente abierto se resume en una firma de PERMUTACIONES enteros
+calculada sobre los 5-gramas de caracteres de título + descripción
+(normalizados sin acentos ni palabras vacías). La firma se parte en BANDAS
+de FILAS valores: dos incidentes que comparten alguna banda completa son
+candidatos, y entre ellos se estima la similitud de Jaccard comparando las
+firmas. Así una consulta cuesta O(largo del texto) y no depende de cuántos
+incidentes haya abiertos.
+
+La firma usa "one permutation hashing" (un solo hash por 5-grama, repartido
+en cubetas) en lugar de PERMUTACIONES funciones de hash, para que firmar una
+descripción larga siga por debajo del milisegundo.
+
+El índice vive en el proceso: se reconstruye desde MongoDB al iniciar y
+periódicamente (así incorpora lo creado por otros workers) y entre medio se
+actualiza en cada alta, resolución y reapertura.
+"""
+import re
+from array import array
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from app.services.busqueda import sin_acentos, PALABRAS_VACIAS
+
+BANDAS = 16
+FILAS = 4
+PERMUTACIONES = BANDAS * FILAS  # Con 16x4 el punto de corte del LSH queda en Jaccard ~0.5
+LARGO_TEJA = 5
+
+_MASCARA = (1 << 64) - 1
+_VACIO = _MASCARA
+# Separa los valores prestados al densificar cubetas vacías
+_DESPLAZAMIENTO = 0x9E3779B97F4A7C15
+
+
+class _Entrada(NamedTuple):
+    solicitante_id: int
+    tipo_servicio: Optional[str]
+    firma: array
+    claves: Tuple[int, ...]
+
+
+class Coincidencia(NamedTuple):
+    id: int
+    similitud: float
+    ambito: str  # "solicitante" o "servicio"
+
+
+def _normalizar(texto: str) -> str:
+    palabras = re.findall(r"\w+", sin_acentos(texto))
+    return " ".join(p for p in palabras if p not in PALABRAS_VACIAS)
+
+
+def firmar(texto: str) -> Optional[array]:
+    """Firma MinHash del texto, o None si es demasiado corto para comparar"""
+    normalizado = _normalizar(texto)
+    if len(normalizado) < LARGO_TEJA:
+        return None
+
+    minimos = [_VACIO] * PERMUTACIONES
+    for i in range(len(normalizado) - LARGO_TEJA + 1):
+        h = hash(normalizado[i:i + LARGO_TEJA]) & _MASCARA
+        cubeta = h % PERMUTACIONES
+        if h < minimos[cubeta]:
+            minimos[cubeta] = h
+
+    # Densificación: una cubeta vacía toma el valor de la siguiente ocupada
+    firma = array("Q", minimos)
+    for i, valor in enumerate(minimos):
+        if valor != _VACIO:
+            continue
+        j, salto = (i + 1) % PERMUTACIONES, 1
+        while minimos[j] == _VACIO:
+            j, salto = (j + 1) % PERMUTACIONES, salto + 1
+        firma[i] = (minimos[j] + salto * _DESPLAZAMIENTO) & _MASCARA
+    return firma
+
+
+def similitud(a: array, b: array) -> float:
+    """Estimación de la similitud de Jaccard entre dos firmas"""
+    return sum(x == y for x, y in zip(a, b)) / PERMUTACIONES
+
+
+def _claves(firma: array) -> Tuple[int, ...]:
+    return tuple(
+        hash((banda, firma[banda * FILAS:(banda + 1) * FILAS].tobytes()))
+        for banda in range(BANDAS)
+    )
+
+
+class IndiceDuplicados:
+    """Índice LSH de los incidentes abiertos (uno por proceso, ver contenedor.py)"""
+
+    def __init__(self, umbral: float = 0.6):
+        self.umbral = umbral
+        self._entradas: Dict[int, _Entrada] = {}
+        self._cubetas: Dict[int, Set[int]] = defaultdict(set)
+        # Altas y bajas ocurridas durante una reconstrucción (ver iniciar_reconstruccion)
+        self._pendientes: Optional[List[Tuple[str, tuple]]] = None
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def agregar(
+            self,
+            id: int,
+            firma: Optional[array],
+            solicitante_id: int,
+            tipo_servicio: Optional[str] = None
+    ) -> None:
+        if self._pendientes is not None:
+            self._pendientes.append(("agregar", (id, firma, solicitante_id, tipo_servicio)))
+        self._quitar(id)
+        if firma is None:
+            return
+        entrada = _Entrada(solicitante_id, tipo_servicio, firma, _claves(firma))
+        self._entradas[id] = entrada
+        for clave in entrada.claves:
+            self._cubetas[clave].add(id)
+
+    def quitar(self, id: int) -> None:
+        if self._pendientes is not None:
+            self._pendientes.append(("quitar", (id,)))
+        self._quitar(id)
+
+    def _quitar(self, id: int) -> None:
+        entrada = self._entradas.pop(id, None)
+        if entrada is None:
+            return
+        for clave in entrada.claves:
+            ids = self._cubetas.get(clave)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self._cubetas[clave]
+
+    def buscar(
+            self,
+            firma: Optional[array],
+            solicitante_id: int,
+            tipo_servicio: Optional[str] = None
+    ) -> Optional[Coincidencia]:
+        """
+        Incidente abierto más parecido del mismo solicitante o del mismo
+        servicio cuya similitud supera el umbral, o None.
+        """
+        if firma is None:
+            return None
+
+        candidatos: Set[int] = set()
+        for clave in _claves(firma):
+            ids = self._cubetas.get(clave)
+            if ids:
+                candidatos |= ids
+
+        mejor = None
+        for id in candidatos:
+            entrada = self._entradas[id]
+            if entrada.solicitante_id == solicitante_id:
+                ambito = "solicitante"
+            elif tipo_servicio is not None and entrada.tipo_servicio == tipo_servicio:
+                ambito = "servicio"
+            else:
+                continue
+
+            valor = similitud(firma, entrada.firma)
+            if valor >= self.umbral and (
+                    mejor is None or (valor, -id) > (mejor.similitud, -mejor.id)
+            ):
+                mejor = Coincidencia(id, valor, ambito)
+        return mejor
+
+    def iniciar_reconstruccion(self) -> "IndiceDuplicados":
+        """
+        Índice vacío para armar aparte desde la base. Hasta reemplazar() o
+        descartar_reconstruccion(), las altas y bajas que reciba este se
+        anotan para aplicarlas también al nuevo (el cursor pudo no verlas).
+        """
+        self._pendientes = []
+        return IndiceDuplicados(self.umbral)
+
+    def descartar_reconstruccion(self) -> None:
+        self._pendientes = None
+
+    def reemplazar(self, otro: "IndiceDuplicados") -> None:
+        """
+        Toma el contenido de un índice armado aparte (reconstrucción desde la
+        base), así las búsquedas concurrentes nunca ven uno a medio construir.
+        Antes le aplica lo anotado desde iniciar_reconstruccion().
+        """
+        for metodo, args in self._pendientes or ():
+            getattr(otro, metodo)(*args)
+        self._pendientes = None
+        self._entradas, self._cubetas = otro._entradas, otro._cubetas
+
+
+def texto_de(titulo: str, descripcion: str) -> str:
+    """Texto que se indexa de un incidente"""
+    return f"{titulo}\n{descripcion}"
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Optional
 from app.domain import Supervisor, Notificacion
 from app.services.exceptions import NotFoundException, UnauthorizedException
@@ -64,6 +65,27 @@ class NotificacionService:
 
         return notificaciones, total
 
+    async def listar_resumen(
+            self,
+            supervisor_id: int,
+            leida: Optional[bool] = None,
+            page: int = 0,
+            size: int = 20
+    ) -> tuple[List[dict], int, int]:
+        """
+        Listado de solo lectura para el endpoint: filas ya mapeadas a
+        NotificacionResponse y los totales salidos de un único contador.
+        El rol de supervisor ya lo verificó la dependencia de autenticación.
+
+        Returns:
+            tuple: (filas, total_filtrado, total_no_leidas)
+        """
+        filas, (total, no_leidas) = await asyncio.gather(
+            self.notif_repo.listar_resumen(supervisor_id, leida, page, size),
+            self.notif_repo.obtener_contadores(supervisor_id)
+        )
+        return filas, self.notif_repo.total_filtrado(total, no_leidas, leida), no_leidas
+
     async def marcar_como_leida(
             self,
             notificacion_id: int,
@@ -122,22 +144,8 @@ class NotificacionService:
         if not supervisor or not isinstance(supervisor, Supervisor):
             raise NotFoundException(f"Supervisor {supervisor_id} no encontrado")
 
-        # Obtener notificaciones no leídas
-        notificaciones_no_leidas = await self.notif_repo.buscar_por_supervisor(
-            supervisor_id=supervisor_id,
-            leida=False,
-            page=0,
-            size=1000  # Todas las no leídas
-        )
-
-        # Marcar cada una
-        contador = 0
-        for notificacion in notificaciones_no_leidas:
-            notificacion.marcar_como_leida()
-            self.notif_repo.guardar(notificacion)
-            contador += 1
-
-        return contador
+        # Un único update_many; el repositorio ajusta el contador de no leídas
+        return await self.notif_repo.marcar_todas_leidas(supervisor_id)
 
     async def obtener_resumen(
             self,
@@ -152,15 +160,8 @@ class NotificacionService:
         Returns:
             dict: Resumen con totales por tipo
         """
-        total_no_leidas = await self.notif_repo.contar_por_supervisor(
-            supervisor_id=supervisor_id,
-            leida=False
-        )
-
-        total_leidas = await self.notif_repo.contar_por_supervisor(
-            supervisor_id=supervisor_id,
-            leida=True
-        )
+        total, total_no_leidas = await self.notif_repo.obtener_contadores(supervisor_id)
+        total_leidas = total - total_no_leidas
 
         # Obtener últimas notificaciones
         ultimas = await self.notif_repo.buscar_por_supervisor(
@@ -1,29 +1,64 @@
 from app.repositories.requerimiento_repository import RequerimientoRepository
 from app.repositories.usuario_repository import UsuarioRepository
+import csv
+import io
 from datetime import datetime
+from typing import AsyncIterator, Optional
+import orjson
 from app.domain.enums import TipoEvento
+from app.infrastructure.cache import CacheLocal
+from app.infrastructure.mongodb.lecturas import sesion
+from app.repositories.requerimiento_repository import CAMPOS_EXPORTACION
+from app.config import settings
+
+# Única clave de la caché del dashboard de operador (es igual para todos)
+_DASHBOARD_OPERADOR = "operador"
+
+# Encabezados de la exportación ('_id' se publica como 'id')
+_COLUMNAS_EXPORTACION = ("id",) + CAMPOS_EXPORTACION[1:]
+# Una celda de texto que empieza así se evalúa como fórmula al abrir el CSV en una planilla
+_INICIOS_FORMULA = ("=", "+", "-", "@", "\t", "\r")
 
 
 class ReporteService:
-    def __init__(self, req_repo: RequerimientoRepository, user_repo: UsuarioRepository):
+    def __init__(
+            self,
+            req_repo: RequerimientoRepository,
+            user_repo: UsuarioRepository,
+            cache_dashboard: Optional[CacheLocal] = None
+    ):
         self.req_repo = req_repo
         self.user_repo = user_repo
+        # Solo por TTL (CACHE_DASHBOARD_TTL_SEGUNDOS): son agregados globales que
+        # cambian con cualquier escritura, invalidarlos por cambio los vaciaría siempre
+        self.cache_dashboard = cache_dashboard
 
     async def obtener_dashboard_operador(self):
+        if self.cache_dashboard is None:
+            return await self._calcular_dashboard_operador()
+
+        dashboard = self.cache_dashboard.obtener(_DASHBOARD_OPERADOR)
+        if dashboard is None:
+            version = self.cache_dashboard.version(_DASHBOARD_OPERADOR)
+            dashboard = await self._calcular_dashboard_operador()
+            self.cache_dashboard.guardar(_DASHBOARD_OPERADOR, dashboard, version)
+        return dashboard
+
+    async def _calcular_dashboard_operador(self):
         dist_estado = await self.req_repo.obtener_distribucion_estado()
         dist_urgencia = await self.req_repo.obtener_distribucion_urgencia()
         criticos = await self.req_repo.obtener_incidentes_criticos_pendientes()
         tecnicos = await self.user_repo.buscar_tecnicos()
         tecnicos_stats = []
         for tec in tecnicos:
-            asignados = await self.req_repo.collection.count_documents({
+            asignados = await self.req_repo.analitica.count_documents({
                 "tecnico_asignado_id": tec.id,
                 "estado": "ASIGNADO"
-            })
-            en_proceso = await self.req_repo.collection.count_documents({
+            }, session=sesion())
+            en_proceso = await self.req_repo.analitica.count_documents({
                 "tecnico_asignado_id": tec.id,
                 "estado": "EN_PROCESO"
-            })
+            }, session=sesion())
 
             total_activos = asignados + en_proceso
 
@@ -60,30 +95,33 @@ class ReporteService:
 
     async def obtener_dashboard_tecnico(self, tecnico_id: int):
         tecnico = await self.user_repo.buscar_por_id(tecnico_id)
-        total_resueltos = await self.req_repo.collection.count_documents(
-            {"tecnico_asignado_id": tecnico_id, "estado": "RESUELTO"})
+        total_resueltos = await self.req_repo.analitica.count_documents(
+            {"tecnico_asignado_id": tecnico_id, "estado": "RESUELTO"}, session=sesion())
 
-        asignados = await self.req_repo.collection.count_documents(
-            {"tecnico_asignado_id": tecnico_id})
+        asignados = await self.req_repo.analitica.count_documents(
+            {"tecnico_asignado_id": tecnico_id}, session=sesion())
 
-        en_proceso = await self.req_repo.collection.count_documents(
-            {"tecnico_asignado_id": tecnico_id, "estado": "EN_PROCESO"})
+        en_proceso = await self.req_repo.analitica.count_documents(
+            {"tecnico_asignado_id": tecnico_id, "estado": "EN_PROCESO"}, session=sesion())
 
         pendientes_docs, _ = await self.req_repo.buscar_con_filtros(
             {"tecnico_asignado_id": tecnico_id, "estado": {"$ne": "RESUELTO"}}, 0, 10)
 
+        # El listado ya trae el último evento de cada uno ($slice)
+        ultimos = {req.id: await req.eventos.ultimo() for req in pendientes_docs}
+
         interconsultas = []
         for req in pendientes_docs:
-            if req.eventos:
-                ultimo_evento = req.eventos[-1]
-                if ultimo_evento.get_tipo_evento() == TipoEvento.DERIVACION:
-                    interconsultas.append({
-                        "id": req.id,
-                        "titulo": req.titulo,
-                        "origen": ultimo_evento.tecnico_origen.nombre if hasattr(ultimo_evento,
-                                                                                 'tecnico_origen') else "Desconocido",
-                        "motivo": ultimo_evento.motivo if hasattr(ultimo_evento, 'motivo') else ""
-                    })
+            ultimo_evento = ultimos[req.id]
+            if ultimo_evento and ultimo_evento.get_tipo_evento() == TipoEvento.DERIVACION:
+                interconsultas.append({
+                    "id": req.id,
+                    "titulo": req.titulo,
+                    "tecnicoOrigen": ultimo_evento.tecnico_origen.nombre,
+                    "fechaDerivacion": ultimo_evento.fecha_hora,
+                    # Derivaciones guardadas antes de persistir el motivo no lo tienen
+                    "motivo": ultimo_evento.motivo or ""
+                })
 
         return {
             "tecnico": {
@@ -105,8 +143,58 @@ class ReporteService:
                     "urgencia": getattr(r, 'nivel_urgencia', None),
                     "prioridad": r.calcular_prioridad(),
                     "diasDesdeCreacion": r.get_dias_desde_creacion(),
-                    "ultimaActividad": r.eventos[-1].fecha_hora if r.eventos else r.fecha_creacion
+                    "ultimaActividad": ultimos[r.id].fecha_hora if ultimos[r.id] else r.fecha_creacion
                 } for r in pendientes_docs
             ],
             "interconsultas": interconsultas
-        }
\ No newline at end of file
+        }
+
+    async def exportar(
+            self,
+            formato: str,
+            desde: Optional[datetime] = None,
+            hasta: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Genera la exportación en bloques de EXPORT_FILAS_POR_BLOQUE filas a
+        medida que avanza el cursor, para un StreamingResponse.
+
+        Args:
+            formato: "csv" o "ndjson"
+        """
+        filas = self.req_repo.iterar_exportacion(desde, hasta, settings.EXPORT_BATCH_SIZE)
+        codificar = self._bloque_csv if formato == "csv" else self._bloque_ndjson
+        if formato == "csv":
+            yield self._bloque_csv([_COLUMNAS_EXPORTACION])
+
+        bloque = []
+        async for doc in filas:
+            bloque.append(tuple(doc.get(campo) for campo in CAMPOS_EXPORTACION))
+            if len(bloque) >= settings.EXPORT_FILAS_POR_BLOQUE:
+                yield codificar(bloque)
+                bloque = []
+        if bloque:
+            yield codificar(bloque)
+
+    @staticmethod
+    def _bloque_csv(filas) -> bytes:
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for fila in filas:
+            escritor.writerow(ReporteService._celda_csv(v) for v in fila)
+        return buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _celda_csv(valor):
+        if isinstance(valor, datetime):
+            return valor.isoformat()
+        if isinstance(valor, str) and valor.startswith(_INICIOS_FORMULA):
+            # Títulos, descripciones y nombres son texto libre: el apóstrofo lo fuerza a texto
+            return "'" + valor
+        return valor
+
+    @staticmethod
+    def _bloque_ndjson(filas) -> bytes:
+        return b"".join(
+            orjson.dumps(dict(zip(_COLUMNAS_EXPORTACION, fila))) + b"\n" for fila in filas
+        )
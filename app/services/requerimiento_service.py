@@ -1,18 +1,45 @@
-from typing import List, Optional
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable, List, NoReturn, Optional
 from app.domain import (
     Requerimiento, Incidente, Solicitud,
-    Solicitante, Operador, Tecnico,
+    Solicitante, Tecnico,
     EventoFactory, Notificador, Usuario
 )
 from app.domain.enums import (
     TipoRequerimiento, EstadoRequerimiento,
-    NivelUrgencia, CategoriaIncidente, CategoriaSolicitud, TipoEvento
+    NivelUrgencia, CategoriaIncidente, CategoriaSolicitud, TipoEvento, TipoServicio
 )
 from app.domain.exceptions import (
     EstadoInvalidoException,
     PermisosDenegadosException
 )
-from app.services.exceptions import NotFoundException, UnauthorizedException
+from app.services.exceptions import NotFoundException, UnauthorizedException, ConflictException
+from app.services import busqueda
+from app.services.duplicados import IndiceDuplicados, firmar, texto_de
+from app.services.tormentas import CorrelacionadorTormentas, Clave, clave_masivo
+from app.infrastructure.metricas import (
+    REQUERIMIENTOS_DUPLICADOS, INCIDENTES_MASIVOS, INCIDENTES_CORRELACIONADOS
+)
+
+
+async def rechazar_transicion(
+        req_repo,
+        requerimiento_id: int,
+        guarda: Callable[[Requerimiento], None]
+) -> NoReturn:
+    """
+    La escritura condicional de una transición no encontró el documento:
+    se relee y se vuelve a correr la guarda del dominio para levantar su
+    error. Si la guarda pasa, otro request lo modificó en el medio.
+    """
+    requerimiento = await req_repo.buscar_por_id(requerimiento_id)
+    if requerimiento is None:
+        raise NotFoundException(f"Requerimiento {requerimiento_id} no encontrado")
+    guarda(requerimiento)
+    raise ConflictException(
+        f"El requerimiento {requerimiento_id} cambió mientras se procesaba la operación"
+    )
 
 
 class RequerimientoService:
@@ -21,15 +48,26 @@ class RequerimientoService:
     Coordina operaciones de creación, consulta, resolución y reapertura.
     """
 
-    def __init__(self, requerimiento_repository, usuario_repository, notificador):
+    def __init__(
+            self,
+            requerimiento_repository,
+            usuario_repository,
+            notificador,
+            indice_duplicados: Optional[IndiceDuplicados] = None,
+            tormentas: Optional[CorrelacionadorTormentas] = None
+    ):
         """
         Args:
             requerimiento_repository: Repositorio de requerimientos
             usuario_repository: Repositorio de usuarios
+            indice_duplicados: Índice de incidentes abiertos (None = sin detección)
+            tormentas: Correlacionador de incidentes masivos (None = deshabilitado)
         """
         self.req_repo = requerimiento_repository
         self.usuario_repo = usuario_repository
         self.notificador = notificador
+        self.indice_duplicados = indice_duplicados
+        self.tormentas = tormentas
 
     # ========================================================================
     # Creación de Requerimientos
@@ -42,7 +80,8 @@ class RequerimientoService:
             titulo: str,
             descripcion: str,
             categoria: str,
-            nivel_urgencia: Optional[NivelUrgencia] = None
+            nivel_urgencia: Optional[NivelUrgencia] = None,
+            tipo_servicio: Optional[TipoServicio] = None
     ) -> Requerimiento:
         """
         Crea un nuevo requerimiento (incidente o solicitud).
@@ -54,9 +93,13 @@ class RequerimientoService:
             descripcion: Descripción detallada
             categoria: Categoría específica
             nivel_urgencia: Urgencia (solo para incidentes)
+            tipo_servicio: Servicio afectado (solo para incidentes, opcional)
 
         Returns:
-            Requerimiento: Requerimiento creado
+            Requerimiento: Requerimiento creado. Si es un incidente casi igual
+            a otro abierto del mismo solicitante o servicio, queda enlazado
+            en posible_duplicado_de. Si forma parte de una tormenta queda
+            colgado del incidente masivo (incidente_padre_id) y no notifica.
 
         Raises:
             NotFoundException: Si el solicitante no existe
@@ -71,6 +114,10 @@ class RequerimientoService:
         if tipo == TipoRequerimiento.INCIDENTE:
             if nivel_urgencia is None:
                 raise ValueError("nivel_urgencia es requerido para incidentes")
+            if tipo_servicio is not None and not any(
+                    s.tipo == tipo_servicio and s.activo for s in solicitante.servicios_suscritos
+            ):
+                raise ValueError(f"El solicitante no tiene activo el servicio {tipo_servicio.value}")
 
             requerimiento = Incidente(
                 id=None,
@@ -79,7 +126,8 @@ class RequerimientoService:
                 solicitante=solicitante,
                 nivel_urgencia=nivel_urgencia,
                 categoria=CategoriaIncidente[categoria],
-                estado=EstadoRequerimiento.NUEVO
+                estado=EstadoRequerimiento.NUEVO,
+                tipo_servicio=tipo_servicio
             )
 
         elif tipo == TipoRequerimiento.SOLICITUD:
@@ -95,6 +143,23 @@ class RequerimientoService:
         else:
             raise ValueError(f"Tipo de requerimiento inválido: {tipo}")
 
+        # Detección de duplicados: en memoria, antes de escribir nada
+        firma = None
+        if self.indice_duplicados is not None and isinstance(requerimiento, Incidente):
+            firma = firmar(texto_de(titulo, descripcion))
+            coincidencia = self.indice_duplicados.buscar(
+                firma, solicitante.id, tipo_servicio.value if tipo_servicio else None
+            )
+            if coincidencia is not None:
+                requerimiento.posible_duplicado_de = coincidencia.id
+                REQUERIMIENTOS_DUPLICADOS.labels(coincidencia.ambito).inc()
+
+        # Correlación de tormentas: los incidentes de una caída masiva cuelgan de un padre
+        if self.tormentas is not None and isinstance(requerimiento, Incidente) and tipo_servicio is not None:
+            requerimiento.incidente_padre_id = await self._correlacionar_tormenta(requerimiento)
+            if requerimiento.incidente_padre_id is not None:
+                INCIDENTES_CORRELACIONADOS.labels(tipo_servicio.value).inc()
+
         # Crear evento de creación
         evento = EventoFactory.crear_evento(
             tipo=TipoEvento.CREACION,
@@ -105,9 +170,14 @@ class RequerimientoService:
 
         # Guardar en repositorio
         requerimiento_guardado = await self.req_repo.guardar(requerimiento)
+        if firma is not None:
+            self.indice_duplicados.agregar(
+                requerimiento_guardado.id, firma, solicitante.id, tipo_servicio.value if tipo_servicio else None
+            )
 
-        # Notificar (si hay supervisores)
-        await self.notificador.notificar_evento(evento)
+        # Notificar (si hay supervisores). Los hijos de un masivo no: ya se notificó el padre
+        if getattr(requerimiento_guardado, "incidente_padre_id", None) is None:
+            await self.notificador.notificar_evento(evento)
 
         return requerimiento_guardado
 
@@ -134,7 +204,8 @@ class RequerimientoService:
             NotFoundException: Si no existe
             UnauthorizedException: Si no tiene permisos
         """
-        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id)
+        # El detalle muestra toda la historia: se trae en la misma lectura
+        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id, con_historia=True)
         if not requerimiento:
             raise NotFoundException(f"Requerimiento {requerimiento_id} no encontrado")
 
@@ -144,7 +215,7 @@ class RequerimientoService:
                 "No tiene permisos para ver este requerimiento"
             )
 
-        return requerimiento
+        return await self.req_repo.cargar_historia(requerimiento)
 
     async def listar_requerimientos(
             self,
@@ -167,43 +238,83 @@ class RequerimientoService:
         Returns:
             tuple: (lista_requerimientos, total_elementos)
         """
-        # Aplicar filtros según tipo de usuario
-        if isinstance(usuario_actual, Solicitante):
-            # Solicitantes solo ven sus propios requerimientos
-            requerimientos = await self.req_repo.buscar_por_solicitante(
-                solicitante_id=usuario_actual.id,
-                estado=estado,
-                tipo=tipo,
-                page=page,
-                size=size
-            )
+        # Solicitantes ven los propios, técnicos los asignados, el resto todos
+        filtros = self.req_repo.filtro_visibilidad(usuario_actual, estado, tipo)
+        return await self.req_repo.buscar_con_filtros(filtros, page, size)
 
-        elif isinstance(usuario_actual, Tecnico):
-            # Técnicos solo ven requerimientos asignados a ellos
-            requerimientos = await self.req_repo.buscar_por_tecnico(
-                tecnico_id=usuario_actual.id,
-                estado=estado,
-                tipo=tipo,
-                page=page,
-                size=size
-            )
+    async def listar_resumen(
+            self,
+            usuario_actual: Usuario,
+            estado: Optional[EstadoRequerimiento] = None,
+            tipo: Optional[TipoRequerimiento] = None,
+            page: int = 0,
+            size: int = 20
+    ) -> tuple[List[dict], int]:
+        """
+        Igual que listar_requerimientos pero de solo lectura: devuelve las filas
+        ya mapeadas a RequerimientoListaResponse, sin reconstruir entidades.
 
-        else:
-            # Operadores y Supervisores ven todos
-            requerimientos = await self.req_repo.buscar_todos(
-                estado=estado,
-                tipo=tipo,
-                page=page,
-                size=size
-            )
+        Returns:
+            tuple: (filas, total_elementos)
+        """
+        filtros = self.req_repo.filtro_visibilidad(usuario_actual, estado, tipo)
+        return await self.req_repo.listar_resumen(filtros, page, size)
+
+    async def buscar(
+            self,
+            usuario_actual: Usuario,
+            q: str,
+            cursor: Optional[str] = None,
+            size: int = 20
+    ) -> tuple[List[dict], Optional[str]]:
+        """
+        Búsqueda de texto en título, descripción y comentarios, limitada a los
+        requerimientos que el usuario puede ver.
 
-        total = self.req_repo.contar(
-            usuario=usuario_actual,
-            estado=estado,
-            tipo=tipo
+        Args:
+            usuario_actual: Usuario que realiza la consulta
+            q: Texto a buscar (sintaxis de $text: "frase", -excluido)
+            cursor: Cursor devuelto por la página anterior (opcional)
+            size: Tamaño de página
+
+        Returns:
+            tuple: (resultados con fragmentos resaltados, cursor siguiente o None)
+
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        despues_de = busqueda.decodificar_cursor(cursor) if cursor else None
+        raices = busqueda.terminos(q)
+
+        docs, hay_mas = await self.req_repo.buscar_texto(
+            q,
+            self.req_repo.filtro_visibilidad(usuario_actual),
+            size,
+            despues_de=despues_de,
+            patron_comentarios=busqueda.patron_mongo(raices)
         )
 
-        return requerimientos, total
+        resultados = [
+            {
+                "id": doc["_id"],
+                "tipo": doc["tipo"],
+                "titulo": doc["titulo"],
+                "estado": doc["estado"],
+                "fecha_creacion": doc["fecha_creacion"],
+                "score": doc["score"],
+                "fragmentos": busqueda.fragmentos(
+                    [("titulo", doc["titulo"]), ("descripcion", doc.get("descripcion"))]
+                    + [("comentario", texto) for texto in doc.get("comentarios", [])],
+                    raices
+                )
+            }
+            for doc in docs
+        ]
+
+        siguiente = None
+        if hay_mas and docs:
+            siguiente = busqueda.codificar_cursor(docs[-1]["score"], docs[-1]["_id"])
+        return resultados, siguiente
 
     async def obtener_requerimientos_priorizados(
             self,
@@ -257,56 +368,62 @@ class RequerimientoService:
             UnauthorizedException: Si no tiene permisos
             EstadoInvalidoException: Si el estado no permite resolución
         """
-        # Obtener requerimiento
-        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id)
-        if not requerimiento:
-            raise NotFoundException(f"Requerimiento {requerimiento_id} no encontrado")
-
         # Obtener técnico
         tecnico = await self.usuario_repo.buscar_por_id(tecnico_id)
         if not tecnico or not isinstance(tecnico, Tecnico):
             raise NotFoundException(f"Técnico {tecnico_id} no encontrado")
 
-        # Agregar comentario si se proporciona
+        # Comentario y eventos viajan en la misma escritura condicional
+        eventos = []
+        comentarios = []
         if comentario_resolucion:
             from app.domain import Comentario
-            comentario_id = await self.req_repo.siguiente_id_comentario()
             comentario = Comentario(
-                id=comentario_id,
+                id=await self.req_repo.siguiente_id_comentario(),
                 texto=comentario_resolucion,
                 autor=tecnico,
-                requerimiento=requerimiento
+                requerimiento=None
             )
-            requerimiento.agregar_comentario(comentario)
-
-            # Evento de comentario
-            evento_comentario = EventoFactory.crear_evento(
+            comentarios.append(comentario)
+            eventos.append(EventoFactory.crear_evento(
                 tipo=TipoEvento.COMENTARIO,
-                requerimiento=requerimiento,
+                requerimiento=None,
                 responsable=tecnico,
                 comentario=comentario
-            )
-            requerimiento.agregar_evento(evento_comentario)
-            await self.notificador.notificar_evento(evento_comentario)
-
-        # Resolver requerimiento (validaciones en el dominio)
-        requerimiento.resolver(tecnico)
+            ))
 
-        # Crear evento de resolución
         evento = EventoFactory.crear_evento(
             tipo=TipoEvento.RESOLUCION,
-            requerimiento=requerimiento,
+            requerimiento=None,
             responsable=tecnico
         )
-        requerimiento.agregar_evento(evento)
+        eventos.append(evento)
 
-        # Guardar
-        requerimiento_actualizado = await self.req_repo.guardar(requerimiento)
+        # Resolver: guardas del dominio aplicadas como filtro de la actualización
+        requerimiento = await self.req_repo.resolver(
+            requerimiento_id, tecnico, evento.fecha_hora, eventos, comentarios
+        )
+        if requerimiento is None:
+            await rechazar_transicion(self.req_repo, requerimiento_id, lambda r: r.resolver(tecnico))
+
+        if self.indice_duplicados is not None:
+            self.indice_duplicados.quitar(requerimiento_id)
+        if getattr(requerimiento, "es_masivo", False):
+            # Resolver el masivo cierra la tormenta y todos sus hijos
+            hijos = await self.req_repo.resolver_hijos(requerimiento_id, requerimiento.fecha_resolucion)
+            if self.indice_duplicados is not None:
+                for hijo_id in hijos:
+                    self.indice_duplicados.quitar(hijo_id)
+            if self.tormentas is not None and requerimiento.tipo_servicio:
+                self.tormentas.olvidar_padre((requerimiento.tipo_servicio.value, requerimiento.categoria.value))
 
         # Notificar
-        await self.notificador.notificar_evento(evento)
+        for e in eventos:
+            e.requerimiento = requerimiento
+            await self.notificador.notificar_evento(e)
 
-        return requerimiento_actualizado
+        # La respuesta incluye la historia completa
+        return await self.req_repo.cargar_historia(requerimiento)
 
     async def reabrir_requerimiento(
             self,
@@ -329,32 +446,152 @@ class RequerimientoService:
             NotFoundException: Si no existe
             EstadoInvalidoException: Si no está resuelto
         """
-        # Obtener requerimiento
-        requerimiento = await self.req_repo.buscar_por_id(requerimiento_id)
-        if not requerimiento:
-            raise NotFoundException(f"Requerimiento {requerimiento_id} no encontrado")
+        # Si ya fue archivado vuelve a la colección activa antes de reabrirlo
+        await self.req_repo.restaurar_desde_archivo(requerimiento_id)
 
         # Obtener usuario
         usuario = await self.usuario_repo.buscar_por_id(usuario_id)
         if not usuario:
             raise NotFoundException(f"Usuario {usuario_id} no encontrado")
 
-        # Reabrir (validaciones en el dominio)
-        requerimiento.reabrir(usuario, motivo)
-
-        # Crear evento
+        Requerimiento.validar_motivo_reapertura(motivo)
         evento = EventoFactory.crear_evento(
             tipo=TipoEvento.REAPERTURA,
-            requerimiento=requerimiento,
+            requerimiento=None,
             responsable=usuario,
             motivo=motivo
         )
-        requerimiento.agregar_evento(evento)
 
-        # Guardar
-        requerimiento_actualizado = await self.req_repo.guardar(requerimiento)
+        # Reabrir: guardas del dominio aplicadas como filtro de la actualización
+        requerimiento = await self.req_repo.reabrir(requerimiento_id, evento)
+        if requerimiento is None:
+            await rechazar_transicion(self.req_repo, requerimiento_id, lambda r: r.reabrir(usuario, motivo))
+        self._indexar_incidente(requerimiento)
 
         # Notificar
+        evento.requerimiento = requerimiento
+        await self.notificador.notificar_evento(evento)
+
+        # La respuesta incluye la historia completa
+        return await self.req_repo.cargar_historia(requerimiento)
+
+    # ========================================================================
+    # Tormentas de incidentes
+    # ========================================================================
+
+    async def _correlacionar_tormenta(self, incidente: Incidente) -> Optional[int]:
+        """
+        Registra el incidente en la ventana de su (servicio, categoría) y
+        devuelve el ID del masivo abierto del que debe colgar, abriéndolo si
+        la ventana alcanzó el umbral. None si no hay tormenta en curso.
+        """
+        clave: Clave = (incidente.tipo_servicio.value, incidente.categoria.value)
+        cantidad = self.tormentas.registrar(clave)
+
+        padre_id, vigente = self.tormentas.padre(clave)
+        if vigente:
+            return padre_id
+        if padre_id is None and cantidad < self.tormentas.umbral:
+            return None
+
+        async with self.tormentas.bloqueo(clave):
+            # Otro request pudo confirmarlo o abrirlo mientras se esperaba
+            padre_id, vigente = self.tormentas.padre(clave)
+            if vigente:
+                return padre_id
+
+            padre_id = await self.req_repo.buscar_masivo_abierto(clave_masivo(clave))
+            if padre_id is None and cantidad >= self.tormentas.umbral:
+                padre_id = await self._abrir_masivo(incidente, cantidad)
+
+            if padre_id is None:
+                self.tormentas.olvidar_padre(clave)
+            else:
+                self.tormentas.fijar_padre(clave, padre_id)
+            return padre_id
+
+    async def _abrir_masivo(self, incidente: Incidente, cantidad: int) -> int:
+        """Crea el padre, le cuelga los incidentes sueltos de la ventana y notifica una sola vez"""
+        tipo_servicio, categoria = incidente.tipo_servicio.value, incidente.categoria.value
+        ventana = self.tormentas.ventana_segundos
+
+        padre = Incidente(
+            id=None,
+            titulo=f"Incidente masivo: {tipo_servicio} / {categoria}",
+            descripcion=(
+                f"Abierto automáticamente: {cantidad} incidentes de {tipo_servicio} "
+                f"({categoria}) en los últimos {ventana} segundos"
+            ),
+            solicitante=incidente.solicitante,
+            nivel_urgencia=NivelUrgencia.CRITICO,
+            categoria=incidente.categoria,
+            tipo_servicio=incidente.tipo_servicio
+        )
+        padre.es_masivo = True
+        evento = EventoFactory.crear_evento(
+            tipo=TipoEvento.CREACION,
+            requerimiento=padre,
+            responsable=incidente.solicitante
+        )
+        padre.agregar_evento(evento)
+
+        padre_id = await self.req_repo.crear_masivo(padre)
+        if padre_id != padre.id:
+            # Lo abrió otro worker: ya adjuntó y notificó él
+            return padre_id
+
+        adjuntados = await self.req_repo.adjuntar_a_masivo(
+            padre_id, tipo_servicio, categoria, datetime.now() - timedelta(seconds=ventana)
+        )
+        INCIDENTES_MASIVOS.labels(tipo_servicio).inc()
+        INCIDENTES_CORRELACIONADOS.labels(tipo_servicio).inc(adjuntados)
         await self.notificador.notificar_evento(evento)
+        return padre_id
 
-        return requerimiento_actualizado
\ No newline at end of file
+    # ========================================================================
+    # Índice de duplicados
+    # ========================================================================
+
+    def _indexar_incidente(self, requerimiento: Requerimiento) -> None:
+        if self.indice_duplicados is None or not isinstance(requerimiento, Incidente):
+            return
+        self.indice_duplicados.agregar(
+            requerimiento.id,
+            firmar(texto_de(requerimiento.titulo, requerimiento.descripcion)),
+            requerimiento.solicitante.id,
+            requerimiento.tipo_servicio.value if requerimiento.tipo_servicio else None
+        )
+
+    async def reconstruir_indice_duplicados(self, lote: int = 500) -> int:
+        """
+        Vuelve a armar el índice de duplicados con los incidentes abiertos.
+        Se ejecuta al iniciar y periódicamente: recoge lo creado o resuelto
+        por otros workers. Cede el event loop cada 'lote' documentos.
+
+        Returns:
+            int: Cantidad de incidentes indexados
+        """
+        if self.indice_duplicados is None:
+            return 0
+
+        # Las altas y reaperturas concurrentes van al índice actual, que las
+        # anota y las reaplica sobre el nuevo al reemplazarlo
+        nuevo = self.indice_duplicados.iniciar_reconstruccion()
+        cantidad = 0
+        try:
+            async for doc in self.req_repo.iterar_incidentes_abiertos():
+                nuevo.agregar(
+                    doc["_id"],
+                    firmar(texto_de(doc["titulo"], doc["descripcion"])),
+                    doc["solicitante_id"],
+                    doc.get("tipo_servicio")
+                )
+                cantidad += 1
+                if cantidad % lote == 0:
+                    await asyncio.sleep(0)
+        except BaseException:
+            self.indice_duplicados.descartar_reconstruccion()
+            raise
+
+        self.indice_duplicados.reemplazar(nuevo)
+        return cantidad
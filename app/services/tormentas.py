@@ -0,0 +1,96 @@
+"""
+Correlación de tormentas de incidentes.
+
+Durante una caída masiva llegan miles de incidentes iguales para el mismo
+(tipo de servicio, categoría). Cada alta alimenta una ventana deslizante de
+esa clave; cuando la cantidad en la ventana alcanza el umbral se abre un
+incidente "masivo" (padre) y los incidentes de la clave pasan a ser hijos
+suyos: el operador asigna y resuelve el padre y el cambio se aplica en
+bloque a los hijos, que además no generan notificaciones propias.
+
+El conteo es por proceso. El padre abierto de cada clave es único en toda
+la base (índice único disperso sobre 'masivo_clave'), así que si varios
+workers cruzan el umbral a la vez todos terminan usando el mismo.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+Clave = Tuple[str, str]  # (tipo_servicio, categoria)
+
+
+def clave_masivo(clave: Clave) -> str:
+    """Valor persistido en 'masivo_clave' del padre mientras está abierto"""
+    return f"{clave[0]}:{clave[1]}"
+
+
+class VentanaDeslizante:
+    """Cuenta eventos de los últimos 'segundos' agrupados en cubetas de un segundo"""
+
+    __slots__ = ("segundos", "_cubetas", "_total")
+
+    def __init__(self, segundos: int):
+        self.segundos = segundos
+        self._cubetas: Deque[List[int]] = deque()  # [segundo, cantidad]
+        self._total = 0
+
+    def registrar(self, ahora: float) -> int:
+        """Suma un evento y devuelve el total dentro de la ventana"""
+        segundo = int(ahora)
+        self._expirar(segundo)
+        if self._cubetas and self._cubetas[-1][0] == segundo:
+            self._cubetas[-1][1] += 1
+        else:
+            self._cubetas.append([segundo, 1])
+        self._total += 1
+        return self._total
+
+    def _expirar(self, segundo: int) -> None:
+        limite = segundo - self.segundos
+        while self._cubetas and self._cubetas[0][0] <= limite:
+            self._total -= self._cubetas.popleft()[1]
+
+
+class CorrelacionadorTormentas:
+    """
+    Estado en memoria de las tormentas: una ventana por clave y el padre
+    abierto conocido de cada una. El padre cacheado se vuelve a confirmar
+    contra la base cada 'verificacion_segundos' (otro worker pudo resolverlo).
+    """
+
+    def __init__(self, umbral: int, ventana_segundos: int, verificacion_segundos: int = 30):
+        self.umbral = umbral
+        self.ventana_segundos = ventana_segundos
+        self.verificacion_segundos = verificacion_segundos
+        self._ventanas: Dict[Clave, VentanaDeslizante] = {}
+        self._padres: Dict[Clave, Tuple[int, float]] = {}  # clave -> (id, verificado_en)
+        self._bloqueos: Dict[Clave, asyncio.Lock] = {}
+
+    def registrar(self, clave: Clave, ahora: Optional[float] = None) -> int:
+        """Registra un incidente de la clave y devuelve cuántos hay en la ventana"""
+        ventana = self._ventanas.get(clave)
+        if ventana is None:
+            ventana = self._ventanas[clave] = VentanaDeslizante(self.ventana_segundos)
+        return ventana.registrar(time.monotonic() if ahora is None else ahora)
+
+    def padre(self, clave: Clave, ahora: Optional[float] = None) -> Tuple[Optional[int], bool]:
+        """(id del padre cacheado, si sigue vigente sin volver a consultar la base)"""
+        entrada = self._padres.get(clave)
+        if entrada is None:
+            return None, False
+        ahora = time.monotonic() if ahora is None else ahora
+        return entrada[0], ahora - entrada[1] < self.verificacion_segundos
+
+    def fijar_padre(self, clave: Clave, id: int, ahora: Optional[float] = None) -> None:
+        self._padres[clave] = (id, time.monotonic() if ahora is None else ahora)
+
+    def olvidar_padre(self, clave: Clave) -> None:
+        self._padres.pop(clave, None)
+
+    def bloqueo(self, clave: Clave) -> asyncio.Lock:
+        """Serializa dentro del proceso la apertura del padre de una clave"""
+        bloqueo = self._bloqueos.get(clave)
+        if bloqueo is None:
+            bloqueo = self._bloqueos[clave] = asyncio.Lock()
+        return bloqueo
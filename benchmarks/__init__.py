@@ -0,0 +1,12 @@
+"""
+Micro-benchmarks de los caminos calientes por request (mapeo de
+repositorios, EventoFactory y modelos Pydantic de respuesta).
+
+    python -m benchmarks                       # medir todo
+    python -m benchmarks -k requerimiento      # filtrar por nombre
+    python -m benchmarks --guardar base.json   # fijar la línea base
+    python -m benchmarks --comparar base.json --umbral 0.15   # falla (exit 1) ante regresiones
+
+La línea base depende de la máquina: no se versiona, se genera y compara
+en el mismo entorno (por ejemplo, en el mismo runner de CI).
+"""
@@ -0,0 +1,42 @@
+import argparse
+import sys
+from typing import List, Optional
+from benchmarks import casos  # noqa: F401  (registra los casos)
+from benchmarks.nucleo import comparar, ejecutar, guardar_linea_base
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Micro-benchmarks de caminos calientes")
+    parser.add_argument("-k", "--filtro", help="Solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--tiempo-min", type=float, default=0.1, help="Segundos mínimos por repetición")
+    # Sin ruta por defecto: la línea base es de la máquina donde se midió
+    parser.add_argument("--guardar", metavar="RUTA", help="Guardar como línea base")
+    parser.add_argument("--comparar", metavar="RUTA", help="Comparar contra una línea base generada con --guardar")
+    parser.add_argument("--umbral", type=float, default=0.20, help="Regresión tolerada (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    mediciones = []
+    print(f"{'caso':<56}{'µs/op':>12}{'mediana':>12}{'iter':>9}")
+    for m in ejecutar(args.filtro, args.repeticiones, args.tiempo_min):
+        mediciones.append(m)
+        print(f"{m.nombre:<56}{m.por_op_us:>12.2f}{m.mediana_us:>12.2f}{m.iteraciones:>9}")
+
+    if args.guardar:
+        guardar_linea_base(mediciones, args.guardar)
+        print(f"\nLínea base guardada en {args.guardar}")
+
+    if args.comparar:
+        regresiones = comparar(mediciones, args.comparar, args.umbral)
+        if regresiones:
+            print(f"\n❌ Regresiones por encima de {args.umbral:.0%}:", file=sys.stderr)
+            for nombre, antes, ahora, variacion in regresiones:
+                print(f"  {nombre}: {antes:.2f} -> {ahora:.2f} µs/op (+{variacion:.0%})", file=sys.stderr)
+            return 1
+        print(f"\n✅ Sin regresiones por encima de {args.umbral:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
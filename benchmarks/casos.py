@@ -0,0 +1,241 @@
+"""
+Casos medidos: mapeo entidad <-> documento de los repositorios, carga
+perezosa del historial, EventoFactory y validación/serialización de los
+modelos de respuesta de app/schemas.
+"""
+from datetime import datetime
+from app.domain import EventoFactory
+from app.domain.enums import TipoEvento
+from app.infrastructure.respuestas import respuesta_directa
+from app.repositories.requerimiento_repository import RequerimientoRepository
+from app.repositories.usuario_repository import UsuarioRepository
+from app.repositories.notificacion_repository import NotificacionRepository
+from app.schemas.requerimiento import RequerimientoResponse, RequerimientoListaResponse, PaginatedResponse
+from app.schemas.notificacion import NotificacionResponse
+from app.services.duplicados import IndiceDuplicados, firmar, texto_de
+from benchmarks import datos
+from benchmarks.nucleo import caso
+
+
+# ============================================================================
+# RequerimientoRepository
+# ============================================================================
+
+def _repo_requerimientos() -> RequerimientoRepository:
+    req = datos.requerimiento(0)
+    usuarios = datos.UsuariosEnMemoria(req.solicitante, datos.operador(), datos.tecnico())
+    return RequerimientoRepository(datos.base_de_datos(), usuarios)
+
+
+def _repo_con_historia(eventos: int):
+    """
+    Repositorio cuya historia bajo demanda sale de un documento en memoria
+    ($slice simulado), para medir la carga perezosa sin MongoDB.
+    """
+    repo = _repo_requerimientos()
+    doc = repo._to_document_con_historia(datos.requerimiento(eventos))
+
+    async def cargar_historia(id, campo, n):
+        return doc[campo] if n is None else doc[campo][-n:]
+    repo._cargar_historia = cargar_historia
+    sin_historia = {k: v for k, v in doc.items() if k not in ("comentarios", "eventos")}
+    return repo, doc, sin_historia
+
+
+@caso("requerimiento_repo._to_document")
+def to_document():
+    # Cada actualización en guardar: solo campos planos, la historia va con $push
+    repo = _repo_requerimientos()
+    req = datos.requerimiento(2)
+    return lambda: repo._to_document(req)
+
+
+@caso("requerimiento_repo._to_entity")
+def to_entity():
+    # La historia viene en el documento pero queda cruda hasta pedirla,
+    # así que el costo no depende de su tamaño
+    repo, doc, _ = _repo_con_historia(50)
+
+    async def mapear():
+        await repo._to_entity(doc)
+    return mapear
+
+
+for _eventos in datos.TAMANIOS_HISTORIAL:
+    def _registrar(eventos=_eventos):
+        @caso(f"requerimiento_repo._to_document_con_historia[eventos={eventos}]")
+        def to_document_con_historia():
+            # Alta en guardar: campos planos más comentarios y eventos
+            repo = _repo_requerimientos()
+            req = datos.requerimiento(eventos)
+            return lambda: repo._to_document_con_historia(req)
+
+        @caso(f"requerimiento_repo.historia.cargar[eventos={eventos}]")
+        def historia_cargar():
+            # Detalle: sin historia en la lectura, se trae y construye completa
+            repo, _, sin_historia = _repo_con_historia(eventos)
+
+            async def cargar():
+                req = await repo._to_entity(sin_historia)
+                await repo.cargar_historia(req)
+            return cargar
+
+        @caso(f"requerimiento_repo.eventos.ultimo[eventos={eventos}]")
+        def eventos_ultimo():
+            # Transiciones y notificaciones: solo el último evento ($slice: -1)
+            repo, _, sin_historia = _repo_con_historia(eventos)
+
+            async def ultimo():
+                req = await repo._to_entity(sin_historia)
+                await req.eventos.ultimo()
+            return ultimo
+
+        @caso(f"RequerimientoResponse[eventos={eventos}]")
+        def respuesta():
+            # Validación + JSON, lo mismo que hace FastAPI con response_model
+            req = datos.requerimiento(eventos, con_comentarios=False)
+            return lambda: RequerimientoResponse.model_validate(req).model_dump_json()
+
+    _registrar()
+
+
+@caso("RequerimientoListaResponse")
+def lista_respuesta():
+    req = datos.requerimiento(2)
+    return lambda: RequerimientoListaResponse.model_validate(req).model_dump_json()
+
+
+@caso("listado_requerimientos[directo, 20 filas]")
+def listado_directo():
+    # Camino rápido de GET /requerimientos: documento -> fila -> orjson
+    req = datos.requerimiento(2)
+    doc = _repo_requerimientos()._to_document(req)
+    usuarios = {u.id: {"id": u.id, "nombre": u.nombre, "email": str(u.email)}
+                for u in (req.solicitante, req.tecnico_asignado)}
+    esquema = PaginatedResponse[RequerimientoListaResponse]
+
+    def listar():
+        ahora = datetime.now()
+        filas = [RequerimientoRepository._to_resumen(doc, usuarios, ahora) for _ in range(20)]
+        respuesta_directa({"content": filas, "page": 0, "size": 20, "total_elements": 20,
+                           "total_pages": 1, "is_first": True, "is_last": True}, esquema)
+    return listar
+
+
+@caso("atributos.Incidente[x10]")
+def atributos_incidente():
+    req = datos.requerimiento(0)
+
+    def leer():
+        for _ in range(10):
+            req.id, req.titulo, req.estado, req.solicitante, req.nivel_urgencia, req.fecha_creacion
+    return leer
+
+
+@caso("duplicados.firmar+buscar[10000 abiertos]")
+def duplicados_buscar():
+    # Lo que agrega crear_requerimiento a cada alta de incidente
+    indice = IndiceDuplicados()
+    for i in range(10000):
+        indice.agregar(i, firmar(texto_de(f"Incidente {i}", f"Falla número {i} en el nodo {i % 97} del barrio {i % 13}")), i)
+    req = datos.requerimiento(0)
+    texto = texto_de(req.titulo, req.descripcion)
+    return lambda: indice.buscar(firmar(texto), req.solicitante.id)
+
+
+# ============================================================================
+# UsuarioRepository
+# ============================================================================
+
+def _documentos_usuario() -> dict:
+    repo = UsuarioRepository(datos.base_de_datos())
+    sol = datos.solicitante()
+    doc_sol = repo._to_document(sol)
+    doc_sol["servicios_data"] = [{
+        "_id": s.id, "tipo": s.tipo.value, "numero_servicio": s.numero_servicio,
+        "activo": s.activo, "fecha_alta": s.fecha_alta
+    } for s in sol.servicios_suscritos]
+    return {
+        "solicitante": doc_sol,
+        "tecnico": repo._to_document(datos.tecnico()),
+        "supervisor": repo._to_document(datos.supervisor()),
+    }
+
+
+for _rol in ("solicitante", "tecnico", "supervisor"):
+    def _registrar(rol=_rol):
+        @caso(f"usuario_repo._to_entity[{rol}]")
+        def to_entity():
+            repo = UsuarioRepository(datos.base_de_datos())
+            doc = _documentos_usuario()[rol]
+
+            async def mapear():
+                await repo._to_entity(doc)
+            return mapear
+
+    _registrar()
+
+
+# ============================================================================
+# Notificaciones
+# ============================================================================
+
+def _documento_notificacion() -> dict:
+    notif = datos.notificacion()
+    req = notif.evento.requerimiento
+    return {
+        "_id": notif.id,
+        "leida": False,
+        "supervisor_id": notif.supervisor.id,
+        "fecha_creacion": notif.fecha_hora_generada,
+        "fecha_lectura": None,
+        "evento": {
+            "tipo": notif.evento.get_tipo_evento().value,
+            "descripcion": notif.evento.descripcion,
+            "fecha_hora": notif.evento.fecha_hora,
+            "responsable": {"id": notif.evento.responsable.id, "nombre": notif.evento.responsable.nombre},
+            "requerimiento": {
+                "id": req.id, "titulo": req.titulo, "tipo": req.get_tipo().value,
+                "nivel_urgencia": req.nivel_urgencia.value
+            }
+        }
+    }
+
+
+@caso("notificacion_repo._to_entity")
+def notificacion_to_entity():
+    repo = NotificacionRepository(datos.base_de_datos(), None)
+    doc = _documento_notificacion()
+
+    async def mapear():
+        await repo._to_entity(doc)
+    return mapear
+
+
+@caso("NotificacionResponse")
+def notificacion_respuesta():
+    notif = datos.notificacion()
+    return lambda: NotificacionResponse.model_validate(notif).model_dump_json()
+
+
+# ============================================================================
+# EventoFactory
+# ============================================================================
+
+@caso("EventoFactory.crear_evento[CREACION]")
+def evento_creacion():
+    req = datos.requerimiento(0)
+    return lambda: EventoFactory.crear_evento(TipoEvento.CREACION, req, req.solicitante)
+
+
+@caso("EventoFactory.crear_evento[ASIGNACION]")
+def evento_asignacion():
+    req, operador, tecnico = datos.requerimiento(0), datos.operador(), datos.tecnico()
+    return lambda: EventoFactory.crear_evento(TipoEvento.ASIGNACION, req, operador, tecnico_asignado=tecnico)
+
+
+@caso("EventoFactory.crear_evento[COMENTARIO]")
+def evento_comentario():
+    req = datos.requerimiento(3)
+    comentario = req.comentarios[0]
+    return lambda: EventoFactory.crear_evento(TipoEvento.COMENTARIO, req, comentario.autor, comentario=comentario)
@@ -0,0 +1,95 @@
+"""
+Datos de prueba realistas para los benchmarks: usuarios de cada rol y
+requerimientos con historiales de distinto tamaño.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.domain import (
+    Solicitante, Operador, Tecnico, Supervisor, Incidente, Comentario, Notificacion,
+    Servicio, Email, EventoFactory
+)
+from app.domain.enums import TipoEvento, NivelUrgencia, CategoriaIncidente, TipoServicio
+
+# Tamaños de historial medidos (eventos por requerimiento)
+TAMANIOS_HISTORIAL = (0, 50, 500)
+
+INICIO = datetime(2024, 3, 1, 9, 30)
+
+
+def base_de_datos():
+    """Base de Motor sin conexión: los repositorios solo la usan para nombrar colecciones"""
+    return AsyncIOMotorClient("mongodb://localhost:27017", connect=False)["benchmarks"]
+
+
+class UsuariosEnMemoria:
+    """Sustituye a UsuarioRepository en _to_entity para medir solo el mapeo"""
+
+    def __init__(self, *usuarios):
+        self.usuarios: Dict[int, object] = {u.id: u for u in usuarios}
+
+    async def buscar_por_id(self, id: int) -> Optional[object]:
+        return self.usuarios.get(id)
+
+
+def solicitante() -> Solicitante:
+    usuario = Solicitante(1, "Juan Perez", Email("juan.perez@gmail.com"), "hash", fecha_creacion=INICIO)
+    usuario.agregar_servicio(Servicio(1, TipoServicio.INTERNET_BANDA_ANCHA, "INT-55501", usuario, True, INICIO))
+    return usuario
+
+
+def operador() -> Operador:
+    return Operador(2, "Carlos Operador", Email("carlos@comunicarlos.com.ar"), "hash", fecha_creacion=INICIO)
+
+
+def tecnico() -> Tecnico:
+    return Tecnico(3, "Roberto Tecnico", Email("roberto@comunicarlos.com.ar"), "hash",
+                   especialidades=["INTERNET_BANDA_ANCHA"], fecha_creacion=INICIO)
+
+
+def supervisor() -> Supervisor:
+    return Supervisor(4, "Ana Supervisora", Email("ana@comunicarlos.com.ar"), "hash", fecha_creacion=INICIO)
+
+
+def requerimiento(eventos: int, con_comentarios: bool = True) -> Incidente:
+    """
+    Incidente asignado con 'eventos' entradas de historial. Después de la
+    creación y la asignación, el resto alterna comentarios del técnico.
+    """
+    sol, op, tec = solicitante(), operador(), tecnico()
+    req = Incidente(
+        id=1001,
+        titulo="Internet muy lento",
+        descripcion="La velocidad de descarga es menor a 1MB desde esta mañana.",
+        solicitante=sol,
+        nivel_urgencia=NivelUrgencia.IMPORTANTE,
+        categoria=CategoriaIncidente.SERVICIO_INACCESIBLE,
+        fecha_creacion=INICIO
+    )
+    if eventos == 0:
+        return req
+
+    req.agregar_evento(EventoFactory.crear_evento(TipoEvento.CREACION, req, sol, fecha_hora=INICIO))
+    req.asignar_tecnico(tec, op)
+    req.agregar_evento(EventoFactory.crear_evento(
+        TipoEvento.ASIGNACION, req, op, tecnico_asignado=tec, fecha_hora=INICIO + timedelta(minutes=5)
+    ))
+
+    for i in range(len(req.eventos), eventos):
+        momento = INICIO + timedelta(minutes=10 + i)
+        comentario = Comentario(i, f"Revisión {i}: se verificó el nodo y la señal.", tec, req, momento)
+        if con_comentarios:
+            req.comentarios.append(comentario)
+        req.agregar_evento(EventoFactory.crear_evento(
+            TipoEvento.COMENTARIO, req, tec, comentario=comentario, fecha_hora=momento
+        ))
+
+    for numero, evento in enumerate(req.eventos, start=1):
+        evento.id = numero
+    return req
+
+
+def notificacion() -> Notificacion:
+    req = requerimiento(0)
+    evento = EventoFactory.crear_evento(TipoEvento.CREACION, req, req.solicitante, fecha_hora=INICIO)
+    return Notificacion(77, evento, supervisor(), fecha_hora_generada=INICIO)
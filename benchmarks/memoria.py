@@ -0,0 +1,74 @@
+"""
+Memoria por entidad de dominio, medida con tracemalloc.
+
+    python -m benchmarks.memoria
+    python -m benchmarks.memoria --cantidad 50000
+
+Cada fila crea 'cantidad' instancias que comparten sus dependencias
+(solicitante, técnico, requerimiento) y reporta los bytes asignados por
+instancia, es decir lo que cuesta materializarlas en un listado.
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import timedelta
+from typing import Callable, List, Tuple
+from app.domain import Incidente, Comentario, Notificacion, Email, EventoFactory
+from app.domain.enums import TipoEvento, NivelUrgencia, CategoriaIncidente
+from benchmarks import datos
+
+
+def bytes_por_instancia(crear: Callable[[int], object], cantidad: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        instancias = [crear(i) for i in range(cantidad)]
+        despues = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del instancias
+    # Descuenta la propia lista que las contiene
+    return (despues - antes) / cantidad - 8
+
+
+def casos_memoria() -> List[Tuple[str, Callable[[int], object]]]:
+    req = datos.requerimiento(3)
+    sol, tec, op, sup = req.solicitante, datos.tecnico(), datos.operador(), datos.supervisor()
+    evento = req.eventos[0]
+
+    return [
+        ("Email", lambda i: Email(f"usuario{i}@comunicarlos.com.ar")),
+        ("Tecnico", lambda i: type(tec)(i, "Roberto Tecnico", tec.email, "hash", ["INTERNET_BANDA_ANCHA"],
+                                        fecha_creacion=datos.INICIO)),
+        ("Incidente", lambda i: Incidente(
+            i, "Internet muy lento", "La velocidad de descarga es menor a 1MB.", sol,
+            NivelUrgencia.IMPORTANTE, CategoriaIncidente.SERVICIO_INACCESIBLE, fecha_creacion=datos.INICIO
+        )),
+        ("Comentario", lambda i: Comentario(i, "Se verificó el nodo y la señal.", tec, req,
+                                            datos.INICIO + timedelta(minutes=i))),
+        ("EventoAsignacion", lambda i: EventoFactory.crear_evento(
+            TipoEvento.ASIGNACION, req, op, tecnico_asignado=tec, fecha_hora=datos.INICIO
+        )),
+        ("Notificacion", lambda i: Notificacion(i, evento, sup, fecha_hora_generada=datos.INICIO)),
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memoria")
+    parser.add_argument("--cantidad", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(f"{'entidad':<24}{'bytes/instancia':>18}")
+    for nombre, crear in casos_memoria():
+        print(f"{nombre:<24}{bytes_por_instancia(crear, args.cantidad):>18.1f}")
+
+    # Un requerimiento completo: entidad + historial + comentarios
+    for eventos in datos.TAMANIOS_HISTORIAL:
+        total = bytes_por_instancia(lambda i: datos.requerimiento(eventos), max(args.cantidad // max(eventos, 1) // 10, 5))
+        print(f"{f'requerimiento[eventos={eventos}]':<24}{total:>18.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""
+Núcleo del runner: registro de casos, medición y comparación con la línea base.
+
+Cada caso es una función sin argumentos que devuelve el callable a medir
+(síncrono o corrutina). El armado de datos queda fuera de la medición.
+"""
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+_CASOS: Dict[str, Callable[[], Callable]] = {}
+
+
+def caso(nombre: str):
+    """Registra un benchmark. El nombre es la clave en la línea base."""
+    def decorador(preparar: Callable[[], Callable]):
+        if nombre in _CASOS:
+            raise ValueError(f"Benchmark duplicado: {nombre}")
+        _CASOS[nombre] = preparar
+        return preparar
+    return decorador
+
+
+def casos(filtro: Optional[str] = None) -> Dict[str, Callable[[], Callable]]:
+    return {n: c for n, c in _CASOS.items() if not filtro or filtro in n}
+
+
+@dataclass
+class Medicion:
+    nombre: str
+    por_op_us: float  # mejor repetición (menos ruido)
+    mediana_us: float
+    iteraciones: int
+
+    def to_dict(self) -> dict:
+        return {"por_op_us": round(self.por_op_us, 3), "mediana_us": round(self.mediana_us, 3),
+                "iteraciones": self.iteraciones}
+
+
+def _lote_sync(funcion, n: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(n):
+        funcion()
+    return time.perf_counter() - inicio
+
+
+def _lote_async(loop, funcion, n: int) -> float:
+    async def lote():
+        inicio = time.perf_counter()
+        for _ in range(n):
+            await funcion()
+        return time.perf_counter() - inicio
+    return loop.run_until_complete(lote())
+
+
+def medir(nombre: str, funcion, loop, repeticiones: int = 5, tiempo_min: float = 0.1) -> Medicion:
+    """Calibra las iteraciones para que cada repetición dure al menos tiempo_min"""
+    es_async = inspect.iscoroutinefunction(funcion)
+
+    def lote(n: int) -> float:
+        return _lote_async(loop, funcion, n) if es_async else _lote_sync(funcion, n)
+
+    n = 1
+    while True:
+        duracion = lote(n)
+        if duracion >= tiempo_min:
+            break
+        n *= 2 if duracion < tiempo_min / 10 else max(2, int(tiempo_min / max(duracion, 1e-9)) + 1)
+
+    tiempos = [lote(n) / n for _ in range(repeticiones)]
+    return Medicion(nombre, min(tiempos) * 1e6, statistics.median(tiempos) * 1e6, n)
+
+
+def ejecutar(filtro: Optional[str] = None, repeticiones: int = 5, tiempo_min: float = 0.1) -> Iterator[Medicion]:
+    """Mide los casos registrados de a uno (generador, para reportar a medida que avanza)"""
+    loop = asyncio.new_event_loop()
+    try:
+        for nombre, preparar in casos(filtro).items():
+            yield medir(nombre, preparar(), loop, repeticiones, tiempo_min)
+    finally:
+        loop.close()
+
+
+def guardar_linea_base(mediciones: List[Medicion], ruta: str) -> None:
+    datos = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": {m.nombre: m.to_dict() for m in mediciones},
+    }
+    with open(ruta, "w") as f:
+        json.dump(datos, f, indent=2, sort_keys=True)
+
+
+def comparar(mediciones: List[Medicion], ruta: str, umbral: float) -> List[tuple]:
+    """
+    Devuelve (nombre, base_us, actual_us, variacion) de los casos que empeoraron
+    más que 'umbral' (0.2 = 20 %) respecto de la línea base.
+    """
+    with open(ruta) as f:
+        base = json.load(f)["resultados"]
+
+    regresiones = []
+    for m in mediciones:
+        if m.nombre not in base:
+            continue
+        anterior = base[m.nombre]["por_op_us"]
+        variacion = (m.por_op_us - anterior) / anterior if anterior else 0.0
+        if variacion > umbral:
+            regresiones.append((m.nombre, anterior, m.por_op_us, variacion))
+    return regresiones
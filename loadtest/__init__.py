@@ -0,0 +1,19 @@
+"""
+Herramienta de carga para la API de Comunicarlos.
+
+Dos pasos reproducibles (misma semilla -> mismo dataset y misma secuencia
+de escenarios):
+
+    # 1. Poblar una base local con un dataset realista
+    python -m loadtest seed --mongodb-url mongodb://localhost:27017 \\
+        --solicitantes 5000 --tecnicos 300 --requerimientos 1000000 --limpiar
+
+    # 2. Reproducir la mezcla de escenarios contra la API levantada
+    python -m loadtest run --url http://localhost:8080 --concurrencia 50 --duracion 60
+
+    # Todo en proceso, sin servidor ni MongoDB (requiere mongomock-motor)
+    python -m loadtest run --en-proceso --requerimientos 20000 --duracion 20
+
+El seed deja un manifiesto JSON (usuarios y requerimientos utilizables por
+los escenarios) que el comando run lee para armar cada request.
+"""
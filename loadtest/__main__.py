@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+from loadtest.datos import Tamanio, poblar
+from loadtest.ejecutor import ejecutar, formatear, resumen
+from loadtest.escenarios import Contexto, parsear_mezcla
+
+MANIFIESTO_DEFECTO = "loadtest_dataset.json"
+
+
+def _agregar_tamanio(parser: argparse.ArgumentParser, defecto: Tamanio) -> None:
+    grupo = parser.add_argument_group("dataset")
+    grupo.add_argument("--solicitantes", type=int, default=defecto.solicitantes)
+    grupo.add_argument("--operadores", type=int, default=defecto.operadores)
+    grupo.add_argument("--tecnicos", type=int, default=defecto.tecnicos)
+    grupo.add_argument("--supervisores", type=int, default=defecto.supervisores)
+    grupo.add_argument("--requerimientos", type=int, default=defecto.requerimientos)
+    grupo.add_argument("--semilla", type=int, default=42)
+    grupo.add_argument("--lote", type=int, default=5000, help="Documentos por insert_many")
+
+
+def _tamanio(args) -> Tamanio:
+    tamanio = Tamanio(args.solicitantes, args.operadores, args.tecnicos, args.supervisores, args.requerimientos)
+    if min(tamanio.solicitantes, tamanio.operadores, tamanio.tecnicos, tamanio.supervisores) < 1:
+        raise SystemExit("Se necesita al menos un usuario de cada rol")
+    return tamanio
+
+
+def _progreso(coleccion: str, total: int) -> None:
+    print(f"  {coleccion}: {total:,}", file=sys.stderr, end="\r")
+
+
+async def _seed(args) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    cliente = AsyncIOMotorClient(args.mongodb_url)
+    try:
+        manifiesto = await poblar(
+            cliente[args.db], _tamanio(args), args.semilla, args.lote, args.limpiar, _progreso
+        )
+    finally:
+        cliente.close()
+
+    Path(args.manifiesto).write_text(json.dumps(manifiesto))
+    print(f"\nDataset listo. Manifiesto: {args.manifiesto}")
+    return 0
+
+
+async def _run(args) -> int:
+    import httpx
+
+    pesos = parsear_mezcla(args.mezcla)
+
+    if args.en_proceso:
+        return await _run_en_proceso(args, pesos)
+
+    manifiesto = json.loads(Path(args.manifiesto).read_text())
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as cliente:
+        return await _ejecutar_y_reportar(args, Contexto(cliente, manifiesto, args.semilla), pesos)
+
+
+async def _run_en_proceso(args, pesos) -> int:
+    """App y base en el mismo proceso: MongoDB simulado con mongomock-motor y transporte ASGI"""
+    import httpx
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        print("El modo --en-proceso requiere mongomock-motor (pip install mongomock-motor)", file=sys.stderr)
+        return 2
+
+    from app.infrastructure.mongodb.database import mongodb
+    from app.main import app
+
+    # Con el cliente ya asignado, MongoDB.conectar no abre otra conexión
+    mongodb._client = AsyncMongoMockClient()
+    mongodb._database = mongodb._client["loadtest"]
+    manifiesto = await poblar(mongodb._database, _tamanio(args), args.semilla, args.lote, progreso=_progreso)
+    print(file=sys.stderr)
+
+    async with app.router.lifespan_context(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://loadtest", timeout=args.timeout) as cliente:
+            return await _ejecutar_y_reportar(args, Contexto(cliente, manifiesto, args.semilla), pesos)
+
+
+async def _ejecutar_y_reportar(args, ctx: Contexto, pesos) -> int:
+    print(f"Ejecutando {args.duracion}s con concurrencia {args.concurrencia}: {pesos}", file=sys.stderr)
+    resultados = await ejecutar(ctx, pesos, args.concurrencia, args.duracion)
+    filas = resumen(resultados)
+    print(formatear(filas, resultados))
+
+    if args.salida:
+        Path(args.salida).write_text(json.dumps({
+            "concurrencia": args.concurrencia,
+            "duracion_s": round(resultados.duracion, 2),
+            "mezcla": pesos,
+            "endpoints": filas,
+        }, indent=2))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Pruebas de carga de Comunicarlos")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    seed = sub.add_parser("seed", help="Poblar MongoDB con un dataset realista")
+    seed.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    seed.add_argument("--db", default="mesa_ayuda_db")
+    seed.add_argument("--limpiar", action="store_true", help="Eliminar antes las colecciones de la app")
+    seed.add_argument("--manifiesto", default=MANIFIESTO_DEFECTO)
+    _agregar_tamanio(seed, Tamanio())
+
+    run = sub.add_parser("run", help="Reproducir la mezcla de escenarios")
+    run.add_argument("--url", default="http://localhost:8080")
+    run.add_argument("--manifiesto", default=MANIFIESTO_DEFECTO)
+    run.add_argument("--concurrencia", type=int, default=20)
+    run.add_argument("--duracion", type=float, default=30, help="Segundos")
+    run.add_argument("--mezcla", help="Pesos, ej. 'listar=30,crear=5,login=0'")
+    run.add_argument("--timeout", type=float, default=30)
+    run.add_argument("--salida", help="Guardar el reporte en JSON")
+    run.add_argument("--en-proceso", action="store_true",
+                     help="Levantar la app en proceso sobre mongomock (ignora --url y --manifiesto)")
+    # En proceso el dataset se genera en memoria: por defecto mucho más chico
+    _agregar_tamanio(run, Tamanio(solicitantes=500, operadores=10, tecnicos=50, supervisores=5, requerimientos=5000))
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(_seed(args) if args.comando == "seed" else _run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,318 @@
+"""
+Generación del dataset de carga.
+
+Los documentos se arman con la misma forma que persisten los repositorios
+(_to_document) y se insertan en lotes con insert_many, sin pasar por la API:
+poblar millones de requerimientos por HTTP tardaría horas por bcrypt.
+"""
+import hashlib
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.domain.enums import (
+    TipoUsuario, TipoRequerimiento, EstadoRequerimiento, NivelUrgencia,
+    CategoriaIncidente, CategoriaSolicitud, TipoServicio, TipoEvento
+)
+from app.services.authentication_service import pwd_context
+
+PASSWORD = "CargaPass123!"
+
+COLECCIONES = ["usuarios", "servicios", "requerimientos", "counters", "notificaciones", "notificaciones_contadores"]
+
+# Distribución de estados de un sistema con historia (la mayoría resueltos)
+ESTADOS = [
+    (EstadoRequerimiento.NUEVO, 0.15),
+    (EstadoRequerimiento.ASIGNADO, 0.15),
+    (EstadoRequerimiento.EN_PROCESO, 0.10),
+    (EstadoRequerimiento.RESUELTO, 0.55),
+    (EstadoRequerimiento.REABIERTO, 0.05),
+]
+
+TITULOS = [
+    "Sin conexión a internet", "Internet muy lento", "No puedo realizar llamadas",
+    "Sin señal de televisión", "SIM bloqueada", "Equipo dañado por tormenta",
+    "Corte intermitente del servicio", "Alta de línea adicional", "Baja del servicio de TV",
+]
+
+TEXTOS = [
+    "Revisando la conexión del nodo principal.",
+    "Se contactó al cliente para coordinar la visita.",
+    "El cliente confirma que el problema persiste.",
+    "Se reinició el puerto en la central.",
+    "Pendiente de repuesto en el depósito.",
+]
+
+
+@dataclass
+class Tamanio:
+    """Cantidad de entidades a generar"""
+    solicitantes: int = 5000
+    operadores: int = 50
+    tecnicos: int = 300
+    supervisores: int = 20
+    requerimientos: int = 200_000
+
+
+def password_hash(password: str = PASSWORD) -> str:
+    """Hash compartido por todos los usuarios (mismo esquema SHA-256 + bcrypt que AutenticacionService)"""
+    return pwd_context.hash(hashlib.sha256(password.encode("utf-8")).hexdigest())
+
+
+class GeneradorDataset:
+    """Genera documentos deterministas a partir de una semilla"""
+
+    def __init__(self, tamanio: Tamanio, semilla: int = 42):
+        self.tamanio = tamanio
+        self.rnd = random.Random(semilla)
+        self.ahora = datetime.now().replace(microsecond=0)
+        self.hash = password_hash()
+
+        # Rangos de IDs por rol (usuarios comparten la secuencia usuario_id)
+        t = tamanio
+        self.operadores = list(range(1, t.operadores + 1))
+        self.tecnicos = list(range(self.operadores[-1] + 1, self.operadores[-1] + 1 + t.tecnicos))
+        self.supervisores = list(range(self.tecnicos[-1] + 1, self.tecnicos[-1] + 1 + t.supervisores))
+        inicio = self.supervisores[-1] + 1
+        self.solicitantes = list(range(inicio, inicio + t.solicitantes))
+
+        self.ultimo_servicio = 0
+        self.ultimo_comentario = 0
+
+    # ------------------------------------------------------------------
+    # Usuarios y servicios
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def email(tipo: TipoUsuario, usuario_id: int) -> str:
+        if tipo == TipoUsuario.SOLICITANTE:
+            return f"cliente{usuario_id}@carga-comunicarlos.com"
+        return f"{tipo.value.lower()}{usuario_id}@comunicarlos.com.ar"
+
+    @staticmethod
+    def nombre(tipo: TipoUsuario, usuario_id: int) -> str:
+        return f"{tipo.value.capitalize()} {usuario_id}"
+
+    def _fecha_pasada(self, dias: int = 730) -> datetime:
+        return self.ahora - timedelta(seconds=self.rnd.randint(0, dias * 86400))
+
+    def usuarios(self) -> Iterator[dict]:
+        for tipo, ids in (
+            (TipoUsuario.OPERADOR, self.operadores),
+            (TipoUsuario.TECNICO, self.tecnicos),
+            (TipoUsuario.SUPERVISOR, self.supervisores),
+            (TipoUsuario.SOLICITANTE, self.solicitantes),
+        ):
+            for usuario_id in ids:
+                doc = {
+                    "_id": usuario_id,
+                    "nombre": self.nombre(tipo, usuario_id),
+                    "email": self.email(tipo, usuario_id),
+                    "password_hash": self.hash,
+                    "tipo_usuario": tipo.value,
+                    "fecha_creacion": self._fecha_pasada(),
+                    "ultimo_acceso": None
+                }
+                if tipo == TipoUsuario.TECNICO:
+                    doc["especialidades"] = self.rnd.sample([s.value for s in TipoServicio], k=self.rnd.randint(1, 2))
+                elif tipo == TipoUsuario.SUPERVISOR:
+                    # Reparte el personal en equipos disjuntos
+                    indice = self.supervisores.index(usuario_id)
+                    doc["operadores_ids"] = self.operadores[indice::len(self.supervisores)]
+                    doc["tecnicos_ids"] = self.tecnicos[indice::len(self.supervisores)]
+                yield doc
+
+    def servicios(self) -> Iterator[dict]:
+        for solicitante_id in self.solicitantes:
+            for _ in range(1 if self.rnd.random() < 0.7 else 2):
+                self.ultimo_servicio += 1
+                yield {
+                    "_id": self.ultimo_servicio,
+                    "tipo": self.rnd.choice(list(TipoServicio)).value,
+                    "numero_servicio": f"SRV-{self.ultimo_servicio:08d}",
+                    "solicitante_id": solicitante_id,
+                    "activo": True,
+                    "fecha_alta": self._fecha_pasada()
+                }
+
+    # ------------------------------------------------------------------
+    # Requerimientos
+    # ------------------------------------------------------------------
+
+    def _estado(self) -> EstadoRequerimiento:
+        valor = self.rnd.random()
+        acumulado = 0.0
+        for estado, peso in ESTADOS:
+            acumulado += peso
+            if valor < acumulado:
+                return estado
+        return EstadoRequerimiento.RESUELTO
+
+    @staticmethod
+    def _evento(numero: int, tipo: TipoEvento, titulo: str, responsable_id: int,
+                responsable_nombre: str, fecha: datetime) -> dict:
+        return {
+            "id": numero,
+            "tipo": tipo.value,
+            "titulo": titulo,
+            "descripcion": titulo,
+            "responsable_id": responsable_id,
+            "responsable_nombre": responsable_nombre,
+            "fecha_hora": fecha
+        }
+
+    def requerimientos(self) -> Iterator[dict]:
+        for req_id in range(1, self.tamanio.requerimientos + 1):
+            yield self._requerimiento(req_id)
+
+    def _requerimiento(self, req_id: int) -> dict:
+        rnd = self.rnd
+        tipo = TipoRequerimiento.INCIDENTE if rnd.random() < 0.7 else TipoRequerimiento.SOLICITUD
+        estado = self._estado()
+        solicitante_id = rnd.choice(self.solicitantes)
+        solicitante_nombre = self.nombre(TipoUsuario.SOLICITANTE, solicitante_id)
+        creacion = self._fecha_pasada()
+        titulo = rnd.choice(TITULOS)
+
+        eventos = [self._evento(1, TipoEvento.CREACION, f"Creación: {titulo}",
+                                solicitante_id, solicitante_nombre, creacion)]
+        comentarios = []
+        tecnico_id = tecnico_nombre = fecha_resolucion = None
+        momento = creacion
+
+        if estado != EstadoRequerimiento.NUEVO:
+            tecnico_id = rnd.choice(self.tecnicos)
+            tecnico_nombre = self.nombre(TipoUsuario.TECNICO, tecnico_id)
+            operador_id = rnd.choice(self.operadores)
+            momento += timedelta(minutes=rnd.randint(5, 600))
+            eventos.append(self._evento(len(eventos) + 1, TipoEvento.ASIGNACION, f"Asignado a {tecnico_nombre}",
+                                        operador_id, self.nombre(TipoUsuario.OPERADOR, operador_id), momento))
+
+            # Cola larga: la mayoría tiene pocos comentarios, algunos muchos
+            for _ in range(min(int(rnd.expovariate(0.5)), 50)):
+                self.ultimo_comentario += 1
+                momento += timedelta(minutes=rnd.randint(1, 240))
+                texto = rnd.choice(TEXTOS)
+                comentarios.append({
+                    "id": self.ultimo_comentario,
+                    "texto": texto,
+                    "autor_id": tecnico_id,
+                    "autor_nombre": tecnico_nombre,
+                    "fecha_hora": momento
+                })
+                eventos.append(self._evento(len(eventos) + 1, TipoEvento.COMENTARIO, texto,
+                                            tecnico_id, tecnico_nombre, momento))
+
+        if estado in (EstadoRequerimiento.RESUELTO, EstadoRequerimiento.REABIERTO):
+            momento += timedelta(minutes=rnd.randint(10, 2880))
+            fecha_resolucion = momento
+            eventos.append(self._evento(len(eventos) + 1, TipoEvento.RESOLUCION, f"Resuelto por {tecnico_nombre}",
+                                        tecnico_id, tecnico_nombre, momento))
+        if estado == EstadoRequerimiento.REABIERTO:
+            momento += timedelta(hours=rnd.randint(1, 72))
+            fecha_resolucion = None
+            eventos.append(self._evento(len(eventos) + 1, TipoEvento.REAPERTURA, "Reabierto por el solicitante",
+                                        solicitante_id, solicitante_nombre, momento))
+
+        doc = {
+            "_id": req_id,
+            "tipo": tipo.value,
+            "titulo": titulo,
+            "descripcion": f"{titulo}. Reportado por el cliente {solicitante_id}.",
+            "estado": estado.value,
+            "solicitante_id": solicitante_id,
+            "solicitante_nombre": solicitante_nombre,
+            "tecnico_asignado_id": tecnico_id,
+            "tecnico_asignado_nombre": tecnico_nombre,
+            "fecha_creacion": creacion,
+            "fecha_resolucion": fecha_resolucion,
+            "comentarios": comentarios,
+            "eventos": eventos
+        }
+        if tipo == TipoRequerimiento.INCIDENTE:
+            doc["nivel_urgencia"] = rnd.choice(list(NivelUrgencia)).value
+            doc["categoria"] = rnd.choice(list(CategoriaIncidente)).value
+        else:
+            doc["categoria"] = rnd.choice(list(CategoriaSolicitud)).value
+        return doc
+
+
+async def _insertar_en_lotes(coleccion, documentos: Iterator[dict], lote: int, progreso=None) -> int:
+    total = 0
+    pendientes: List[dict] = []
+    for doc in documentos:
+        pendientes.append(doc)
+        if len(pendientes) >= lote:
+            await coleccion.insert_many(pendientes, ordered=False)
+            total += len(pendientes)
+            pendientes = []
+            if progreso:
+                progreso(coleccion.name, total)
+    if pendientes:
+        await coleccion.insert_many(pendientes, ordered=False)
+        total += len(pendientes)
+    return total
+
+
+async def poblar(
+        db: AsyncIOMotorDatabase,
+        tamanio: Tamanio,
+        semilla: int = 42,
+        lote: int = 5000,
+        limpiar: bool = False,
+        progreso=None
+) -> dict:
+    """
+    Inserta el dataset y devuelve el manifiesto que consumen los escenarios.
+    Con limpiar=True borra antes las colecciones de la aplicación.
+    """
+    if limpiar:
+        for nombre in COLECCIONES:
+            await db[nombre].drop()
+
+    generador = GeneradorDataset(tamanio, semilla)
+    await _insertar_en_lotes(db["usuarios"], generador.usuarios(), lote, progreso)
+    await _insertar_en_lotes(db["servicios"], generador.servicios(), lote, progreso)
+
+    # Se registran de paso los requerimientos que los escenarios pueden operar
+    nuevos, en_curso = [], []
+    limite_muestra = 20_000
+
+    def con_muestra():
+        for doc in generador.requerimientos():
+            if doc["estado"] == EstadoRequerimiento.NUEVO.value and len(nuevos) < limite_muestra:
+                nuevos.append(doc["_id"])
+            elif doc["estado"] in (EstadoRequerimiento.ASIGNADO.value, EstadoRequerimiento.EN_PROCESO.value) \
+                    and len(en_curso) < limite_muestra:
+                en_curso.append([doc["_id"], doc["tecnico_asignado_id"]])
+            yield doc
+
+    await _insertar_en_lotes(db["requerimientos"], con_muestra(), lote, progreso)
+
+    # Las secuencias continúan después del dataset
+    for secuencia, valor in (
+        ("usuario_id", generador.solicitantes[-1]),
+        ("servicio_id", generador.ultimo_servicio),
+        ("requerimiento_id", tamanio.requerimientos),
+        ("comentario_id", generador.ultimo_comentario),
+    ):
+        await db["counters"].replace_one({"_id": secuencia}, {"_id": secuencia, "value": valor}, upsert=True)
+
+    return {
+        "semilla": semilla,
+        "password": PASSWORD,
+        "usuarios": {
+            TipoUsuario.OPERADOR.value: [[i, generador.email(TipoUsuario.OPERADOR, i)] for i in generador.operadores],
+            TipoUsuario.TECNICO.value: [[i, generador.email(TipoUsuario.TECNICO, i)] for i in generador.tecnicos],
+            TipoUsuario.SUPERVISOR.value: [[i, generador.email(TipoUsuario.SUPERVISOR, i)] for i in generador.supervisores],
+            TipoUsuario.SOLICITANTE.value: [
+                [i, generador.email(TipoUsuario.SOLICITANTE, i)] for i in generador.solicitantes[:limite_muestra]
+            ],
+        },
+        "requerimientos": {
+            "total": tamanio.requerimientos,
+            "nuevos": nuevos,
+            "en_curso": en_curso,
+        },
+    }
@@ -0,0 +1,110 @@
+"""
+Ejecutor de carga: N workers concurrentes eligen escenarios según sus
+pesos durante un tiempo fijo y se registra la latencia de cada request.
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List
+from loadtest.escenarios import ESCENARIOS, Contexto
+
+
+@dataclass
+class Resultados:
+    latencias: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errores: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    status: Dict[str, Dict[int, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    sin_datos: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    fallos_preparacion: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    duracion: float = 0.0
+
+    def registrar(self, endpoint: str, segundos: float, status: int) -> None:
+        self.latencias[endpoint].append(segundos)
+        self.status[endpoint][status] += 1
+        if status >= 400:
+            self.errores[endpoint] += 1
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados"""
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores) - 1, int(round(p / 100 * len(valores) + 0.5)) - 1))
+    return valores[indice]
+
+
+def resumen(resultados: Resultados) -> List[dict]:
+    filas = []
+    for endpoint, latencias in sorted(resultados.latencias.items()):
+        ordenadas = sorted(latencias)
+        filas.append({
+            "endpoint": endpoint,
+            "requests": len(ordenadas),
+            "errores": resultados.errores.get(endpoint, 0),
+            "status": dict(resultados.status[endpoint]),
+            "rps": round(len(ordenadas) / resultados.duracion, 2) if resultados.duracion else 0.0,
+            "p50_ms": round(percentil(ordenadas, 50) * 1000, 2),
+            "p95_ms": round(percentil(ordenadas, 95) * 1000, 2),
+            "p99_ms": round(percentil(ordenadas, 99) * 1000, 2),
+            "max_ms": round(ordenadas[-1] * 1000, 2),
+        })
+    return filas
+
+
+def formatear(filas: List[dict], resultados: Resultados) -> str:
+    encabezado = f"{'endpoint':<42}{'req':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    lineas = [encabezado, "-" * len(encabezado)]
+    for f in filas:
+        lineas.append(
+            f"{f['endpoint']:<42}{f['requests']:>8}{f['errores']:>6}{f['rps']:>9}"
+            f"{f['p50_ms']:>9}{f['p95_ms']:>9}{f['p99_ms']:>9}{f['max_ms']:>9}"
+        )
+    total = sum(f["requests"] for f in filas)
+    lineas.append("-" * len(encabezado))
+    lineas.append(f"total {total} requests en {resultados.duracion:.1f} s "
+                  f"({total / resultados.duracion if resultados.duracion else 0:.1f} req/s)")
+    if resultados.sin_datos:
+        lineas.append("sin datos disponibles: " + ", ".join(f"{k}={v}" for k, v in resultados.sin_datos.items()))
+    if resultados.fallos_preparacion:
+        lineas.append("fallos de preparación: " + ", ".join(
+            f"{k}={v}" for k, v in resultados.fallos_preparacion.items()
+        ))
+    return "\n".join(lineas)
+
+
+async def ejecutar(ctx: Contexto, pesos: Dict[str, int], concurrencia: int, duracion: float) -> Resultados:
+    resultados = Resultados()
+    nombres = list(pesos)
+    ponderaciones = [pesos[n] for n in nombres]
+    fin = time.monotonic() + duracion
+
+    async def worker(numero: int):
+        rnd = random.Random(ctx.semilla * 1000 + numero)
+        while time.monotonic() < fin:
+            nombre = rnd.choices(nombres, ponderaciones)[0]
+            try:
+                preparado = await ESCENARIOS[nombre](ctx, rnd)
+            except Exception:
+                # Típicamente el login previo de un usuario que el escenario necesita
+                resultados.fallos_preparacion[nombre] += 1
+                await asyncio.sleep(0)
+                continue
+            if preparado is None:
+                resultados.sin_datos[nombre] += 1
+                await asyncio.sleep(0)
+                continue
+            endpoint, request = preparado
+            inicio = time.perf_counter()
+            try:
+                respuesta = await request()
+                status = respuesta.status_code
+            except Exception:
+                status = 599  # error de red / timeout del cliente
+            resultados.registrar(endpoint, time.perf_counter() - inicio, status)
+
+    inicio = time.monotonic()
+    await asyncio.gather(*(worker(i) for i in range(concurrencia)))
+    resultados.duracion = time.monotonic() - inicio
+    return resultados
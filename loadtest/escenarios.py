@@ -0,0 +1,199 @@
+"""
+Escenarios de carga.
+
+Reproducen los pasos de comunicarlos_test_collection.json (login, alta de
+incidente, asignación, comentario, resolución, notificaciones y dashboards)
+con los nombres de campo que valida la API. Cada escenario hace un request
+y devuelve el nombre con el que se agrupa en el reporte.
+"""
+import random
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import httpx
+from app.domain.enums import TipoUsuario, CategoriaIncidente, NivelUrgencia
+
+API = "/api/v1"
+
+# Mezcla por defecto: predominan las lecturas, como en producción
+PESOS_DEFECTO: Dict[str, int] = {
+    "login": 5,
+    "listar": 25,
+    "detalle": 20,
+    "crear": 10,
+    "asignar": 8,
+    "comentar": 12,
+    "resolver": 5,
+    "dashboard": 10,
+    "notificaciones": 5,
+}
+
+
+class Contexto:
+    """
+    Estado compartido por los workers: manifiesto del dataset, tokens ya
+    obtenidos y colas de requerimientos disponibles para cada transición.
+    """
+
+    def __init__(self, cliente: httpx.AsyncClient, manifiesto: dict, semilla: int):
+        self.cliente = cliente
+        self.manifiesto = manifiesto
+        self.password = manifiesto["password"]
+        self.usuarios = manifiesto["usuarios"]
+        self.emails = {uid: email for lista in self.usuarios.values() for uid, email in lista}
+        self.tokens: Dict[int, str] = {}
+        self.nuevos = deque(manifiesto["requerimientos"]["nuevos"])
+        self.en_curso = deque(tuple(par) for par in manifiesto["requerimientos"]["en_curso"])
+        self.total_requerimientos = manifiesto["requerimientos"]["total"]
+        self.semilla = semilla
+
+    def usuario(self, rnd: random.Random, tipo: TipoUsuario) -> Tuple[int, str]:
+        usuario_id, email = rnd.choice(self.usuarios[tipo.value])
+        return usuario_id, email
+
+    async def login(self, email: str) -> httpx.Response:
+        return await self.cliente.post(f"{API}/auth/login", json={"email": email, "password": self.password})
+
+    async def headers(self, usuario_id: int, email: str) -> Dict[str, str]:
+        """Token del usuario; el login inicial no se mide (lo cubre el escenario 'login')"""
+        token = self.tokens.get(usuario_id)
+        if token is None:
+            respuesta = await self.login(email)
+            respuesta.raise_for_status()
+            token = self.tokens[usuario_id] = respuesta.json()["token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    async def headers_rol(self, rnd: random.Random, tipo: TipoUsuario) -> Dict[str, str]:
+        return await self.headers(*self.usuario(rnd, tipo))
+
+
+Escenario = Callable[[Contexto, random.Random], Awaitable[Optional[Tuple[str, Callable[[], Awaitable[httpx.Response]]]]]]
+
+
+# Cada escenario prepara (sin medir) lo que necesita y devuelve el nombre
+# del endpoint y el request a medir. None = no hay datos disponibles.
+
+async def login(ctx: Contexto, rnd: random.Random):
+    tipo = rnd.choice(list(TipoUsuario))
+    _, email = ctx.usuario(rnd, tipo)
+    return "POST /auth/login", lambda: ctx.login(email)
+
+
+async def listar(ctx: Contexto, rnd: random.Random):
+    headers = await ctx.headers_rol(rnd, TipoUsuario.OPERADOR)
+    pagina = min(int(rnd.expovariate(0.3)), 50)
+    return "GET /requerimientos", lambda: ctx.cliente.get(
+        f"{API}/requerimientos", params={"page": pagina, "size": 20}, headers=headers
+    )
+
+
+async def detalle(ctx: Contexto, rnd: random.Random):
+    headers = await ctx.headers_rol(rnd, TipoUsuario.OPERADOR)
+    req_id = rnd.randint(1, ctx.total_requerimientos)
+    return "GET /requerimientos/{id}", lambda: ctx.cliente.get(f"{API}/requerimientos/{req_id}", headers=headers)
+
+
+async def crear(ctx: Contexto, rnd: random.Random):
+    headers = await ctx.headers_rol(rnd, TipoUsuario.SOLICITANTE)
+    cuerpo = {
+        "tipo": "INCIDENTE",
+        "titulo": "Internet muy lento",
+        "descripcion": "La velocidad de descarga es menor a 1MB desde esta mañana.",
+        "categoria": rnd.choice(list(CategoriaIncidente)).value,
+        "nivel_urgencia": rnd.choice(list(NivelUrgencia)).value,
+    }
+
+    async def request():
+        respuesta = await ctx.cliente.post(f"{API}/requerimientos", json=cuerpo, headers=headers)
+        if respuesta.status_code == 201:
+            ctx.nuevos.append(respuesta.json()["id"])
+        return respuesta
+
+    return "POST /requerimientos", request
+
+
+async def asignar(ctx: Contexto, rnd: random.Random):
+    if not ctx.nuevos:
+        return None
+    req_id = ctx.nuevos.popleft()
+    headers = await ctx.headers_rol(rnd, TipoUsuario.OPERADOR)
+    tecnico_id, _ = ctx.usuario(rnd, TipoUsuario.TECNICO)
+
+    async def request():
+        respuesta = await ctx.cliente.post(
+            f"{API}/requerimientos/{req_id}/asignar",
+            json={"tecnico_id": tecnico_id, "comentario": "Asignado por disponibilidad."},
+            headers=headers
+        )
+        if respuesta.status_code == 200:
+            ctx.en_curso.append((req_id, tecnico_id))
+        return respuesta
+
+    return "POST /requerimientos/{id}/asignar", request
+
+
+async def comentar(ctx: Contexto, rnd: random.Random):
+    if not ctx.en_curso:
+        return None
+    # Se toma uno al azar sin consumirlo: puede recibir varios comentarios
+    req_id, tecnico_id = ctx.en_curso[rnd.randrange(len(ctx.en_curso))]
+    headers = await ctx.headers(tecnico_id, ctx.emails[tecnico_id])
+    return "POST /requerimientos/{id}/comentarios", lambda: ctx.cliente.post(
+        f"{API}/requerimientos/{req_id}/comentarios",
+        json={"texto": "Revisando la conexión del nodo principal. Parece haber ruido en la línea."},
+        headers=headers
+    )
+
+
+async def resolver(ctx: Contexto, rnd: random.Random):
+    if not ctx.en_curso:
+        return None
+    req_id, tecnico_id = ctx.en_curso.popleft()
+    headers = await ctx.headers(tecnico_id, ctx.emails[tecnico_id])
+    return "PATCH /requerimientos/{id}/resolver", lambda: ctx.cliente.patch(
+        f"{API}/requerimientos/{req_id}/resolver",
+        json={"comentarioResolucion": "Se reinició el puerto en la central. El cliente confirma el servicio."},
+        headers=headers
+    )
+
+
+async def dashboard(ctx: Contexto, rnd: random.Random):
+    if rnd.random() < 0.5:
+        headers = await ctx.headers_rol(rnd, TipoUsuario.OPERADOR)
+        ruta = "/reportes/dashboard-operador"
+    else:
+        headers = await ctx.headers_rol(rnd, TipoUsuario.TECNICO)
+        ruta = "/reportes/dashboard-tecnico"
+    return f"GET {ruta}", lambda: ctx.cliente.get(f"{API}{ruta}", headers=headers)
+
+
+async def notificaciones(ctx: Contexto, rnd: random.Random):
+    headers = await ctx.headers_rol(rnd, TipoUsuario.SUPERVISOR)
+    return "GET /notificaciones", lambda: ctx.cliente.get(
+        f"{API}/notificaciones", params={"leida": "false"}, headers=headers
+    )
+
+
+ESCENARIOS: Dict[str, Escenario] = {
+    "login": login,
+    "listar": listar,
+    "detalle": detalle,
+    "crear": crear,
+    "asignar": asignar,
+    "comentar": comentar,
+    "resolver": resolver,
+    "dashboard": dashboard,
+    "notificaciones": notificaciones,
+}
+
+
+def parsear_mezcla(texto: Optional[str]) -> Dict[str, int]:
+    """'listar=30,crear=5' -> pesos; los escenarios no mencionados conservan su peso por defecto"""
+    pesos = dict(PESOS_DEFECTO)
+    if texto:
+        for parte in texto.split(","):
+            nombre, _, peso = parte.partition("=")
+            nombre = nombre.strip()
+            if nombre not in ESCENARIOS:
+                raise ValueError(f"Escenario desconocido: {nombre}")
+            pesos[nombre] = int(peso)
+    return {nombre: peso for nombre, peso in pesos.items() if peso > 0}
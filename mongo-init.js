@@ -18,23 +18,10 @@ db.counters.insertMany([
     { _id: 'notificacion_id', sequence_value: 0 }
 ]);
 
-// Crear índices
-db.usuarios.createIndex({ "email": 1 }, { unique: true });
-db.usuarios.createIndex({ "tipo_usuario": 1 });
-
-db.requerimientos.createIndex({ "solicitante_id": 1 });
-db.requerimientos.createIndex({ "tecnico_asignado_id": 1 });
-db.requerimientos.createIndex({ "estado": 1 });
-db.requerimientos.createIndex({ "tipo": 1 });
-db.requerimientos.createIndex({ "fecha_creacion": -1 });
-db.requerimientos.createIndex({ "estado": 1, "fecha_creacion": -1 });
-
-db.servicios.createIndex({ "solicitante_id": 1 });
-db.servicios.createIndex({ "activo": 1 });
-
-db.notificaciones.createIndex({ "supervisor_id": 1 });
-db.notificaciones.createIndex({ "leida": 1 });
-db.notificaciones.createIndex({ "supervisor_id": 1, "leida": 1 });
+// Los índices NO se crean aquí: los declara y reconcilia la aplicación
+// (app/infrastructure/mongodb/indices.py), así la base queda igual sin
+// importar cómo se haya creado. Para aplicarlos manualmente:
+//   python -m app.infrastructure.mongodb.indices --aplicar
 
 print('✅ Base de datos inicializada correctamente');
 